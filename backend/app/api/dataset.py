@@ -1,147 +1,246 @@
 """
 API Routes pentru dataset management
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from app.models.schemas import DatasetUploadResponse, DatasetGenerateRequest, DatasetInfoResponse
-from app.services.dataset_service import DatasetService
-import io
+import math
+from typing import Literal, Optional
 
-router = APIRouter(prefix="/api/dataset", tags=["dataset"])
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from app.api.session import get_state
+from app.models.schemas import (
+    DatasetUploadResponse, DatasetGenerateRequest, DatasetInfoResponse,
+    DatasetSampleResponse, DatasetDensityResponse
+)
+from app.services.cache_service import DatasetCache, ResponseCache
+from app.services.columnar_service import ColumnarService, detect_format
+from app.services.dataset_service import DATASET_PRESETS, DatasetService
+from app.services.session_service import TrainingState
+from app.services.visualization_service import (
+    DEFAULT_DENSITY_SIZE, DEFAULT_SAMPLE_POINTS, MAX_DENSITY_SIZE, MAX_SAMPLE_POINTS, VisualizationService
+)
 
-# Acces la state global
-from app.api.training import state
+router = APIRouter(prefix="/api/dataset", tags=["dataset"])
 
 dataset_service = DatasetService()
+dataset_cache = DatasetCache()
+columnar_service = ColumnarService()
+visualization_service = VisualizationService()
+visualization_cache = ResponseCache()
+
+
+def dataset_summary(state: TrainingState, include_values: bool) -> dict:
+    """Câmpurile de sumar ale dataset-ului încărcat, din statisticile suficiente (O(1))."""
+    stats = state.data.stats
+    return dict(
+        num_points=stats.n,
+        x_range=(stats.x_min, stats.x_max),
+        y_range=(stats.y_min, stats.y_max),
+        x_mean=stats.mean_x,
+        y_mean=stats.mean_y,
+        x_std=math.sqrt(max(stats.sxx, 0.0) / stats.n),
+        y_std=math.sqrt(max(stats.syy, 0.0) / stats.n),
+        x_values=state.data.x.tolist() if include_values else None,
+        y_values=state.data.y.tolist() if include_values else None
+    )
+
 
+def _upload_response(state: TrainingState, message: str, include_values: bool) -> DatasetUploadResponse:
+    return DatasetUploadResponse(message=message, **dataset_summary(state, include_values))
 
-@router.post("/upload", response_model=DatasetUploadResponse)
-async def upload_dataset(file: UploadFile = File(...)):
-    """Upload CSV cu coloanele 'x' și 'y'."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+
+@router.post("/upload", response_model=DatasetUploadResponse, response_model_exclude_none=True)
+async def upload_dataset(
+    file: UploadFile = File(...),
+    x_column: Optional[str] = Query(default=None),
+    y_column: Optional[str] = Query(default=None),
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Upload CSV sau fișier binar pe coloane (.npy/.npz, Arrow IPC/Feather,
+    Parquet). Coloanele se aleg cu x_column/y_column: implicit primele două
+    coloane la CSV, 'x' și 'y' la formatele binare (indicii "0"/"1" la un
+    .npy 2D). Răspunsul conține doar sumarul; pentru scatter se folosește
+    /visualization, iar array-urile complete vin doar cu include_values=true.
+    """
+    file_format = detect_format(file.filename)
+    if file_format is None and not file.filename.lower().endswith('.csv'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only CSV, .npy, .npz, Arrow IPC/Feather and Parquet files are allowed"
+        )
+    
+    columns = None
+    if x_column is not None or y_column is not None:
+        columns = (x_column or "x", y_column or "y")
+    # Aceleași octeți citiți ca alt format sau cu alte coloane dau alt dataset
+    namespace = file_format or "csv"
+    if columns is not None:
+        namespace = f"{namespace}:{columns[0]}:{columns[1]}"
     
     try:
-        content = await file.read()
-        x, y = dataset_service.load_from_csv(io.BytesIO(content))
+        # Un fișier deja văzut vine direct din cache-ul memory-mapped, fără parsare
+        key = await run_in_threadpool(dataset_cache.hash_file, file.file, namespace)
+        cached = dataset_cache.get(key)
+        if cached is not None:
+            x, y, stats = cached
+        else:
+            if file_format is None:
+                # Parsare în streaming din fișierul spooled, pe un thread separat
+                x, y, stats = await run_in_threadpool(
+                    dataset_service.load_from_csv_stream, file.file, columns=columns
+                )
+            else:
+                x, y, stats = await run_in_threadpool(
+                    columnar_service.load, file.file, file_format, x_column, y_column
+                )
+            x, y, stats = await run_in_threadpool(dataset_cache.put, key, x, y, stats)
         
         # Resetează modelul când se încarcă date noi
-        state["data"]["x"] = x
-        state["data"]["y"] = y
-        state["model"]["w"] = 1.0
-        state["model"]["b"] = 1.0
-        state["history"]["loss"] = []
-        state["history"]["w"] = []
-        state["history"]["b"] = []
-        state["config"]["current_epoch"] = 0
+        state.load_dataset(x, y, stats)
+        # Hash-ul conținutului identifică dataset-ul și în checkpoint-uri
+        state.data.key = key
         
-        return DatasetUploadResponse(
-            message="Dataset loaded successfully",
-            num_points=len(x),
-            x_range=(float(x.min()), float(x.max())),
-            y_range=(float(y.min()), float(y.max())),
-            x_values=x.tolist(),
-            y_values=y.tolist()
-        )
+        return _upload_response(state, "Dataset loaded successfully", include_values)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error loading CSV: {str(e)}")
+        kind = "CSV" if file_format is None else "file"
+        raise HTTPException(status_code=400, detail=f"Error loading {kind}: {str(e)}")
 
 
-@router.post("/generate", response_model=DatasetUploadResponse)
-async def generate_dataset(request: DatasetGenerateRequest):
+@router.post("/generate", response_model=DatasetUploadResponse, response_model_exclude_none=True)
+async def generate_dataset(
+    request: DatasetGenerateRequest,
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
     """Generează dataset sintetic."""
     try:
-        x, y = dataset_service.generate_dataset(
+        x, y, _, stats = await run_in_threadpool(
+            dataset_service.generate_dataset,
             dataset_type=request.dataset_type,
             num_points=request.num_points,
             noise_level=request.noise_level,
-            seed=request.seed
-        )
-        
-        # Resetează modelul
-        state["data"]["x"] = x
-        state["data"]["y"] = y
-        state["model"]["w"] = 1.0
-        state["model"]["b"] = 1.0
-        state["history"]["loss"] = []
-        state["history"]["w"] = []
-        state["history"]["b"] = []
-        state["config"]["current_epoch"] = 0
-        
-        return DatasetUploadResponse(
-            message=f"Generated {request.dataset_type} dataset",
-            num_points=len(x),
-            x_range=(float(x.min()), float(x.max())),
-            y_range=(float(y.min()), float(y.max())),
-            x_values=x.tolist(),
-            y_values=y.tolist()
+            seed=request.seed,
+            outlier_fraction=request.outlier_fraction
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Resetează modelul
+    state.load_dataset(x, y, stats)
+    
+    return _upload_response(state, f"Generated {request.dataset_type} dataset", include_values)
 
 
-@router.post("/generate/{dataset_type}", response_model=DatasetUploadResponse)
-async def generate_dataset_simple(dataset_type: str):
+@router.post("/generate/{dataset_type}", response_model=DatasetUploadResponse, response_model_exclude_none=True)
+async def generate_dataset_simple(
+    dataset_type: str,
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
     """Generează dataset sintetic - endpoint simplificat pentru compatibilitate."""
-    import numpy as np
-    
-    np.random.seed(42)
-    
-    if dataset_type == "simple":
-        x = np.linspace(0, 10, 20)
-        y = 2 * x + 1 + np.random.normal(0, 1, 20)
-        description = "Date liniare simple cu zgomot mic"
-    elif dataset_type == "noisy":
-        x = np.linspace(0, 10, 20)
-        y = 2 * x + 1 + np.random.normal(0, 3, 20)
-        description = "Date liniare cu zgomot mare"
-    elif dataset_type == "outliers":
-        x = np.linspace(0, 10, 20)
-        y = 2 * x + 1 + np.random.normal(0, 1, 20)
-        # Adaugă câțiva outlieri
-        y[5] += 10
-        y[15] -= 10
-        description = "Date cu outlieri vizibili"
-    else:
+    if dataset_type not in DATASET_PRESETS:
         raise HTTPException(status_code=404, detail="Dataset type not found")
     
+    x, y, _, stats = dataset_service.generate_dataset(dataset_type)
+    
     # Resetează modelul
-    state["data"]["x"] = x
-    state["data"]["y"] = y
-    state["model"]["w"] = 1.0
-    state["model"]["b"] = 1.0
-    state["history"]["loss"] = []
-    state["history"]["w"] = []
-    state["history"]["b"] = []
-    state["config"]["current_epoch"] = 0
+    state.load_dataset(x, y, stats)
     
-    return DatasetUploadResponse(
-        message=f"Generated {dataset_type} dataset",
-        num_points=len(x),
-        x_range=(float(x.min()), float(x.max())),
-        y_range=(float(y.min()), float(y.max())),
-        x_values=x.tolist(),
-        y_values=y.tolist()
-    )
+    return _upload_response(state, f"Generated {dataset_type} dataset", include_values)
 
 
 @router.get("/info", response_model=DatasetInfoResponse)
-async def get_dataset_info():
+async def get_dataset_info(state: TrainingState = Depends(get_state)):
     """Informații despre dataset-ul curent."""
-    if state["data"]["x"] is None:
+    if state.data.x is None:
         raise HTTPException(status_code=404, detail="No dataset loaded")
     
-    x = state["data"]["x"]
-    y = state["data"]["y"]
+    stats = state.data.stats
     
     return DatasetInfoResponse(
-        num_points=len(x),
-        x_range=(float(x.min()), float(x.max())),
-        y_range=(float(y.min()), float(y.max())),
-        x_mean=float(x.mean()),
-        y_mean=float(y.mean()),
+        num_points=stats.n,
+        x_range=(stats.x_min, stats.x_max),
+        y_range=(stats.y_min, stats.y_max),
+        x_mean=stats.mean_x,
+        y_mean=stats.mean_y,
         is_loaded=True
     )
 
 
+def _sample_response(state: TrainingState, max_points: int) -> DatasetSampleResponse:
+    x, y, stats = state.data.x, state.data.y, state.data.stats
+    indices, outliers = visualization_service.sample(x, y, stats, max_points)
+    return DatasetSampleResponse(
+        num_points=stats.n,
+        sampled_points=len(indices),
+        x_range=(stats.x_min, stats.x_max),
+        y_range=(stats.y_min, stats.y_max),
+        indices=indices.tolist(),
+        x_values=x[indices].tolist(),
+        y_values=y[indices].tolist(),
+        outlier_indices=outliers.tolist()
+    )
+
 
+def _density_response(state: TrainingState, window: tuple, width: int, height: int) -> DatasetDensityResponse:
+    counts = visualization_service.density(state.data.x, state.data.y, window, width, height)
+    return DatasetDensityResponse(
+        num_points=state.data.stats.n,
+        width=width,
+        height=height,
+        x_range=window[:2],
+        y_range=window[2:],
+        counts=counts.tolist(),
+        max_count=int(counts.max())
+    )
 
+
+@router.get("/visualization")
+async def get_visualization(
+    mode: Literal["sample", "density"] = Query(default="sample"),
+    max_points: int = Query(default=DEFAULT_SAMPLE_POINTS, ge=10, le=MAX_SAMPLE_POINTS),
+    width: int = Query(default=DEFAULT_DENSITY_SIZE, ge=1, le=MAX_DENSITY_SIZE),
+    height: int = Query(default=DEFAULT_DENSITY_SIZE, ge=1, le=MAX_DENSITY_SIZE),
+    x_min: Optional[float] = Query(default=None),
+    x_max: Optional[float] = Query(default=None),
+    y_min: Optional[float] = Query(default=None),
+    y_max: Optional[float] = Query(default=None),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Datele pentru scatter-ul dataset-ului curent:
+    - mode=sample: cel mult max_points puncte, stratificate pe grilă, cu
+      extremele și outlier-ii păstrați (dataset-urile mici vin integral);
+    - mode=density: numărul de puncte pe pixel la rezoluția width × height,
+      în fereastra cerută (limitele lipsă sunt cele ale dataset-ului).
+    Răspunsurile serializate sunt ținute în cache per dataset.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=404, detail="No dataset loaded")
+    
+    x = state.data.x
+    if mode == "sample":
+        key = (id(x), mode, max_points)
+    else:
+        base = visualization_service.default_window(state.data.stats)
+        window = tuple(
+            float(value) if value is not None else default
+            for value, default in zip((x_min, x_max, y_min, y_max), base)
+        )
+        if not (window[0] < window[1] and window[2] < window[3]):
+            raise HTTPException(status_code=400, detail="Window bounds must satisfy min < max")
+        key = (id(x), mode, width, height, window)
+    
+    content = visualization_cache.get(key, x)
+    cache_status = "hit"
+    if content is None:
+        cache_status = "miss"
+        if mode == "sample":
+            response = await run_in_threadpool(_sample_response, state, max_points)
+        else:
+            response = await run_in_threadpool(_density_response, state, window, width, height)
+        content = response.model_dump_json().encode()
+        visualization_cache.put(key, x, content)
+    
+    return Response(content=content, media_type="application/json", headers={"X-Cache": cache_status})
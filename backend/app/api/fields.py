@@ -0,0 +1,42 @@
+"""
+Proiecția răspunsurilor (sparse fieldsets)
+Cu ?fields=a,b,c clientul alege câmpurile de top-level ale răspunsului.
+Endpoint-urile folosesc aceeași selecție ca să nu calculeze deloc câmpurile
+neincluse (ex. contribuțiile per punct pentru un grafic care vrea doar loss-ul).
+"""
+from typing import FrozenSet, Optional, Type, Union
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+Fields = Optional[FrozenSet[str]]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Fields:
+    """Validează lista de câmpuri; None înseamnă răspunsul complet."""
+    if fields is None:
+        return None
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = names - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return names
+
+
+def wants(selected: Fields, *names: str) -> bool:
+    """True dacă cel puțin unul dintre câmpuri face parte din răspuns."""
+    return selected is None or any(name in selected for name in names)
+
+
+def project(response: BaseModel, selected: Fields) -> Union[BaseModel, Response]:
+    """
+    Serializează doar câmpurile selectate (răspunsul complet dacă nu e nicio selecție).
+    Serializarea pydantic scrie NaN/inf ca null, ca la răspunsul complet;
+    json.dumps strict le-ar refuza după o divergență.
+    """
+    if selected is None:
+        return response
+    content = response.model_dump_json(include=set(selected), exclude_none=True)
+    return Response(content=content, media_type="application/json")
@@ -0,0 +1,152 @@
+"""
+API Routes pentru job-uri de training în fundal
+Flux: POST /api/jobs -> job_id; GET /api/jobs/{id} (polling, cu ?since=
+pentru actualizările noi) sau GET /api/jobs/{id}/stream (NDJSON);
+DELETE /api/jobs/{id} anulează.
+Endpoint-urile nu folosesc get_state: lock-ul sesiunii e luat de job doar
+pe durata fiecărui chunk, nu pe durata request-ului. Un job a cărui sesiune
+a fost evacuată sau al cărei dataset a fost resetat ori înlocuit este anulat
+la chunk-ul următor.
+"""
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.session import resolve_session_id, session_store
+from app.api.training import run_epochs
+from app.models.schemas import JobResponse, JobSubmitRequest, JobUpdate
+from app.services.job_service import Job, JobAbandonedError, JobLimitError, JobManager, JobQueueFullError
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+job_manager = JobManager()
+
+QUEUE_RETRY_AFTER_SECONDS = 5
+# Un stream trimite un keep-alive dacă nu apare nimic nou în acest interval
+STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+def _job_response(job: Job, since: Optional[int] = None) -> JobResponse:
+    last = job.partial[-1] if job.partial else None
+    return JobResponse(
+        job_id=job.id,
+        status=job.status,
+        epochs=job.epochs,
+        epochs_done=job.epochs_done,
+        progress=min(job.epochs_done / job.epochs, 1.0),
+        converged=job.converged,
+        sequence=job.sequence,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        result=JobUpdate(**last) if last is not None else None,
+        updates=[JobUpdate(**update) for update in job.updates_since(since)] if since is not None else []
+    )
+
+
+def _get_job(job_id: str, session_id: str) -> Job:
+    job = job_manager.get(job_id, session_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def submit_job(request: JobSubmitRequest, session_id: str = Depends(resolve_session_id)):
+    """
+    Pornește o rulare de training în fundal și returnează imediat job-ul.
+    429 dacă sesiunea are prea multe job-uri active, 503 (cu Retry-After)
+    dacă coada globală e plină.
+    """
+    state = session_store.get(session_id)
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    x = state.data.x
+    
+    def run_chunk(epochs: int, tolerance: Optional[float]) -> Dict:
+        # Rulează cu lock-ul sesiunii ținut de job manager. O sesiune evacuată
+        # sau cu alt dataset (reset, încărcare nouă) nu mai este antrenată.
+        if session_store.peek(session_id) is not state:
+            raise JobAbandonedError("Session was evicted")
+        if state.data.x is not x:
+            raise JobAbandonedError("Session dataset was reset or replaced")
+        state.revision += 1
+        result = run_epochs(state, epochs, tolerance)
+        return {
+            "epochs_run": result["epochs_run"],
+            "converged": result["converged"],
+            "epoch": state.config.current_epoch,
+            "w_final": result["w_final"],
+            "b_final": result["b_final"],
+            "loss_final": result["loss_final"],
+            "gradient_magnitude": result["gradient_magnitude"]
+        }
+    
+    try:
+        job = job_manager.submit(
+            session_id, state.lock, run_chunk, request.epochs, request.tolerance, request.chunk_epochs
+        )
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(QUEUE_RETRY_AFTER_SECONDS)}
+        )
+    
+    return _job_response(job)
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(session_id: str = Depends(resolve_session_id)):
+    """Job-urile sesiunii curente (active și cele terminate recent)."""
+    return [_job_response(job) for job in job_manager.list(session_id)]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    since: Optional[int] = Query(default=None, ge=0),
+    session_id: str = Depends(resolve_session_id)
+):
+    """Starea job-ului; cu since=<sequence> include actualizările parțiale mai noi."""
+    return _job_response(_get_job(job_id, session_id), since)
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(
+    job_id: str,
+    since: int = Query(default=0, ge=0),
+    session_id: str = Depends(resolve_session_id)
+):
+    """
+    Stream NDJSON: câte o linie pentru fiecare actualizare a job-ului, până
+    la terminare. Ultima linie conține starea finală.
+    """
+    job = _get_job(job_id, session_id)
+    
+    async def events():
+        sequence = since
+        while True:
+            try:
+                await job_manager.wait_for_update(job, sequence, STREAM_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield "\n"
+                continue
+            response = _job_response(job, sequence)
+            sequence = job.sequence
+            # model_dump_json scrie valorile nefinite (divergență) ca null
+            yield response.model_dump_json() + "\n"
+            if job.finished:
+                break
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.delete("/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str, session_id: str = Depends(resolve_session_id)):
+    """Anulează job-ul (un job care rulează se oprește după chunk-ul curent)."""
+    job = _get_job(job_id, session_id)
+    await job_manager.cancel(job)
+    return _job_response(job)
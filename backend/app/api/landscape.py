@@ -0,0 +1,124 @@
+"""
+API Routes pentru suprafața de loss MSE(w, b)
+Grilele depind doar de dataset și de fereastră, deci sunt serializate o
+singură dată și ținute ca bytes; la fiecare request se adaugă doar
+parametrii curenți ai modelului.
+"""
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from app.api.session import get_state
+from app.models.schemas import LandscapeResponse
+from app.services.cache_service import ResponseCache
+from app.services.landscape_service import MAX_RESOLUTION, TILE_SIZE, LandscapeService
+from app.services.session_service import DEFAULT_B, DEFAULT_W, TrainingState
+
+router = APIRouter(prefix="/api/landscape", tags=["landscape"])
+
+landscape_service = LandscapeService()
+landscape_cache = ResponseCache()
+
+# Câmpurile care se schimbă la fiecare pas de training; nu intră în cache
+MODEL_FIELDS = {"current_w", "current_b"}
+
+
+def _grid_json(state: TrainingState, grid: Dict, level: int, tile_x: Optional[int] = None, tile_y: Optional[int] = None) -> bytes:
+    """Răspunsul fără parametrii modelului, serializat (NaN/inf devin null)."""
+    w_opt, b_opt, loss_opt = landscape_service.optimum(state.data.stats)
+    response = LandscapeResponse(
+        w_values=grid["w_values"].tolist(),
+        b_values=grid["b_values"].tolist(),
+        loss=grid["loss"].tolist(),
+        loss_min=grid["loss_min"],
+        loss_max=grid["loss_max"],
+        level=level,
+        tile_x=tile_x,
+        tile_y=tile_y,
+        optimum_w=w_opt,
+        optimum_b=b_opt,
+        optimum_loss=loss_opt,
+        current_w=state.model.w,
+        current_b=state.model.b
+    )
+    return response.model_dump_json(exclude=MODEL_FIELDS, exclude_none=True).encode()
+
+
+def _number(value: float) -> bytes:
+    return repr(float(value)).encode() if math.isfinite(value) else b"null"
+
+
+async def _cached_response(state: TrainingState, key: Tuple, compute: Callable[[], bytes]) -> Response:
+    """Grila serializată din cache (sau calculată pe un thread), completată cu modelul curent."""
+    x = state.data.x
+    content = landscape_cache.get(key, x)
+    cache_status = "hit"
+    if content is None:
+        cache_status = "miss"
+        content = await run_in_threadpool(compute)
+        landscape_cache.put(key, x, content)
+    
+    model = b',"current_w":' + _number(state.model.w) + b',"current_b":' + _number(state.model.b) + b'}'
+    return Response(content=content[:-1] + model, media_type="application/json", headers={"X-Cache": cache_status})
+
+
+@router.get("", response_model=LandscapeResponse, response_model_exclude_none=True)
+async def get_landscape(
+    w_min: Optional[float] = Query(default=None),
+    w_max: Optional[float] = Query(default=None),
+    b_min: Optional[float] = Query(default=None),
+    b_max: Optional[float] = Query(default=None),
+    resolution: int = Query(default=TILE_SIZE, ge=2, le=MAX_RESOLUTION),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Grila de loss pentru fereastra (w, b) cerută. Limitele lipsă sunt luate
+    din fereastra de bază a dataset-ului (optimul și punctul de start).
+    Header-ul X-Cache spune dacă grila serializată a venit din cache.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    stats = state.data.stats
+    base = landscape_service.base_window(stats, DEFAULT_W, DEFAULT_B)
+    window = tuple(
+        float(value) if value is not None else default
+        for value, default in zip((w_min, w_max, b_min, b_max), base)
+    )
+    if not (window[0] < window[1] and window[2] < window[3]):
+        raise HTTPException(status_code=400, detail="Window bounds must satisfy min < max")
+    
+    level = landscape_service.level_for_window(base, window)
+    return await _cached_response(
+        state,
+        (id(state.data.x), "window", window, resolution),
+        lambda: _grid_json(state, landscape_service.window(stats, window, resolution), level)
+    )
+
+
+@router.get("/tiles/{level}/{tile_x}/{tile_y}", response_model=LandscapeResponse, response_model_exclude_none=True)
+async def get_landscape_tile(
+    level: int,
+    tile_x: int,
+    tile_y: int,
+    size: int = Query(default=TILE_SIZE, ge=2, le=MAX_RESOLUTION),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Tile de loss pentru zoom progresiv: nivelul 0 este fereastra de bază,
+    iar fiecare nivel are de 4 ori mai multe tile-uri (2^level × 2^level).
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    stats = state.data.stats
+    base = landscape_service.base_window(stats, DEFAULT_W, DEFAULT_B)
+    try:
+        return await _cached_response(
+            state,
+            (id(state.data.x), "tile", level, tile_x, tile_y, size),
+            lambda: _grid_json(state, landscape_service.tile(stats, base, level, tile_x, tile_y, size), level, tile_x, tile_y)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,327 @@
+"""
+WebSocket pentru training live cu ritm controlat de server
+Clientul cere un frame rate, iar serverul trimite câte un frame per tick.
+Dacă clientul rămâne în urmă, epocile intermediare sunt comasate într-un
+singur frame, deci nu se acumulează niciodată un backlog.
+
+Mesaje client -> server (JSON, câmpul "type"):
+    resume / pause               pornește / oprește animația
+    step                         avansează o singură unitate (epocă sau punct)
+    set_fps {"fps"}              schimbă frame rate-ul
+    set_learning_rate {"learning_rate"}
+    set_mode {"mode"}            "epoch" sau "point"
+    set_units_per_frame {"units_per_frame"}
+
+Mesaje server -> client: frame, status, error. În modul point, frame-ul
+conține doar ultimul punct procesat în tick. Valorile nefinite (divergență)
+sunt trimise ca null. Dacă sesiunea este evacuată, canalul se închide.
+"""
+import asyncio
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.session import SESSION_COOKIE, SESSION_HEADER, resolve_session_id, session_store
+from app.api.training import advance_points, explanation_service, run_epochs
+from app.models.schemas import PointBatchResponse
+from app.services.session_service import TrainingState
+
+router = APIRouter(prefix="/api", tags=["live"])
+
+MIN_FPS = 1.0
+MAX_FPS = 60.0
+MAX_UNITS_PER_FRAME = 10_000
+# Câte frame-uri ratate pot fi comasate într-unul singur
+MAX_COALESCED_FRAMES = 10
+
+_DISCONNECTED = object()
+
+
+@dataclass
+class LiveControls:
+    running: bool = False
+    fps: float = 10.0
+    mode: str = "epoch"  # epoch, point
+    units_per_frame: int = 1
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+
+def _clamp_fps(value: Any) -> float:
+    fps = float(value)
+    if not math.isfinite(fps):
+        raise ValueError("fps must be a finite number")
+    return min(max(fps, MIN_FPS), MAX_FPS)
+
+
+def _json_safe(value: Any) -> Any:
+    """Valorile nefinite devin None: JSON.parse din browser respinge NaN/Infinity."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+async def _send(websocket: WebSocket, message: Dict) -> None:
+    """
+    Trimite un mesaj JSON strict. Calea obișnuită e un singur json.dumps;
+    mesajele cu valori nefinite (training divergent) sunt curățate doar la nevoie.
+    """
+    try:
+        text = json.dumps(message, allow_nan=False)
+    except ValueError:
+        text = json.dumps(_json_safe(message))
+    await websocket.send_text(text)
+
+
+def _advance_points(state: TrainingState, units: int) -> PointBatchResponse:
+    """
+    Avansează `units` puncte cu calea vectorizată; un batch se oprește la
+    sfârșitul epocii, deci există câte un apel per epocă traversată.
+    Explicațiile sunt calculate doar pentru epoca din ultimul batch.
+    """
+    n = len(state.data.x)
+    remaining = units
+    while True:
+        pbp = state.point_by_point
+        start = pbp.current_index if pbp.active and pbp.current_index < n else 0
+        batch = advance_points(state, remaining, explain=remaining <= n - start)
+        remaining -= batch.count
+        if remaining <= 0:
+            return batch
+
+
+def _last_point(batch: PointBatchResponse) -> Dict:
+    """Ultimul punct din batch, cu câmpurile răspunsului point-by-point."""
+    index = batch.count - 1
+    if batch.is_last_point:
+        explanation = f"✅ Epocă {batch.epoch} completă! Parametri actualizați: w={batch.w_new:.4f}, b={batch.b_new:.4f}"
+    else:
+        explanation = (
+            f"Punct {batch.point_indices[index] + 1}/{batch.total_points}: eroare={batch.errors[index]:.4f}, "
+            f"contribuție_w={batch.contributions_w[index]:.6f}, contribuție_b={batch.contributions_b[index]:.6f}"
+        )
+    return {
+        "point_index": batch.point_indices[index],
+        "total_points": batch.total_points,
+        "x_value": batch.x_values[index],
+        "y_actual": batch.y_actual[index],
+        "y_predicted": batch.y_predicted[index],
+        "error": batch.errors[index],
+        "contribution_w": batch.contributions_w[index],
+        "contribution_b": batch.contributions_b[index],
+        "accumulated_gradient_w": batch.accumulated_gradient_w[index],
+        "accumulated_gradient_b": batch.accumulated_gradient_b[index],
+        "is_last_point": batch.is_last_point,
+        "w_current": batch.w_current,
+        "b_current": batch.b_current,
+        "w_new": batch.w_new,
+        "b_new": batch.b_new,
+        "explanation": explanation,
+        "error_categories": batch.error_categories,
+        "error_magnitudes": batch.error_magnitudes,
+        "epoch": batch.epoch,
+        "explanations": batch.explanations
+    }
+
+
+def _advance(state: TrainingState, controls: LiveControls, units: int) -> Dict:
+    """
+    Avansează `units` epoci sau puncte și construiește frame-ul de trimis.
+    Se apelează cu lock-ul sesiunii ținut.
+    """
+    state.revision += 1
+    if controls.mode == "point":
+        epoch = state.config.current_epoch
+        batch = _advance_points(state, units)
+        return {
+            "type": "frame",
+            "mode": "point",
+            "units_advanced": units,
+            "epochs_completed": state.config.current_epoch - epoch,
+            "point": _last_point(batch)
+        }
+
+    result = run_epochs(state, units)
+    return {
+        "type": "frame",
+        "mode": "epoch",
+        "units_advanced": result["epochs_run"],
+        "epoch": state.config.current_epoch,
+        "w": result["w_final"],
+        "b": result["b_final"],
+        "loss": result["loss_final"],
+        "gradient_w": result["gradient_w"],
+        "gradient_b": result["gradient_b"],
+        "gradient_magnitude": result["gradient_magnitude"],
+        # Loss-urile epocilor comasate, ca graficul să nu piardă puncte
+        "losses": result["loss"].tolist()
+    }
+
+
+def _status(state: TrainingState, controls: LiveControls, warnings: Optional[List[str]] = None) -> Dict:
+    return {
+        "type": "status",
+        "running": controls.running,
+        "mode": controls.mode,
+        "fps": controls.fps,
+        "units_per_frame": controls.units_per_frame,
+        "learning_rate": state.config.lr,
+        "epoch": state.config.current_epoch,
+        "warnings": warnings or []
+    }
+
+
+async def _receive_controls(websocket: WebSocket, queue: "asyncio.Queue") -> None:
+    """Citește mesajele de control într-un task separat, ca să nu blocheze frame-urile."""
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                message = text  # respins de _handle_control
+            await queue.put(message)
+    except (WebSocketDisconnect, RuntimeError):
+        await queue.put(_DISCONNECTED)
+
+
+async def _handle_control(
+    websocket: WebSocket,
+    state: TrainingState,
+    controls: LiveControls,
+    message: Any
+) -> None:
+    if not isinstance(message, dict):
+        await _send(websocket, {"type": "error", "detail": "Message must be a JSON object"})
+        return
+
+    kind = message.get("type")
+    warnings = None
+    try:
+        if kind in ("resume", "start"):
+            if state.data.x is None:
+                await _send(websocket, {"type": "error", "detail": "No dataset loaded"})
+                return
+            if "fps" in message:
+                controls.fps = _clamp_fps(message["fps"])
+            controls.running = True
+        elif kind == "pause":
+            controls.running = False
+        elif kind == "step":
+            if state.data.x is None:
+                await _send(websocket, {"type": "error", "detail": "No dataset loaded"})
+                return
+            async with state.lock:
+                frame = await run_in_threadpool(_advance, state, controls, 1)
+            await _send(websocket, frame)
+            return
+        elif kind == "set_fps":
+            controls.fps = _clamp_fps(message["fps"])
+        elif kind == "set_learning_rate":
+            lr = float(message["learning_rate"])
+            async with state.lock:
+                state.config.lr = lr
+                state.revision += 1
+            warnings = explanation_service.analyze_learning_rate(lr, state.optimizer.name)
+        elif kind == "set_mode":
+            mode = message["mode"]
+            if mode not in ("epoch", "point"):
+                raise ValueError(f"Unknown mode: {mode}")
+            if mode != controls.mode:
+                # Gradientul acumulat parțial nu mai e valid după schimbarea modului
+                async with state.lock:
+                    state.point_by_point.reset()
+                    state.revision += 1
+            controls.mode = mode
+        elif kind == "set_units_per_frame":
+            controls.units_per_frame = min(max(int(message["units_per_frame"]), 1), MAX_UNITS_PER_FRAME)
+        else:
+            raise ValueError(f"Unknown message type: {kind}")
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        await _send(websocket, {"type": "error", "detail": str(e)})
+        return
+
+    await _send(websocket, _status(state, controls, warnings))
+
+
+@router.websocket("/ws/training")
+async def live_training(websocket: WebSocket):
+    """
+    Canal live de training. Sesiunea vine din header, cookie sau din
+    query param-ul session_id (browserele nu pot seta header-e pe WebSocket).
+    """
+    try:
+        session_id = resolve_session_id(
+            websocket.headers.get(SESSION_HEADER) or websocket.query_params.get("session_id"),
+            websocket.cookies.get(SESSION_COOKIE)
+        )
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    state = session_store.get(session_id)
+    controls = LiveControls()
+    await websocket.accept()
+    await _send(websocket, _status(state, controls))
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue" = asyncio.Queue()
+    receiver = asyncio.create_task(_receive_controls(websocket, queue))
+    next_frame = loop.time()
+
+    try:
+        while True:
+            timeout = max(next_frame - loop.time(), 0.0) if controls.running else None
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is _DISCONNECTED:
+                break
+            # O sesiune evacuată nu mai este antrenată; cât timp canalul e
+            # folosit, sesiunea rămâne activă (TTL și ordinea LRU)
+            if not session_store.touch(session_id, state):
+                await _send(websocket, {"type": "error", "detail": "Session expired"})
+                await websocket.close(code=1001)
+                break
+            if message is not None:
+                was_running = controls.running
+                await _handle_control(websocket, state, controls, message)
+                if controls.running and not was_running:
+                    next_frame = loop.time()
+                continue
+
+            if state.data.x is None:
+                controls.running = False
+                await _send(websocket, {"type": "error", "detail": "No dataset loaded"})
+                continue
+
+            # Frame-urile ratate (client lent) sunt comasate în acesta
+            now = loop.time()
+            missed = int((now - next_frame) // controls.interval)
+            frames = min(missed + 1, MAX_COALESCED_FRAMES)
+            # Un tick poate însemna mii de epoci cu un optimizator cu stare: pe un thread
+            async with state.lock:
+                frame = await run_in_threadpool(_advance, state, controls, controls.units_per_frame * frames)
+            await _send(websocket, frame)
+
+            next_frame += controls.interval * (missed + 1)
+
+            if controls.mode == "epoch" and not math.isfinite(frame["gradient_magnitude"]):
+                controls.running = False
+                await _send(websocket, _status(state, controls, ["Training diverged"]))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
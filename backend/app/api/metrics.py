@@ -0,0 +1,124 @@
+"""
+Endpoint-ul /metrics și middleware-ul care îl alimentează
+Middleware-ul este ASGI pur (nu BaseHTTPMiddleware), deci nu bufferează
+răspunsurile și nu întrerupe streaming-ul; rutele sunt etichetate cu
+template-ul lor (ex. /api/jobs/{job_id}), nu cu path-ul concret.
+"""
+import asyncio
+import time
+from typing import Iterable, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.api.jobs import job_manager
+from app.api.session import checkpoint_store, session_store
+from app.services import metrics_service
+from app.services.job_service import JOB_STATUSES
+from app.services.metrics_service import Sample, registry
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Latența, dimensiunile payload-urilor și request-urile în curs, pe rută."""
+
+    def __init__(self, app):
+        self.app = app
+        self._monitor: Optional[asyncio.Task] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._monitor is None:
+            self._monitor = asyncio.get_running_loop().create_task(metrics_service.monitor_event_loop())
+
+        start = time.perf_counter()
+        status = 500
+        response_bytes = 0
+        request_bytes = 0
+
+        async def receive_wrapper():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        metrics_service.requests_in_progress.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            metrics_service.requests_in_progress.inc(amount=-1)
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            metrics_service.request_duration.observe(time.perf_counter() - start, method, path, str(status))
+            metrics_service.request_size.observe(request_bytes, method, path)
+            metrics_service.response_size.observe(response_bytes, method, path)
+
+
+def _session_samples() -> Iterable[Sample]:
+    yield (), len(session_store)
+
+
+def _dataset_samples() -> Iterable[Sample]:
+    sizes = [len(state.data.x) for _, state in session_store.items() if state.data.x is not None]
+    yield ("sum",), sum(sizes)
+    yield ("max",), max(sizes, default=0)
+
+
+def _history_samples() -> Iterable[Sample]:
+    lengths = [len(state.history) for _, state in session_store.items()]
+    yield ("sum",), sum(lengths)
+    yield ("max",), max(lengths, default=0)
+
+
+def _memory_samples() -> Iterable[Sample]:
+    yield (), session_store.memory_usage()
+
+
+def _job_samples() -> Iterable[Sample]:
+    counts = dict.fromkeys(JOB_STATUSES, 0)
+    for job in job_manager.all():
+        counts[job.status] += 1
+    for status, count in counts.items():
+        yield (status,), count
+
+
+def _checkpoint_samples(field: str) -> Iterable[Sample]:
+    yield ("checkpoint",), checkpoint_store.last_checkpoint[field]
+    yield ("restore",), checkpoint_store.last_restore[field]
+
+
+registry.gauge("ml_sessions", "Live training sessions", callback=_session_samples)
+registry.gauge("ml_dataset_points", "Dataset size in points across sessions", ("aggregate",), _dataset_samples)
+registry.gauge("ml_history_entries", "Retained loss history entries across sessions", ("aggregate",), _history_samples)
+registry.gauge("ml_sessions_memory_bytes", "Estimated memory held by sessions", callback=_memory_samples)
+registry.gauge("ml_jobs", "Background training jobs by status", ("status",), _job_samples)
+registry.gauge(
+    "ml_checkpoint_seconds", "Duration of the last checkpoint and of the startup restore", ("operation",),
+    lambda: _checkpoint_samples("seconds")
+)
+registry.gauge(
+    "ml_checkpoint_sessions", "Sessions written by the last checkpoint and restored at startup", ("operation",),
+    lambda: _checkpoint_samples("sessions")
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Metrici în format text Prometheus."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,264 @@
+"""
+API Routes pentru regresia liniară multivariată
+Dataset-ul (n, d) este proiectat pe un feature selectat, astfel încât
+endpoint-urile existente (gradient step, point-by-point, landscape) să
+funcționeze neschimbate pe perechea (x_feature, y).
+"""
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.dataset import dataset_summary
+from app.api.session import get_state
+from app.models.schemas import (
+    MultivariateDatasetResponse, MultivariateGenerateRequest, MultivariateRunResponse,
+    MultivariateStateResponse, MultivariateStepResponse, TrainingRunRequest, TrajectoryPoint
+)
+from app.services.ml_service import MLService
+from app.services.multivariate_service import MultivariateService
+from app.services.session_service import TrainingState
+
+router = APIRouter(prefix="/api/multivariate", tags=["multivariate"])
+
+multivariate_service = MultivariateService()
+ml_service = MLService()
+
+
+def _require_dataset(state: TrainingState) -> None:
+    if not state.multivariate.loaded:
+        raise HTTPException(status_code=400, detail="No multivariate dataset loaded")
+
+
+def _dataset_response(
+    state: TrainingState, message: str, include_values: bool, true_weights: Optional[np.ndarray] = None
+) -> MultivariateDatasetResponse:
+    multivariate = state.multivariate
+    return MultivariateDatasetResponse(
+        message=message,
+        **dataset_summary(state, include_values),
+        num_features=len(multivariate.feature_names),
+        feature_names=multivariate.feature_names,
+        feature=multivariate.feature,
+        true_weights=true_weights.tolist() if true_weights is not None else None
+    )
+
+
+def _optimizer_warnings(state: TrainingState) -> List[str]:
+    """Modelul multivariat folosește gradient descent simplu; optimizatorul sesiunii se aplică doar modelului 1D."""
+    if state.optimizer.name == "sgd":
+        return []
+    return [
+        f"Multivariate training uses plain gradient descent; the session optimizer "
+        f"'{state.optimizer.name}' applies only to the single-feature model"
+    ]
+
+
+@router.post("/upload", response_model=MultivariateDatasetResponse, response_model_exclude_none=True)
+async def upload_multivariate(
+    file: UploadFile = File(...),
+    target: Optional[str] = Query(default=None),
+    feature: int = Query(default=0, ge=0),
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Upload CSV numeric cu mai multe feature-uri. Ținta este coloana `target`
+    (implicit ultima); restul coloanelor devin feature-uri.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    
+    try:
+        X, y, names, stats = await run_in_threadpool(
+            multivariate_service.load_from_csv_stream, file.file, target
+        )
+        state.load_multivariate(X, y, names, stats, feature)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Error loading CSV: {str(e)}")
+    
+    return _dataset_response(state, "Multivariate dataset loaded successfully", include_values)
+
+
+@router.post("/generate", response_model=MultivariateDatasetResponse, response_model_exclude_none=True)
+async def generate_multivariate(
+    request: MultivariateGenerateRequest,
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
+    """Generează un dataset sintetic cu `num_features` feature-uri."""
+    try:
+        X, y, names, true_weights = await run_in_threadpool(
+            multivariate_service.generate_dataset,
+            request.num_points, request.num_features, request.noise_level, request.seed
+        )
+        stats = await run_in_threadpool(multivariate_service.compute_statistics, X, y)
+        state.load_multivariate(X, y, names, stats, request.feature)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return _dataset_response(state, f"Generated dataset with {request.num_features} features", include_values, true_weights)
+
+
+@router.post("/projection", response_model=MultivariateDatasetResponse, response_model_exclude_none=True)
+async def select_projection(
+    feature: int = Query(..., ge=0),
+    include_values: bool = Query(default=False),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Alege feature-ul pe care sunt proiectate endpoint-urile 1D.
+    Modelul 1D este resetat; modelul multivariat rămâne neschimbat.
+    """
+    _require_dataset(state)
+    try:
+        state.select_feature(feature)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return _dataset_response(state, f"Projected on {state.multivariate.feature_names[feature]}", include_values)
+
+
+@router.get("/state", response_model=MultivariateStateResponse)
+async def get_multivariate_state(
+    history_points: Optional[int] = Query(default=None, ge=2, le=10_000),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Starea modelului multivariat, calculată în O(d²) din statisticile suficiente.
+    Cu history_points, loss_history este subeșantionat (LTTB) la un număr fix de puncte.
+    """
+    _require_dataset(state)
+    multivariate = state.multivariate
+    history = multivariate.history
+    entries = history.downsample(history_points) if history_points is not None else history.snapshot()
+    stats = multivariate.stats
+    w, b = multivariate.weights, multivariate.bias
+    
+    dw, db, loss = multivariate_service.calculate_gradients_from_stats(stats, w, b)
+    contributions = multivariate_service.feature_contributions(stats, w, dw, np.zeros_like(w))
+    projected_w, projected_b = multivariate_service.projection(stats, w, b, multivariate.feature)
+    
+    return MultivariateStateResponse(
+        epoch=multivariate.current_epoch,
+        feature_names=multivariate.feature_names,
+        weights=w.tolist(),
+        bias=b,
+        loss=loss,
+        gradient_w=dw.tolist(),
+        gradient_b=db,
+        gradient_magnitude=float(np.sqrt(np.dot(dw, dw) + db * db)),
+        importance=contributions["importance"].tolist(),
+        loss_history=entries["loss"].tolist(),
+        loss_history_epochs=entries["epochs"].tolist(),
+        feature=multivariate.feature,
+        projected_w=projected_w,
+        projected_b=projected_b,
+        learning_rate=state.config.lr
+    )
+
+
+@router.post("/step", response_model=MultivariateStepResponse)
+async def multivariate_step(state: TrainingState = Depends(get_state)):
+    """Un pas de gradient descent pe toate feature-urile (X @ w și Xᵀ·r prin BLAS)."""
+    _require_dataset(state)
+    multivariate = state.multivariate
+    w, b = multivariate.weights, multivariate.bias
+    lr = state.config.lr
+    
+    step = await run_in_threadpool(
+        multivariate_service.step, multivariate.X, multivariate.y, multivariate.stats, w, b, lr
+    )
+    w_new, b_new = step["w_new"], step["b_new"]
+    projected_w, projected_b = multivariate_service.projection(multivariate.stats, w_new, b_new, multivariate.feature)
+    
+    multivariate.weights = w_new
+    multivariate.bias = b_new
+    multivariate.current_epoch += 1
+    multivariate.history.append(step["loss_after"], w_new[multivariate.feature], b_new)
+    
+    return MultivariateStepResponse(
+        epoch=multivariate.current_epoch,
+        feature_names=multivariate.feature_names,
+        weights_before=w.tolist(),
+        weights_after=w_new.tolist(),
+        bias_before=b,
+        bias_after=b_new,
+        gradient_w=step["dw"].tolist(),
+        gradient_b=step["db"],
+        gradient_magnitude=step["gradient_magnitude"],
+        delta_w=step["delta_w"].tolist(),
+        delta_b=step["delta_b"],
+        loss_before=step["loss_before"],
+        loss_after=step["loss_after"],
+        loss_delta=step["loss_after"] - step["loss_before"],
+        importance=step["importance"].tolist(),
+        loss_contribution=step["loss_contribution"].tolist(),
+        feature=multivariate.feature,
+        projected_w=projected_w,
+        projected_b=projected_b,
+        learning_rate=lr,
+        warnings=_optimizer_warnings(state)
+    )
+
+
+@router.post("/run", response_model=MultivariateRunResponse)
+async def multivariate_run(request: TrainingRunRequest, state: TrainingState = Depends(get_state)):
+    """Rulează N epoci (sau până la convergență), fiecare în O(d²)."""
+    _require_dataset(state)
+    multivariate = state.multivariate
+    start_epoch = multivariate.current_epoch
+    
+    # O(d²) per epocă: la d mare, mii de epoci durează secunde, deci rulează pe un thread
+    result = await run_in_threadpool(
+        multivariate_service.run_gradient_descent,
+        multivariate.stats, multivariate.weights, multivariate.bias, state.config.lr,
+        request.epochs, request.tolerance, multivariate.feature
+    )
+    epochs_run = len(result["loss"])
+    
+    multivariate.weights = result["w"]
+    multivariate.bias = float(result["b"])
+    multivariate.current_epoch += epochs_run
+    multivariate.history.extend(result["loss"], result["w_projected"], result["b_history"])
+    
+    if epochs_run > 0:
+        loss = float(result["loss"][-1])
+    else:
+        _, _, loss = multivariate_service.calculate_gradients_from_stats(
+            multivariate.stats, multivariate.weights, multivariate.bias
+        )
+    
+    indices = ml_service.sample_indices(epochs_run, request.max_samples)
+    trajectory = [
+        TrajectoryPoint(
+            epoch=start_epoch + int(i) + 1,
+            w=float(result["w_projected"][i]),
+            b=float(result["b_history"][i]),
+            loss=float(result["loss"][i])
+        )
+        for i in indices
+    ]
+    
+    return MultivariateRunResponse(
+        epochs_run=epochs_run,
+        epoch=multivariate.current_epoch,
+        converged=result["converged"],
+        weights=multivariate.weights.tolist(),
+        bias=multivariate.bias,
+        loss=loss,
+        gradient_magnitude=result["gradient_magnitude"],
+        learning_rate=state.config.lr,
+        warnings=_optimizer_warnings(state),
+        feature=multivariate.feature,
+        trajectory=trajectory
+    )
+
+
+@router.post("/reset")
+async def reset_multivariate(state: TrainingState = Depends(get_state)):
+    """Resetează modelul multivariat; păstrează datele."""
+    _require_dataset(state)
+    state.multivariate.reset_model()
+    return {"message": "Multivariate model reset"}
@@ -0,0 +1,52 @@
+"""
+Rezolvarea sesiunii curente pentru routere
+Session id-ul vine din header-ul X-Session-ID sau din cookie-ul session_id.
+Clienții care nu trimit niciunul împart sesiunea implicită.
+"""
+import re
+from typing import AsyncIterator, Optional
+
+from fastapi import Cookie, Header, HTTPException, Request
+
+from app.services.checkpoint_service import CheckpointStore
+from app.services.session_service import SessionStore, TrainingState
+
+SESSION_HEADER = "X-Session-ID"
+SESSION_COOKIE = "session_id"
+DEFAULT_SESSION_ID = "default"
+# Metodele care nu modifică starea; restul incrementează revizia sesiunii
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]{1,64}$")
+
+session_store = SessionStore()
+checkpoint_store = CheckpointStore()
+
+
+def resolve_session_id(
+    x_session_id: Optional[str] = Header(default=None),
+    session_id: Optional[str] = Cookie(default=None),
+) -> str:
+    """Alege session id-ul din header (prioritar) sau cookie."""
+    value = x_session_id or session_id or DEFAULT_SESSION_ID
+    if not _SESSION_ID_PATTERN.match(value):
+        raise HTTPException(status_code=400, detail="Invalid session id")
+    return value
+
+
+async def get_state(
+    request: Request,
+    x_session_id: Optional[str] = Header(default=None),
+    session_id: Optional[str] = Cookie(default=None),
+) -> AsyncIterator[TrainingState]:
+    """
+    Dependency FastAPI: starea de training a sesiunii curente.
+    Lock-ul sesiunii este ținut pe toată durata request-ului, astfel încât
+    request-urile concurente din aceeași sesiune se serializează.
+    Request-urile care pot modifica starea incrementează revizia sesiunii.
+    """
+    state = session_store.get(resolve_session_id(x_session_id, session_id))
+    async with state.lock:
+        if request.method not in READ_ONLY_METHODS:
+            state.revision += 1
+        yield state
@@ -1,250 +1,164 @@
 """
 API Routes pentru training și gradient descent
 """
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import GradientStepResponse, FreezeStateResponse, LearningRateConfig, LearningRateResponse, PointStepResponse
-from app.services.ml_service import MLService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from app.api.fields import Fields, parse_fields, project, wants
+from app.api.session import get_state
+from app.models.schemas import GradientStepResponse, FreezeStateResponse, LearningRateConfig, LearningRateResponse, PointStepResponse, TrainingRunRequest, TrainingRunResponse, TrajectoryPoint, HistoryResponse, HistoryConfig, PointBatchResponse, MiniBatchStepResponse, OptimizerConfig, OptimizerResponse, SweepRequest, SweepConfiguration, SweepResponse
+from app.services.ml_service import ERROR_CATEGORIES, MAX_SWEEP_CONFIGURATIONS, MLService
+from app.services.metrics_service import PhaseTimer, lap
 from app.services.explanation_service import ExplanationService
+from app.services.optimizer_service import OptimizerService, OptimizerState
+from app.services.session_service import TrainingState
+from app.services.time_travel_service import epoch_state_cache
+from typing import Dict, Optional, Union
+import math
 import numpy as np
 
 router = APIRouter(prefix="/api", tags=["training"])
 
-# State global (în producție ar fi Redis/DB)
-state = {
-    "data": {"x": None, "y": None},
-    "model": {"w": 1.0, "b": 1.0},
-    "history": {"loss": [], "w": [], "b": []},
-    "config": {"lr": 0.01, "current_epoch": 0},
-    "point_by_point": {
-        "active": False,
-        "current_index": 0,
-        "accumulated_dw": 0.0,
-        "accumulated_db": 0.0
-    }
-}
+# Câmpurile din GradientStepResponse care cer date per punct / istoricul
+POINT_FIELDS = (
+    "errors", "error_magnitudes", "error_categories", "contributions",
+    "predictions_before", "predictions_after"
+)
+HISTORY_FIELDS = ("loss_history", "loss_history_start", "loss_history_stride", "loss_history_epochs")
+# Bugetul unui request mini-batch, în puncte; fiecare batch costă în plus cât
+# MINIBATCH_BATCH_OVERHEAD puncte (bucla Python și update-ul parametrilor)
+MINIBATCH_WORK_BUDGET = 262_144
+MINIBATCH_BATCH_OVERHEAD = 64
 
 ml_service = MLService()
 explanation_service = ExplanationService()
+optimizer_service = OptimizerService()
 
 
-@router.post("/gradient/step", response_model=GradientStepResponse)
-async def gradient_step():
+def run_epochs(state: TrainingState, epochs: int, tolerance: Optional[float] = None) -> Dict:
     """
-    Execută UN SINGUR gradient descent step.
-    Returnează toate informațiile necesare pentru explicație.
+    Rulează până la `epochs` epoci pe starea sesiunii și actualizează modelul
+    și istoricul. Folosit de /gradient/run și de canalul live (WebSocket).
     """
-    if state["data"]["x"] is None:
-        raise HTTPException(status_code=400, detail="No dataset loaded")
-    
-    x = state["data"]["x"]
-    y = state["data"]["y"]
-    w = state["model"]["w"]
-    b = state["model"]["b"]
-    lr = state["config"]["lr"]
-    
-    # Calculează predicții ÎNAINTE
-    y_pred_before = ml_service.calculate_predictions(x, w, b)
-    
-    # Erori per punct
-    errors, error_magnitudes = ml_service.calculate_errors_per_point(y, y_pred_before)
-    
-    # Contribuții individuale
-    contributions = ml_service.calculate_point_contributions(x, y, y_pred_before)
-    
-    # Gradienți
-    dw, db, grad_magnitude = ml_service.calculate_gradients(x, y, y_pred_before)
-    
-    # Actualizează parametri
-    w_new, b_new, delta_w, delta_b = ml_service.update_parameters(w, b, dw, db, lr)
-    
-    # Predicții DUPĂ
-    y_pred_after = ml_service.calculate_predictions(x, w_new, b_new)
-    
-    # Loss
-    loss_before = ml_service.calculate_mse(y, y_pred_before)
-    loss_after = ml_service.calculate_mse(y, y_pred_after)
-    loss_delta = loss_after - loss_before
-    
-    # Explicații
-    explanations = explanation_service.generate_step_explanation(
-        x, y, y_pred_before, w, b, dw, db, lr, errors
+    result = ml_service.run_gradient_descent(
+        state.data.stats, state.model.w, state.model.b, state.config.lr, epochs, tolerance,
+        state.optimizer
     )
+    epochs_run = len(result["loss"])
+    
+    if epochs_run > 0:
+        w_final = float(result["w"][-1])
+        b_final = float(result["b"][-1])
+        loss_final = float(result["loss"][-1])
+    else:
+        w_final = float(state.model.w)
+        b_final = float(state.model.b)
+        loss_final = ml_service.calculate_mse_from_stats(state.data.stats, w_final, b_final)
     
     # Actualizează state
-    state["model"]["w"] = w_new
-    state["model"]["b"] = b_new
-    state["history"]["loss"].append(float(loss_after))
-    state["history"]["w"].append(float(w_new))
-    state["history"]["b"].append(float(b_new))
-    state["config"]["current_epoch"] += 1
-    
-    # Clasifică erori
-    error_categories = ml_service.categorize_errors(error_magnitudes)
-    
-    return GradientStepResponse(
-        epoch=state["config"]["current_epoch"],
-        w_before=float(w),
-        b_before=float(b),
-        w_after=float(w_new),
-        b_after=float(b_new),
-        delta_w=float(delta_w),
-        delta_b=float(delta_b),
-        gradient_w=float(dw),
-        gradient_b=float(db),
-        gradient_magnitude=float(grad_magnitude),
-        loss_before=float(loss_before),
-        loss_after=float(loss_after),
-        loss_delta=float(loss_delta),
-        loss_history=state["history"]["loss"],
-        errors=errors.tolist(),
-        error_magnitudes=error_magnitudes.tolist(),
-        error_categories=error_categories,
-        contributions=contributions,
-        predictions_before=y_pred_before.tolist(),
-        predictions_after=y_pred_after.tolist(),
-        explanations=explanations,
-        learning_rate=lr,
-        step_size=float(lr * grad_magnitude)
-    )
+    state.model.w = w_final
+    state.model.b = b_final
+    state.history.extend(result["loss"], result["w"], result["b"])
+    state.config.current_epoch += epochs_run
+    
+    result.update(epochs_run=epochs_run, w_final=w_final, b_final=b_final, loss_final=loss_final)
+    return result
 
 
-@router.get("/state/current", response_model=FreezeStateResponse)
-async def get_current_state():
-    """Returnează starea curentă pentru modul 'Freeze & Explain'."""
-    if state["data"]["x"] is None:
-        raise HTTPException(status_code=400, detail="No dataset loaded")
+def _complete_point_epoch(state: TrainingState, w: float, b: float, explain: bool = True) -> Dict:
+    """
+    Închide o epocă point-by-point: aplică gradientul acumulat, calculează
+    categoriile de eroare și (opțional) explicațiile, salvează istoricul și
+    resetează cursorul.
+    """
+    x = state.data.x
+    y = state.data.y
+    lr = state.config.lr
+    accumulated_dw = state.point_by_point.accumulated_dw
+    accumulated_db = state.point_by_point.accumulated_db
+    
+    # Update parametri cu optimizatorul sesiunii
+    w_new, b_new, _, _ = ml_service.apply_update(
+        w, b, accumulated_dw, accumulated_db, lr, state.optimizer, state.data.stats
+    )
     
-    x = state["data"]["x"]
-    y = state["data"]["y"]
-    w = state["model"]["w"]
-    b = state["model"]["b"]
-    
-    y_pred = ml_service.calculate_predictions(x, w, b)
-    errors, _ = ml_service.calculate_errors_per_point(y, y_pred)
-    contributions = ml_service.calculate_point_contributions(x, y, y_pred)
-    dw, db, grad_magnitude = ml_service.calculate_gradients(x, y, y_pred)
-    loss = ml_service.calculate_mse(y, y_pred)
-    
-    mse_formula = {
-        "formula": "MSE = (1/n) Σ(yᵢ - ŷᵢ)²",
-        "n": len(x),
-        "sum_squared_errors": float(np.sum(errors**2)),
-        "mse_value": float(loss),
-        "individual_squared_errors": (errors**2).tolist()
-    }
+    # Actualizează modelul
+    state.model.w = w_new
+    state.model.b = b_new
+    state.config.current_epoch += 1
     
-    gradient_formula = {
-        "dw_formula": "∇w = -(2/n) Σ xᵢ(yᵢ - ŷᵢ)",
-        "db_formula": "∇b = -(2/n) Σ (yᵢ - ŷᵢ)",
-        "dw_value": float(dw),
-        "db_value": float(db),
-        "sum_x_errors": float(np.sum(x * errors)),
-        "sum_errors": float(np.sum(errors))
-    }
+    y_pred_all = ml_service.calculate_predictions(x, w_new, b_new)
+    loss = ml_service.calculate_mse_from_stats(state.data.stats, w_new, b_new)
     
-    return FreezeStateResponse(
-        model={
-            "w": float(w),
-            "b": float(b),
-            "equation": f"y = {w:.4f}·x + {b:.4f}"
-        },
-        loss=float(loss),
-        gradient={
-            "dw": float(dw),
-            "db": float(db),
-            "magnitude": float(grad_magnitude)
-        },
-        mse_breakdown=mse_formula,
-        gradient_breakdown=gradient_formula,
-        predictions=y_pred.tolist(),
-        errors=errors.tolist(),
-        contributions=contributions,
-        epoch=state["config"]["current_epoch"]
-    )
-
-
-@router.post("/config/learning-rate", response_model=LearningRateResponse)
-async def set_learning_rate(config: LearningRateConfig):
-    """Setează learning rate și returnează warnings."""
-    state["config"]["lr"] = config.learning_rate
+    # Calculează categorii de eroare pentru colorare
+    errors, error_magnitudes = ml_service.calculate_errors_per_point(y, y_pred_all)
+    lap("epoch_update")
     
-    warnings = explanation_service.analyze_learning_rate(config.learning_rate)
+    # Explicații detaliate (la fel ca în gradient_step), din erorile deja calculate
+    explanations = None
+    if explain:
+        summary = explanation_service.summarize_errors(errors, error_magnitudes)
+        explanations = explanation_service.explain_step(summary, accumulated_dw, accumulated_db, lr)
+        lap("explanations")
     
-    return LearningRateResponse(
-        learning_rate=config.learning_rate,
-        warnings=warnings,
-        status="ok" if not warnings else "warning"
-    )
-
-
-@router.post("/model/reset")
-async def reset_model():
-    """Resetează doar modelul, păstrează datele."""
-    state["model"]["w"] = 1.0
-    state["model"]["b"] = 1.0
-    state["history"]["loss"] = []
-    state["history"]["w"] = []
-    state["history"]["b"] = []
-    state["config"]["current_epoch"] = 0
-    state["point_by_point"]["active"] = False
-    state["point_by_point"]["current_index"] = 0
-    state["point_by_point"]["accumulated_dw"] = 0.0
-    state["point_by_point"]["accumulated_db"] = 0.0
+    state.history.append(loss, w_new, b_new)
+    
+    # Reset pentru următoarea epocă
+    state.point_by_point.reset()
     
     return {
-        "message": "Model reset to initial state",
-        "w": state["model"]["w"],
-        "b": state["model"]["b"],
-        "learning_rate": state["config"]["lr"]
+        "w_new": w_new,
+        "b_new": b_new,
+        "error_categories": ml_service.categorize_errors(error_magnitudes),
+        "error_magnitudes": error_magnitudes.tolist(),
+        "explanations": explanations
     }
 
 
-@router.post("/gradient/point-step", response_model=PointStepResponse)
-async def gradient_point_step():
+def advance_point(state: TrainingState, explain: bool = True) -> PointStepResponse:
     """
-    Procesează un singur punct din dataset în modul pas cu pas.
-    Returnează detalii despre contribuția acestui punct la gradient.
+    Avansează cursorul point-by-point cu un punct și acumulează contribuția lui.
+    La ultimul punct aplică update-ul și închide epoca.
     """
-    if state["data"]["x"] is None:
-        raise HTTPException(status_code=400, detail="No dataset loaded")
-    
-    x = state["data"]["x"]
-    y = state["data"]["y"]
+    x = state.data.x
+    y = state.data.y
     n = len(x)
     
     # Inițializează modul pas cu pas dacă nu e activ
-    if not state["point_by_point"]["active"]:
-        state["point_by_point"]["active"] = True
-        state["point_by_point"]["current_index"] = 0
-        state["point_by_point"]["accumulated_dw"] = 0.0
-        state["point_by_point"]["accumulated_db"] = 0.0
+    if not state.point_by_point.active:
+        state.point_by_point.active = True
+        state.point_by_point.current_index = 0
+        state.point_by_point.accumulated_dw = 0.0
+        state.point_by_point.accumulated_db = 0.0
     
-    idx = state["point_by_point"]["current_index"]
+    idx = state.point_by_point.current_index
     
     # Dacă am terminat toate punctele, resetează automat pentru următoarea epocă
     if idx >= n:
-        state["point_by_point"]["current_index"] = 0
-        state["point_by_point"]["accumulated_dw"] = 0.0
-        state["point_by_point"]["accumulated_db"] = 0.0
+        state.point_by_point.current_index = 0
+        state.point_by_point.accumulated_dw = 0.0
+        state.point_by_point.accumulated_db = 0.0
         idx = 0
     
-    w = state["model"]["w"]
-    b = state["model"]["b"]
-    lr = state["config"]["lr"]
+    w = state.model.w
+    b = state.model.b
+    lr = state.config.lr
     
     # Calculează pentru punctul curent
     xi = x[idx]
     yi = y[idx]
     y_pred = w * xi + b
     error = yi - y_pred
+    lap("predictions")
     
     # Contribuția acestui punct la gradient
     contribution_w = -(2/n) * xi * error
     contribution_b = -(2/n) * error
+    lap("contributions")
     
     # Acumulează gradienții
-    state["point_by_point"]["accumulated_dw"] += contribution_w
-    state["point_by_point"]["accumulated_db"] += contribution_b
+    state.point_by_point.accumulated_dw += contribution_w
+    state.point_by_point.accumulated_db += contribution_b
+    lap("gradients")
     
     # Verifică dacă e ultimul punct
     is_last = (idx == n - 1)
@@ -256,50 +170,19 @@ async def gradient_point_step():
     explanations_list = None
     
     if is_last:
-        # Update parametri
-        w_new = w - lr * state["point_by_point"]["accumulated_dw"]
-        b_new = b - lr * state["point_by_point"]["accumulated_db"]
-        
-        # Actualizează modelul
-        state["model"]["w"] = w_new
-        state["model"]["b"] = b_new
-        state["config"]["current_epoch"] += 1
-        
-        # Calculează predicții ÎNAINTE și DUPĂ pentru explicații
-        y_pred_before = ml_service.calculate_predictions(x, w, b)
-        y_pred_all = ml_service.calculate_predictions(x, w_new, b_new)
-        loss = ml_service.calculate_mse(y, y_pred_all)
+        epoch_end = _complete_point_epoch(state, w, b, explain)
+        w_new, b_new = epoch_end["w_new"], epoch_end["b_new"]
+        error_categories = epoch_end["error_categories"]
+        error_magnitudes_list = epoch_end["error_magnitudes"]
+        explanations_list = epoch_end["explanations"]
         
-        # Calculează categorii de eroare pentru colorare
-        errors, error_magnitudes = ml_service.calculate_errors_per_point(y, y_pred_all)
-        error_categories = ml_service.categorize_errors(error_magnitudes)
-        error_magnitudes_list = error_magnitudes.tolist()
-        
-        # Generează explicații detaliate (la fel ca în gradient_step)
-        explanations_list = explanation_service.generate_step_explanation(
-            x, y, y_pred_before, w, b,
-            state["point_by_point"]["accumulated_dw"],
-            state["point_by_point"]["accumulated_db"],
-            lr, errors
-        )
-        
-        state["history"]["loss"].append(float(loss))
-        state["history"]["w"].append(float(w_new))
-        state["history"]["b"].append(float(b_new))
-        
-        # Reset pentru următoarea epocă
-        state["point_by_point"]["active"] = False
-        state["point_by_point"]["current_index"] = 0
-        state["point_by_point"]["accumulated_dw"] = 0.0
-        state["point_by_point"]["accumulated_db"] = 0.0
-        
-        explanation = f"✅ Epocă {state['config']['current_epoch']} completă! Parametri actualizați: w={w_new:.4f}, b={b_new:.4f}"
+        explanation = f"✅ Epocă {state.config.current_epoch} completă! Parametri actualizați: w={w_new:.4f}, b={b_new:.4f}"
     else:
         # Avansează la următorul punct
-        state["point_by_point"]["current_index"] += 1
+        state.point_by_point.current_index += 1
         explanation = f"Punct {idx+1}/{n}: eroare={error:.4f}, contribuție_w={contribution_w:.6f}, contribuție_b={contribution_b:.6f}"
     
-    return PointStepResponse(
+    response = PointStepResponse(
         point_index=idx,
         total_points=n,
         x_value=float(xi),
@@ -308,8 +191,8 @@ async def gradient_point_step():
         error=float(error),
         contribution_w=float(contribution_w),
         contribution_b=float(contribution_b),
-        accumulated_gradient_w=float(state["point_by_point"]["accumulated_dw"]),
-        accumulated_gradient_b=float(state["point_by_point"]["accumulated_db"]),
+        accumulated_gradient_w=float(state.point_by_point.accumulated_dw),
+        accumulated_gradient_b=float(state.point_by_point.accumulated_db),
         is_last_point=is_last,
         w_current=float(w),
         b_current=float(b),
@@ -318,17 +201,732 @@ async def gradient_point_step():
         explanation=explanation,
         error_categories=error_categories,
         error_magnitudes=error_magnitudes_list,
-        epoch=state["config"]["current_epoch"] if is_last else None,
+        epoch=state.config.current_epoch if is_last else None,
         explanations=explanations_list
     )
+    lap("serialization")
+    return response
+
+
+def advance_points(state: TrainingState, count: int, explain: bool = True) -> PointBatchResponse:
+    """
+    Avansează cursorul point-by-point cu până la `count` puncte, vectorizat.
+    Un batch se oprește mereu la sfârșitul epocii, deci is_last_point are
+    aceeași semnificație ca la procesarea punct cu punct.
+    """
+    x = state.data.x
+    y = state.data.y
+    n = len(x)
+    pbp = state.point_by_point
+    
+    if not pbp.active or pbp.current_index >= n:
+        pbp.reset()
+        pbp.active = True
+    
+    start = pbp.current_index
+    stop = min(start + count, n)
+    w = state.model.w
+    b = state.model.b
+    
+    xs = x[start:stop]
+    ys = y[start:stop]
+    y_pred = w * xs + b
+    errors = ys - y_pred
+    lap("predictions")
+    contributions_w = -(2/n) * xs * errors
+    contributions_b = -(2/n) * errors
+    lap("contributions")
+    
+    # Sume cumulative secvențiale, identice cu acumularea punct cu punct
+    accumulated_w = np.cumsum(np.concatenate(([pbp.accumulated_dw], contributions_w)))[1:]
+    accumulated_b = np.cumsum(np.concatenate(([pbp.accumulated_db], contributions_b)))[1:]
+    pbp.accumulated_dw = float(accumulated_w[-1])
+    pbp.accumulated_db = float(accumulated_b[-1])
+    lap("gradients")
+    
+    is_last = stop == n
+    response = PointBatchResponse(
+        start_index=start,
+        count=stop - start,
+        total_points=n,
+        point_indices=list(range(start, stop)),
+        x_values=xs.tolist(),
+        y_actual=ys.tolist(),
+        y_predicted=y_pred.tolist(),
+        errors=errors.tolist(),
+        contributions_w=contributions_w.tolist(),
+        contributions_b=contributions_b.tolist(),
+        accumulated_gradient_w=accumulated_w.tolist(),
+        accumulated_gradient_b=accumulated_b.tolist(),
+        is_last_point=is_last,
+        w_current=float(w),
+        b_current=float(b)
+    )
+    lap("serialization")
+    
+    if is_last:
+        epoch_end = _complete_point_epoch(state, w, b, explain)
+        response.w_new = float(epoch_end["w_new"])
+        response.b_new = float(epoch_end["b_new"])
+        response.error_categories = epoch_end["error_categories"]
+        response.error_magnitudes = epoch_end["error_magnitudes"]
+        response.explanations = epoch_end["explanations"]
+        response.epoch = state.config.current_epoch
+    else:
+        pbp.current_index = stop
+    
+    return response
+
+
+def advance_minibatches(state: TrainingState, batch_size: int, count: int, seed: Optional[int] = None) -> MiniBatchStepResponse:
+    """
+    Mini-batch SGD: procesează până la `count` mini-batch-uri, fiecare cu
+    propriul update al parametrilor. Ordinea punctelor e amestecată pe server
+    la începutul fiecărei epoci; batch-urile se opresc la sfârșitul epocii.
+    Numărul de batch-uri e limitat și de MINIBATCH_WORK_BUDGET (câmpul
+    batches din răspuns spune câte au fost procesate).
+    """
+    count = min(count, max(MINIBATCH_WORK_BUDGET // (batch_size + MINIBATCH_BATCH_OVERHEAD), 1))
+    x = state.data.x
+    y = state.data.y
+    n = len(x)
+    mb = state.minibatch
+    
+    if not mb.active or mb.seed != seed:
+        mb.reset()
+        mb.active = True
+        mb.seed = seed
+        mb.rng = np.random.default_rng(seed)
+    if mb.order is None:
+        mb.order = mb.rng.permutation(n)
+    
+    batches_per_epoch = -(-n // batch_size)
+    w = state.model.w
+    b = state.model.b
+    lr = state.config.lr
+    
+    batch_index, w_values, b_values, gradients_w, gradients_b, batch_losses = [], [], [], [], [], []
+    indices = mb.order[:0]
+    for _ in range(count):
+        start = mb.cursor
+        indices = mb.order[start:start + batch_size]
+        xs = x[indices]
+        errors = y[indices] - (w * xs + b)
+        size = len(indices)
+        
+        dw = -(2/size) * float(np.dot(xs, errors))
+        db = -(2/size) * float(errors.sum())
+        w, b, _, _ = ml_service.apply_update(w, b, dw, db, lr, state.optimizer, state.data.stats)
+        
+        batch_index.append(start // batch_size)
+        w_values.append(w)
+        b_values.append(b)
+        gradients_w.append(dw)
+        gradients_b.append(db)
+        batch_losses.append(float(np.dot(errors, errors)) / size)
+        mb.cursor = start + size
+        if mb.cursor >= n:
+            break
+    
+    state.model.w = w
+    state.model.b = b
+    
+    is_last = mb.cursor >= n
+    response = MiniBatchStepResponse(
+        batch_size=batch_size,
+        batches=len(batch_index),
+        batches_per_epoch=batches_per_epoch,
+        batch_index=batch_index,
+        w=w_values,
+        b=b_values,
+        gradient_w=gradients_w,
+        gradient_b=gradients_b,
+        batch_loss=batch_losses,
+        last_batch_indices=indices.tolist(),
+        is_last_batch=is_last
+    )
+    
+    if is_last:
+        loss = ml_service.calculate_mse_from_stats(state.data.stats, w, b)
+        state.history.append(loss, w, b)
+        state.config.current_epoch += 1
+        # Epoca următoare primește o nouă permutare
+        mb.cursor = 0
+        mb.order = None
+        response.epoch = state.config.current_epoch
+        response.loss = loss
+    
+    return response
+
+
+def freeze_state(state: TrainingState, w: float, b: float, epoch: int, selected: Fields = None) -> FreezeStateResponse:
+    """
+    Construiește vederea 'Freeze & Explain' pentru parametrii (w, b).
+    Datele per punct sunt calculate doar pentru câmpurile selectate.
+    """
+    x = state.data.x
+    y = state.data.y
+    
+    # Scalari în O(1) din statisticile suficiente
+    stats = state.data.stats
+    sum_errors, sum_x_errors, sum_squared_errors = ml_service.calculate_residual_sums(stats, w, b)
+    dw, db, grad_magnitude = ml_service.calculate_gradients_from_stats(stats, w, b)
+    loss = sum_squared_errors / stats.n
+    
+    # Date per punct, doar dacă vreun câmp cerut are nevoie de ele
+    y_pred = errors = None
+    if wants(selected, "predictions", "errors", "contributions", "mse_breakdown"):
+        y_pred = ml_service.calculate_predictions(x, w, b)
+        errors, _ = ml_service.calculate_errors_per_point(y, y_pred)
+    contributions = {}
+    if wants(selected, "contributions"):
+        contributions = ml_service.calculate_point_contributions(x, y, y_pred)
+    
+    mse_formula = {}
+    if wants(selected, "mse_breakdown"):
+        mse_formula = {
+            "formula": "MSE = (1/n) Σ(yᵢ - ŷᵢ)²",
+            "n": len(x),
+            "sum_squared_errors": float(sum_squared_errors),
+            "mse_value": float(loss),
+            "individual_squared_errors": (errors**2).tolist()
+        }
+    
+    gradient_formula = {
+        "dw_formula": "∇w = -(2/n) Σ xᵢ(yᵢ - ŷᵢ)",
+        "db_formula": "∇b = -(2/n) Σ (yᵢ - ŷᵢ)",
+        "dw_value": float(dw),
+        "db_value": float(db),
+        "sum_x_errors": float(sum_x_errors),
+        "sum_errors": float(sum_errors)
+    }
+    
+    response = FreezeStateResponse(
+        model={
+            "w": float(w),
+            "b": float(b),
+            "equation": f"y = {w:.4f}·x + {b:.4f}"
+        },
+        loss=float(loss),
+        gradient={
+            "dw": float(dw),
+            "db": float(db),
+            "magnitude": float(grad_magnitude)
+        },
+        mse_breakdown=mse_formula,
+        gradient_breakdown=gradient_formula,
+        predictions=y_pred.tolist() if wants(selected, "predictions") else [],
+        errors=errors.tolist() if wants(selected, "errors") else [],
+        contributions=contributions,
+        epoch=epoch
+    )
+    return response
+
+
+@router.post("/gradient/step", response_model=GradientStepResponse, response_model_exclude_none=True)
+async def gradient_step(
+    since_epoch: Optional[int] = Query(default=None, ge=0),
+    include_points: Optional[bool] = Query(default=None),
+    history_points: Optional[int] = Query(default=None, ge=2, le=10_000),
+    explain: Optional[bool] = Query(default=None),
+    fields: Optional[str] = Query(default=None),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Execută UN SINGUR gradient descent step.
+    Returnează toate informațiile necesare pentru explicație.
+    
+    Mod delta: cu since_epoch (ultima epocă văzută de client) se trimit doar
+    intrările noi din loss_history, iar vectorii per punct sunt omiși dacă
+    nu sunt ceruți explicit cu include_points=true.
+    Cu history_points, loss_history este subeșantionat (LTTB) la un număr fix de puncte.
+    Explicațiile sunt generate implicit doar în afara modului delta (explain=true le forțează).
+    Cu fields=a,b,c răspunsul conține doar acele câmpuri, iar datele per punct,
+    explicațiile și istoricul sunt calculate doar dacă sunt cerute
+    (fields are prioritate față de include_points și explain).
+    Fazele (kernel/gradients, explanations, history, serialization) sunt
+    cronometrate în ml_phase_duration_seconds.
+    """
+    timer = PhaseTimer("gradient_step")
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    selected = parse_fields(fields, GradientStepResponse)
+    delta_mode = since_epoch is not None
+    if selected is not None:
+        include_points = wants(selected, *POINT_FIELDS)
+        explain = "explanations" in selected
+    if include_points is None:
+        include_points = not delta_mode
+    if explain is None:
+        explain = not delta_mode
+    
+    args = (state, timer, selected, include_points, explain, since_epoch, history_points)
+    if include_points or explain:
+        # Calea O(n) (date per punct, explicații) rulează pe un thread, ca
+        # event loop-ul să rămână liber; lock-ul sesiunii rămâne ținut
+        return await run_in_threadpool(_gradient_step, *args)
+    return _gradient_step(*args)
+
+
+def _gradient_step(
+    state: TrainingState,
+    timer: PhaseTimer,
+    selected: Fields,
+    include_points: bool,
+    explain: bool,
+    since_epoch: Optional[int],
+    history_points: Optional[int]
+) -> Response:
+    """Corpul lui /gradient/step, după interpretarea parametrilor."""
+    delta_mode = since_epoch is not None
+    x = state.data.x
+    y = state.data.y
+    w = state.model.w
+    b = state.model.b
+    lr = state.config.lr
+    
+    if include_points:
+        # Date per punct și scalari într-un singur kernel, în buffere refolosite
+        step = ml_service.fused_step(
+            x, y, w, b, lr, state.data.step_buffers(), state.optimizer, state.data.stats
+        )
+        y_pred_before = step["predictions_before"]
+        errors = step["errors"]
+        # Predicții, contribuții și gradienți sunt calculate în același kernel
+        timer.lap("kernel")
+    else:
+        # Gradienți, parametri noi și loss în O(1) din statisticile suficiente
+        step = ml_service.fast_step(state.data.stats, w, b, lr, state.optimizer)
+        timer.lap("gradients")
+    
+    dw, db, grad_magnitude = step["dw"], step["db"], step["gradient_magnitude"]
+    w_new, b_new = step["w_new"], step["b_new"]
+    delta_w, delta_b = step["delta_w"], step["delta_b"]
+    loss_before = step["loss_before"]
+    loss_after = step["loss_after"]
+    loss_delta = loss_after - loss_before
+    
+    # Explicații: refolosesc magnitudinile și maximul din kernel; calea O(1)
+    # parcurge datele doar dacă explicațiile sunt cerute
+    explanations = None
+    if explain:
+        if include_points:
+            summary = explanation_service.summarize_errors(
+                errors, step["error_magnitudes"], step["max_error_index"]
+            )
+        else:
+            summary = explanation_service.summarize_errors(y - ml_service.calculate_predictions(x, w, b))
+        explanations = explanation_service.explain_step(summary, dw, db, lr)
+        timer.lap("explanations")
+    
+    # Actualizează state
+    state.model.w = w_new
+    state.model.b = b_new
+    state.history.append(loss_after, w_new, b_new)
+    state.config.current_epoch += 1
+    
+    # Loss history: reținut complet, subeșantionat sau doar intrările de după since_epoch.
+    # Un since_epoch mai mare decât istoricul (ex. după reset) primește istoricul complet.
+    history = state.history
+    downsampled = False
+    if not wants(selected, *HISTORY_FIELDS):
+        entries = {"epochs": history.epochs[:0], "loss": history.loss[:0]}
+    elif delta_mode and since_epoch < history.total_epochs:
+        entries = history.since(since_epoch)
+    elif history_points is not None:
+        entries = history.downsample(history_points)
+        downsampled = True
+    else:
+        entries = history.snapshot()
+    history_epochs = entries["epochs"]
+    timer.lap("history")
+    
+    response = GradientStepResponse(
+        epoch=state.config.current_epoch,
+        w_before=float(w),
+        b_before=float(b),
+        w_after=float(w_new),
+        b_after=float(b_new),
+        delta_w=float(delta_w),
+        delta_b=float(delta_b),
+        gradient_w=float(dw),
+        gradient_b=float(db),
+        gradient_magnitude=float(grad_magnitude),
+        loss_before=float(loss_before),
+        loss_after=float(loss_after),
+        loss_delta=float(loss_delta),
+        loss_history=entries["loss"].tolist(),
+        loss_history_start=int(history_epochs[0]) if len(history_epochs) else history.total_epochs + 1,
+        loss_history_stride=history.stride,
+        loss_history_epochs=history_epochs.tolist() if downsampled else None,
+        explanations=explanations,
+        learning_rate=lr,
+        step_size=float(math.hypot(delta_w, delta_b))
+    )
+    
+    if include_points:
+        # Conversia în liste e partea scumpă: doar câmpurile cerute
+        errors_list = errors.tolist() if wants(selected, "errors", "contributions") else None
+        if wants(selected, "errors"):
+            response.errors = errors_list
+        if wants(selected, "error_magnitudes"):
+            response.error_magnitudes = step["error_magnitudes"].tolist()
+        if wants(selected, "error_categories"):
+            response.error_categories = [ERROR_CATEGORIES[i] for i in step["error_category_codes"]]
+        if wants(selected, "contributions"):
+            response.contributions = {
+                "dw_individual": step["dw_individual"].tolist(),
+                "db_individual": step["db_individual"].tolist(),
+                "errors": errors_list
+            }
+        if wants(selected, "predictions_before"):
+            response.predictions_before = y_pred_before.tolist()
+        if wants(selected, "predictions_after"):
+            response.predictions_after = step["predictions_after"].tolist()
+    
+    # Serializare explicită: altfel FastAPI ar serializa după return, în afara
+    # fazei cronometrate (și pe event loop); pydantic scrie NaN/inf ca null
+    content = response.model_dump_json(
+        include=set(selected) if selected is not None else None, exclude_none=True
+    )
+    timer.lap("serialization")
+    return Response(content=content, media_type="application/json")
+
+
+@router.post("/gradient/run", response_model=TrainingRunResponse)
+async def gradient_run(request: TrainingRunRequest, state: TrainingState = Depends(get_state)):
+    """
+    Rulează N epoci (sau până la convergență) într-un singur request.
+    Returnează doar starea finală și o traiectorie subeșantionată.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    start_epoch = state.config.current_epoch
+    # Optimizatorii cu stare parcurg epocile una câte una: pe un thread, nu pe event loop
+    result = await run_in_threadpool(run_epochs, state, request.epochs, request.tolerance)
+    epochs_run = result["epochs_run"]
+    
+    indices = ml_service.sample_indices(epochs_run, request.max_samples)
+    trajectory = [
+        TrajectoryPoint(
+            epoch=start_epoch + int(i) + 1,
+            w=float(result["w"][i]),
+            b=float(result["b"][i]),
+            loss=float(result["loss"][i])
+        )
+        for i in indices
+    ]
+    
+    return TrainingRunResponse(
+        epochs_run=epochs_run,
+        epoch=state.config.current_epoch,
+        converged=result["converged"],
+        w=result["w_final"],
+        b=result["b_final"],
+        loss=result["loss_final"],
+        gradient_w=result["gradient_w"],
+        gradient_b=result["gradient_b"],
+        gradient_magnitude=result["gradient_magnitude"],
+        learning_rate=state.config.lr,
+        trajectory=trajectory
+    )
+
+
+def _finite_or_none(values: np.ndarray) -> list:
+    return [value if math.isfinite(value) else None for value in values.tolist()]
+
+
+def _sweep_response(state: TrainingState, lr: np.ndarray, w0: np.ndarray, b0: np.ndarray, request: SweepRequest) -> SweepResponse:
+    sample_epochs = ml_service.sample_indices(request.epochs + 1, request.max_samples)
+    result = ml_service.run_sweep(state.data.stats, lr, w0, b0, request.epochs, request.tolerance, sample_epochs)
+    
+    final_loss = np.where(result["diverged"], np.inf, result["loss"])
+    best_index = int(np.argmin(final_loss)) if np.isfinite(final_loss).any() else None
+    w, b, loss = _finite_or_none(result["w"]), _finite_or_none(result["b"]), _finite_or_none(result["loss"])
+    curves = result["loss_curves"].T
+    configurations = [
+        SweepConfiguration(
+            learning_rate=float(lr[i]),
+            initial_w=float(w0[i]),
+            initial_b=float(b0[i]),
+            epochs_run=int(result["epochs_run"][i]),
+            converged=bool(result["converged"][i]),
+            diverged=bool(result["diverged"][i]),
+            epochs_to_converge=int(result["epochs_run"][i]) if result["converged"][i] else None,
+            w=w[i],
+            b=b[i],
+            loss=loss[i],
+            loss_curve=_finite_or_none(curves[i])
+        )
+        for i in range(len(lr))
+    ]
+    return SweepResponse(
+        num_configurations=len(lr),
+        epochs=sample_epochs.tolist(),
+        best_index=best_index,
+        configurations=configurations
+    )
+
+
+@router.post("/gradient/sweep", response_model=SweepResponse, response_model_exclude_none=True)
+async def gradient_sweep(request: SweepRequest, state: TrainingState = Depends(get_state)):
+    """
+    Antrenează o grilă de configurații (learning rate × (w₀, b₀)) deodată,
+    cu gradient descent simplu, fără a modifica modelul sesiunii.
+    Returnează, pentru fiecare configurație, curba de loss eșantionată,
+    flag-urile de convergență/divergență și epocile până la convergență.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    learning_rates = request.learning_rates or [state.config.lr]
+    initial_params = request.initial_params or [(state.model.w, state.model.b)]
+    if not all(math.isfinite(lr) and lr > 0 for lr in learning_rates):
+        raise HTTPException(status_code=400, detail="Learning rates must be positive and finite")
+    if not all(math.isfinite(w) and math.isfinite(b) for w, b in initial_params):
+        raise HTTPException(status_code=400, detail="Initial parameters must be finite")
+    num_configurations = len(learning_rates) * len(initial_params)
+    if num_configurations > MAX_SWEEP_CONFIGURATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {num_configurations} configurations (max {MAX_SWEEP_CONFIGURATIONS})"
+        )
+    
+    # Produsul cartezian: toate perechile inițiale pentru fiecare learning rate
+    params = np.asarray(initial_params, dtype=np.float64)
+    lr = np.repeat(np.asarray(learning_rates, dtype=np.float64), len(params))
+    w0 = np.tile(params[:, 0], len(learning_rates))
+    b0 = np.tile(params[:, 1], len(learning_rates))
+    return await run_in_threadpool(_sweep_response, state, lr, w0, b0, request)
+
+
+@router.get("/state/current", response_model=FreezeStateResponse)
+async def get_current_state(
+    fields: Optional[str] = Query(default=None),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Returnează starea curentă pentru modul 'Freeze & Explain'.
+    Cu fields=a,b,c se calculează și se trimit doar acele câmpuri; scalarii
+    (model, loss, gradient, epoch) costă O(1).
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    selected = parse_fields(fields, FreezeStateResponse)
+    response = freeze_state(state, state.model.w, state.model.b, state.config.current_epoch, selected)
+    return project(response, selected)
+
+
+@router.get("/state/at", response_model=FreezeStateResponse)
+async def get_state_at(
+    epoch: int = Query(..., ge=1),
+    nearest: bool = Query(default=False),
+    fields: Optional[str] = Query(default=None),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Vederea 'Freeze & Explain' pentru o epocă trecută, reconstruită din
+    (w, b)-ul epocii din istoric și din dataset, fără replay.
+    Cu nearest=true se folosește cea mai apropiată epocă reținută (istoricul
+    ring/decimate nu păstrează toate epocile). Răspunsurile recente sunt
+    servite din cache, deci navigarea înainte-înapoi prin rulare e instantanee.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    selected = parse_fields(fields, FreezeStateResponse)
+    entry = state.history.at(epoch, nearest)
+    if entry is None:
+        history = state.history
+        raise HTTPException(
+            status_code=404,
+            detail=f"Epoch {epoch} is not retained (history: {len(history)} of {history.total_epochs} epochs, "
+                   f"policy={history.policy}, stride={history.stride}); use nearest=true"
+        )
+    
+    x = state.data.x
+    key = epoch_state_cache.key(x, entry["epoch"], entry["w"], entry["b"], selected)
+    content = epoch_state_cache.get(key, x)
+    cache_status = "hit"
+    if content is None:
+        cache_status = "miss"
+        response = freeze_state(state, entry["w"], entry["b"], entry["epoch"], selected)
+        if selected is None:
+            content = response.model_dump_json().encode()
+        else:
+            content = response.model_dump_json(include=set(selected), exclude_none=True).encode()
+        epoch_state_cache.put(key, x, content)
+    
+    return Response(content=content, media_type="application/json", headers={"X-Cache": cache_status})
+
+
+@router.post("/config/learning-rate", response_model=LearningRateResponse)
+async def set_learning_rate(config: LearningRateConfig, state: TrainingState = Depends(get_state)):
+    """Setează learning rate și returnează warnings."""
+    state.config.lr = config.learning_rate
+    
+    warnings = explanation_service.analyze_learning_rate(config.learning_rate, state.optimizer.name)
+    
+    return LearningRateResponse(
+        learning_rate=config.learning_rate,
+        warnings=warnings,
+        status="ok" if not warnings else "warning"
+    )
+
+
+def _optimizer_response(state: TrainingState) -> OptimizerResponse:
+    optimizer = state.optimizer
+    return OptimizerResponse(
+        name=optimizer.name,
+        momentum=optimizer.momentum,
+        beta1=optimizer.beta1,
+        beta2=optimizer.beta2,
+        epsilon=optimizer.epsilon,
+        step=optimizer.step,
+        learning_rate=state.config.lr,
+        warnings=explanation_service.analyze_learning_rate(state.config.lr, optimizer.name)
+    )
+
+
+@router.get("/config/optimizer", response_model=OptimizerResponse)
+async def get_optimizer(state: TrainingState = Depends(get_state)):
+    """Optimizatorul curent al sesiunii."""
+    return _optimizer_response(state)
+
+
+@router.post("/config/optimizer", response_model=OptimizerResponse)
+async def set_optimizer(config: OptimizerConfig, state: TrainingState = Depends(get_state)):
+    """
+    Schimbă optimizatorul. Starea lui (viteză, momente) pornește de la zero,
+    dar modelul și istoricul rămân neschimbate.
+    """
+    try:
+        optimizer_service.validate(config.name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    state.optimizer = OptimizerState(
+        name=config.name,
+        momentum=config.momentum,
+        beta1=config.beta1,
+        beta2=config.beta2,
+        epsilon=config.epsilon
+    )
+    return _optimizer_response(state)
+
+
+@router.get("/history", response_model=HistoryResponse)
+async def get_history(
+    points: Optional[int] = Query(default=None, ge=2, le=10_000),
+    method: str = Query(default="lttb"),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Istoricul de training, opțional subeșantionat la `points` puncte
+    (lttb, minmax sau stride) pentru grafice cu număr fix de puncte.
+    """
+    history = state.history
+    try:
+        entries = history.downsample(points, method) if points is not None else history.snapshot()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return HistoryResponse(
+        total_epochs=history.total_epochs,
+        retained=len(history),
+        policy=history.policy,
+        max_entries=history.max_entries,
+        stride=history.stride,
+        epochs=entries["epochs"].tolist(),
+        loss=entries["loss"].tolist(),
+        w=entries["w"].tolist(),
+        b=entries["b"].tolist(),
+        last=history.last
+    )
+
+
+@router.post("/config/history", response_model=HistoryConfig)
+async def set_history_config(config: HistoryConfig, state: TrainingState = Depends(get_state)):
+    """Setează politica de retenție a istoricului (ring sau decimate)."""
+    try:
+        state.history.configure(config.max_entries, config.policy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return HistoryConfig(max_entries=state.history.max_entries, policy=state.history.policy)
+
+
+@router.post("/model/reset")
+async def reset_model(state: TrainingState = Depends(get_state)):
+    """Resetează doar modelul, păstrează datele."""
+    state.reset_model()
+    
+    return {
+        "message": "Model reset to initial state",
+        "w": state.model.w,
+        "b": state.model.b,
+        "learning_rate": state.config.lr
+    }
+
+
+@router.post(
+    "/gradient/point-step",
+    response_model=Union[PointStepResponse, PointBatchResponse],
+    response_model_exclude_none=True
+)
+async def gradient_point_step(
+    count: Optional[int] = Query(default=None, ge=1, le=1_000_000),
+    explain: bool = Query(default=True),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Procesează un singur punct din dataset în modul pas cu pas.
+    Returnează detalii despre contribuția acestui punct la gradient.
+    Cu ?count=k procesează până la k puncte (fără a trece de sfârșitul
+    epocii) și returnează datele pe coloane. Cu explain=false, explicațiile
+    de la sfârșitul epocii nu sunt generate.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    if count is None:
+        with PhaseTimer("gradient_point_step"):
+            return advance_point(state, explain)
+    return await run_in_threadpool(_timed_point_batch, state, count, explain)
+
+
+def _timed_point_batch(state: TrainingState, count: int, explain: bool) -> PointBatchResponse:
+    """advance_points cu fazele cronometrate; rulează pe un thread din pool."""
+    with PhaseTimer("gradient_point_step"):
+        return advance_points(state, count, explain)
+
+
+@router.post("/gradient/minibatch-step", response_model=MiniBatchStepResponse, response_model_exclude_none=True)
+async def gradient_minibatch_step(
+    batch_size: int = Query(default=32, ge=1),
+    count: int = Query(default=1, ge=1, le=100_000),
+    seed: Optional[int] = Query(default=None),
+    state: TrainingState = Depends(get_state)
+):
+    """
+    Mini-batch SGD cu amestecare pe server. Procesează până la `count`
+    mini-batch-uri de `batch_size` puncte; o epocă se termină după ce toate
+    punctele au fost folosite o dată. Un request procesează cel mult
+    MINIBATCH_WORK_BUDGET / (batch_size + MINIBATCH_BATCH_OVERHEAD) batch-uri.
+    """
+    if state.data.x is None:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    return await run_in_threadpool(advance_minibatches, state, batch_size, count, seed)
 
 
 @router.post("/gradient/point-reset")
-async def reset_point_mode():
-    """Resetează modul pas cu pas fără a reseta modelul."""
-    state["point_by_point"]["active"] = False
-    state["point_by_point"]["current_index"] = 0
-    state["point_by_point"]["accumulated_dw"] = 0.0
-    state["point_by_point"]["accumulated_db"] = 0.0
+async def reset_point_mode(state: TrainingState = Depends(get_state)):
+    """Resetează modul pas cu pas (inclusiv mini-batch) fără a reseta modelul."""
+    state.point_by_point.reset()
+    state.minibatch.reset()
     
     return {"message": "Point-by-point mode reset"}
@@ -1,24 +1,34 @@
 """
 Pydantic schemas pentru request/response models
 """
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Tuple
+
+# Celulele float64 ale unei matrice X multivariate (generată sau încărcată):
+# 256 MiB, un sfert din plafonul de memorie al SessionStore
+MAX_MULTIVARIATE_CELLS = 32 * 1024 ** 2
 
 
 class DatasetUploadResponse(BaseModel):
+    """Implicit doar sumarul; array-urile complete vin doar cu include_values=true."""
     message: str
     num_points: int
     x_range: tuple
     y_range: tuple
-    x_values: List[float]
-    y_values: List[float]
+    x_mean: float
+    y_mean: float
+    x_std: float
+    y_std: float
+    x_values: Optional[List[float]] = None
+    y_values: Optional[List[float]] = None
 
 
 class DatasetGenerateRequest(BaseModel):
     dataset_type: str = "simple"  # simple, noisy, outliers
-    num_points: int = 20
-    noise_level: float = 1.0
-    seed: Optional[int] = None
+    num_points: int = Field(default=20, ge=2, le=50_000_000)
+    noise_level: Optional[float] = Field(default=None, ge=0)  # implicit: zgomotul preset-ului
+    seed: Optional[int] = None  # fără seed, dataset-ul nu e memoizat
+    outlier_fraction: Optional[float] = Field(default=None, ge=0, le=1)
 
 
 class DatasetInfoResponse(BaseModel):
@@ -30,6 +40,29 @@ class DatasetInfoResponse(BaseModel):
     is_loaded: bool
 
 
+class DatasetSampleResponse(BaseModel):
+    """Subeșantion pentru scatter; indices sunt pozițiile punctelor în dataset."""
+    num_points: int
+    sampled_points: int
+    x_range: tuple
+    y_range: tuple
+    indices: List[int]
+    x_values: List[float]
+    y_values: List[float]
+    outlier_indices: List[int]  # reziduurile mari față de OLS, păstrate mereu
+
+
+class DatasetDensityResponse(BaseModel):
+    """Grilă height × width de puncte pe pixel; rândul 0 corespunde lui y_min."""
+    num_points: int
+    width: int
+    height: int
+    x_range: tuple
+    y_range: tuple
+    counts: List[List[int]]
+    max_count: int
+
+
 class PointStepResponse(BaseModel):
     """Response pentru procesarea unui singur punct."""
     point_index: int
@@ -54,6 +87,48 @@ class PointStepResponse(BaseModel):
     explanations: Optional[List[str]] = None  # Doar la ultimul punct - explicații detaliate
 
 
+class PointBatchResponse(BaseModel):
+    """Response pentru procesarea a k puncte consecutive, cu datele pe coloane."""
+    start_index: int
+    count: int
+    total_points: int
+    point_indices: List[int]
+    x_values: List[float]
+    y_actual: List[float]
+    y_predicted: List[float]
+    errors: List[float]
+    contributions_w: List[float]
+    contributions_b: List[float]
+    accumulated_gradient_w: List[float]  # gradientul acumulat după fiecare punct
+    accumulated_gradient_b: List[float]
+    is_last_point: bool
+    w_current: float
+    b_current: float
+    w_new: Optional[float] = None  # Doar la sfârșitul epocii
+    b_new: Optional[float] = None
+    error_categories: Optional[List[str]] = None
+    error_magnitudes: Optional[List[float]] = None
+    epoch: Optional[int] = None
+    explanations: Optional[List[str]] = None
+
+
+class MiniBatchStepResponse(BaseModel):
+    """Response pentru mini-batch SGD: câte o intrare pe coloană pentru fiecare batch."""
+    batch_size: int
+    batches: int
+    batches_per_epoch: int
+    batch_index: List[int]  # indexul batch-ului în epocă
+    w: List[float]  # parametrii după fiecare batch
+    b: List[float]
+    gradient_w: List[float]
+    gradient_b: List[float]
+    batch_loss: List[float]
+    last_batch_indices: List[int]  # punctele din ultimul batch (ordinea amestecată)
+    is_last_batch: bool
+    epoch: Optional[int] = None  # Doar la sfârșitul epocii
+    loss: Optional[float] = None  # MSE pe tot dataset-ul la sfârșitul epocii
+
+
 class LearningRateConfig(BaseModel):
     learning_rate: float
 
@@ -79,21 +154,24 @@ class GradientStepResponse(BaseModel):
     loss_after: float
     loss_delta: float
     loss_history: List[float]
+    loss_history_start: int = 1  # epoca primei intrări din loss_history (mod delta)
+    loss_history_stride: int = 1  # distanța în epoci între intrări (retenție decimate)
+    loss_history_epochs: Optional[List[int]] = None  # epocile intrărilor, doar dacă e subeșantionat
     
-    # Erori per punct
-    errors: List[float]
-    error_magnitudes: List[float]
-    error_categories: List[str]
+    # Erori per punct (omise în modul delta dacă nu sunt cerute)
+    errors: Optional[List[float]] = None
+    error_magnitudes: Optional[List[float]] = None
+    error_categories: Optional[List[str]] = None
     
     # Contribuții
-    contributions: dict
+    contributions: Optional[dict] = None
     
     # Predicții
-    predictions_before: List[float]
-    predictions_after: List[float]
+    predictions_before: Optional[List[float]] = None
+    predictions_after: Optional[List[float]] = None
     
     # Explicații
-    explanations: List[str]
+    explanations: Optional[List[str]] = None  # omise cu explain=false (implicit în modul delta)
     
     # Learning rate info
     learning_rate: float
@@ -112,7 +190,229 @@ class FreezeStateResponse(BaseModel):
     epoch: int
 
 
+class OptimizerConfig(BaseModel):
+    name: str = "sgd"  # sgd, momentum, nesterov, adam, line_search
+    momentum: float = Field(default=0.9, ge=0, lt=1)
+    beta1: float = Field(default=0.9, ge=0, lt=1)
+    beta2: float = Field(default=0.999, ge=0, lt=1)
+    epsilon: float = Field(default=1e-8, gt=0)
+
+
+class OptimizerResponse(BaseModel):
+    name: str
+    momentum: float
+    beta1: float
+    beta2: float
+    epsilon: float
+    step: int  # pași făcuți de la ultima resetare
+    learning_rate: float
+    warnings: List[str]
+
+
 class LearningRateResponse(BaseModel):
     learning_rate: float
     warnings: List[str]
     status: str
+
+
+class TrainingRunRequest(BaseModel):
+    epochs: int = Field(default=100, ge=1, le=1_000_000)
+    tolerance: Optional[float] = Field(default=None, gt=0)  # oprire când |∇| < tolerance
+    max_samples: int = Field(default=200, ge=2, le=10_000)  # puncte în traiectoria returnată
+
+
+class TrajectoryPoint(BaseModel):
+    epoch: int
+    w: float
+    b: float
+    loss: float
+
+
+class TrainingRunResponse(BaseModel):
+    epochs_run: int
+    epoch: int
+    converged: bool
+    w: float
+    b: float
+    loss: float
+    gradient_w: float
+    gradient_b: float
+    gradient_magnitude: float
+    learning_rate: float
+    trajectory: List[TrajectoryPoint]
+
+
+class SweepRequest(BaseModel):
+    """Grila de configurații: fiecare learning rate cu fiecare pereche (w₀, b₀)."""
+    learning_rates: Optional[List[float]] = Field(default=None, min_length=1)  # implicit: learning rate-ul sesiunii
+    initial_params: Optional[List[Tuple[float, float]]] = Field(default=None, min_length=1)  # implicit: modelul curent
+    epochs: int = Field(default=1000, ge=1, le=1_000_000)
+    tolerance: float = Field(default=1e-6, gt=0)  # convergență când |∇| < tolerance
+    max_samples: int = Field(default=100, ge=2, le=1000)  # puncte pe fiecare curbă de loss
+
+
+class SweepConfiguration(BaseModel):
+    learning_rate: float
+    initial_w: float
+    initial_b: float
+    epochs_run: int
+    converged: bool
+    diverged: bool
+    epochs_to_converge: Optional[int] = None
+    w: Optional[float] = None  # None dacă valoarea a devenit nefinită
+    b: Optional[float] = None
+    loss: Optional[float] = None
+    loss_curve: List[Optional[float]]  # None după oprirea configurației
+
+
+class SweepResponse(BaseModel):
+    num_configurations: int
+    epochs: List[int]  # epocile la care sunt eșantionate curbele (0 = inițial)
+    best_index: Optional[int] = None  # configurația nedivergentă cu loss-ul final minim
+    configurations: List[SweepConfiguration]
+
+
+class HistoryConfig(BaseModel):
+    max_entries: int = Field(default=100_000, ge=2, le=10_000_000)
+    policy: str = "ring"  # ring, decimate
+
+
+class HistoryResponse(BaseModel):
+    total_epochs: int
+    retained: int
+    policy: str
+    max_entries: int
+    stride: int
+    epochs: List[int]
+    loss: List[float]
+    w: List[float]
+    b: List[float]
+    last: Optional[dict] = None  # ultima epocă, păstrată mereu
+
+
+class LandscapeResponse(BaseModel):
+    """Grila MSE(w, b): loss[i][j] corespunde lui b_values[i] și w_values[j]."""
+    w_values: List[float]
+    b_values: List[float]
+    loss: List[List[float]]
+    loss_min: float
+    loss_max: float
+    level: int  # nivelul de tile-uri corespunzător zoom-ului
+    tile_x: Optional[int] = None  # Doar pentru tile-uri
+    tile_y: Optional[int] = None
+    optimum_w: float
+    optimum_b: float
+    optimum_loss: float
+    current_w: float
+    current_b: float
+
+
+class MultivariateGenerateRequest(BaseModel):
+    num_points: int = Field(default=1000, ge=2, le=10_000_000)
+    num_features: int = Field(default=5, ge=1, le=1024)
+    noise_level: float = Field(default=1.0, ge=0)
+    seed: Optional[int] = 42
+    feature: int = Field(default=0, ge=0)  # feature-ul proiectat pentru endpoint-urile 1D
+
+    @model_validator(mode="after")
+    def check_size(self) -> "MultivariateGenerateRequest":
+        """X are num_points × num_features celule float64; limita protejează memoria sesiunilor."""
+        if self.num_points * self.num_features > MAX_MULTIVARIATE_CELLS:
+            raise ValueError(f"num_points * num_features exceeds the {MAX_MULTIVARIATE_CELLS} cell limit")
+        return self
+
+
+class MultivariateDatasetResponse(DatasetUploadResponse):
+    """x_values/y_values sunt proiecția pe feature-ul selectat, ca la dataset-urile 1D."""
+    num_features: int
+    feature_names: List[str]
+    feature: int
+    true_weights: Optional[List[float]] = None  # Doar pentru dataset-uri generate
+
+
+class MultivariateStateResponse(BaseModel):
+    epoch: int
+    feature_names: List[str]
+    weights: List[float]
+    bias: float
+    loss: float
+    gradient_w: List[float]
+    gradient_b: float
+    gradient_magnitude: float
+    importance: List[float]  # |w_j|·σ_j
+    loss_history: List[float]  # istoricul epocilor multivariate (reținut sau subeșantionat)
+    loss_history_epochs: List[int]
+    feature: int
+    projected_w: float  # dreapta y = projected_w·x + projected_b pentru feature-ul selectat
+    projected_b: float
+    learning_rate: float
+
+
+class MultivariateStepResponse(BaseModel):
+    epoch: int
+    feature_names: List[str]
+    weights_before: List[float]
+    weights_after: List[float]
+    bias_before: float
+    bias_after: float
+    gradient_w: List[float]
+    gradient_b: float
+    gradient_magnitude: float
+    delta_w: List[float]
+    delta_b: float
+    loss_before: float
+    loss_after: float
+    loss_delta: float
+    importance: List[float]  # |w_j|·σ_j după pas
+    loss_contribution: List[float]  # dw_j·Δw_j, contribuția de ordinul 1 la schimbarea loss-ului
+    feature: int
+    projected_w: float
+    projected_b: float
+    learning_rate: float
+    warnings: List[str] = []  # ex. optimizatorul sesiunii nu se aplică modelului multivariat
+
+
+class MultivariateRunResponse(BaseModel):
+    epochs_run: int
+    epoch: int
+    converged: bool
+    weights: List[float]
+    bias: float
+    loss: float
+    gradient_magnitude: float
+    learning_rate: float
+    warnings: List[str] = []  # ex. optimizatorul sesiunii nu se aplică modelului multivariat
+    feature: int
+    trajectory: List[TrajectoryPoint]  # w este ponderea feature-ului proiectat
+
+
+class JobSubmitRequest(BaseModel):
+    epochs: int = Field(default=100_000, ge=1, le=100_000_000)
+    tolerance: Optional[float] = Field(default=None, gt=0)
+    chunk_epochs: int = Field(default=20_000, ge=1, le=1_000_000)  # epoci între două actualizări
+
+
+class JobUpdate(BaseModel):
+    sequence: int
+    epochs_done: int
+    epoch: int
+    w: float
+    b: float
+    loss: float
+    gradient_magnitude: float
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed, cancelled
+    epochs: int
+    epochs_done: int
+    progress: float
+    converged: bool
+    sequence: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[JobUpdate] = None  # ultima actualizare
+    updates: List[JobUpdate] = []  # actualizările de după ?since=
@@ -0,0 +1,184 @@
+"""
+Service pentru cache-ul de dataset-uri adresat după conținut
+și pentru LRU-ul de răspunsuri serializate derivate dintr-un dataset.
+Fiecare upload este identificat prin hash-ul SHA-256 al conținutului.
+Array-urile x/y parsate sunt salvate ca .npy și deschise cu mmap, deci un
+upload repetat nu mai e parsat deloc, iar dataset-urile mari sunt partajate
+între sesiuni și workeri prin page cache-ul sistemului de operare.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset_service import DatasetStats
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ml_visualizer_cache")
+DEFAULT_MAX_CACHE_BYTES = 4 * 1024 ** 3
+HASH_CHUNK_BYTES = 1024 * 1024
+# Se schimbă când se schimbă parsarea, ca intrările vechi să nu mai fie folosite
+CACHE_FORMAT_VERSION = "v1"
+RESPONSE_CACHE_ENTRIES = 256
+RESPONSE_CACHE_BYTES = 256 * 1024 ** 2
+
+
+class DatasetCache:
+    """Cache pe disc de array-uri x/y + statistici, cu evicție după dimensiune (LRU)."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_file(fileobj: BinaryIO, namespace: str = "csv") -> str:
+        """Hash-ul conținutului, citit pe bucăți; fișierul e readus la început."""
+        hasher = hashlib.sha256(f"{namespace}:{CACHE_FORMAT_VERSION}:".encode())
+        fileobj.seek(0)
+        for chunk in iter(lambda: fileobj.read(HASH_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+        fileobj.seek(0)
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray, DatasetStats]]:
+        """Returnează (x, y, stats) memory-mapped sau None dacă nu e în cache."""
+        path = self._entry_path(key)
+        try:
+            x = np.load(os.path.join(path, "x.npy"), mmap_mode="r")
+            y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+            with open(os.path.join(path, "stats.json")) as f:
+                stats = DatasetStats(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        # Marchează intrarea ca folosită recent, pentru evicția LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return x, y, stats
+
+    def put(
+        self,
+        key: str,
+        x: np.ndarray,
+        y: np.ndarray,
+        stats: DatasetStats
+    ) -> Tuple[np.ndarray, np.ndarray, DatasetStats]:
+        """
+        Salvează dataset-ul și îl returnează memory-mapped din cache.
+        Scrierea se face într-un director temporar redenumit atomic, deci
+        workerii concurenți nu văd niciodată o intrare incompletă.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        if not os.path.isdir(path):
+            tmp_path = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+            try:
+                np.save(os.path.join(tmp_path, "x.npy"), np.ascontiguousarray(x, dtype=np.float64))
+                np.save(os.path.join(tmp_path, "y.npy"), np.ascontiguousarray(y, dtype=np.float64))
+                with open(os.path.join(tmp_path, "stats.json"), "w") as f:
+                    json.dump(asdict(stats), f)
+                os.rename(tmp_path, path)
+            except OSError:
+                # Alt worker a scris aceeași intrare între timp
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+        self.evict(keep=key)
+        cached = self.get(key)
+        return cached if cached is not None else (x, y, stats)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Șterge intrările cel mai puțin folosite până sub max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name.startswith(".") or not os.path.isdir(path):
+                    continue
+                size = _dir_size(path)
+                entries.append((os.path.getmtime(path), name, path, size))
+                total += size
+
+            for _, name, path, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                # Pe POSIX, sesiunile care au deja fișierele mapate le pot folosi în continuare
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+
+class ResponseCache:
+    """
+    LRU thread-safe de răspunsuri JSON deja serializate, mărginit în bytes.
+    Fiecare intrare ține un weakref la array-ul x din care a fost calculată,
+    deci un dataset reîncărcat nu poate primi răspunsuri vechi, iar cache-ul
+    nu ține dataset-urile în viață. Cheile încep cu id(x).
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_ENTRIES, max_bytes: int = RESPONSE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Tuple[weakref.ref, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, x: np.ndarray) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0]() is not x:
+                # id(x) refolosit de un array nou
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, x: np.ndarray, content: bytes) -> None:
+        # Un singur răspuns nu are voie să golească tot cache-ul
+        if len(content) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (weakref.ref(x), content)
+            self._bytes += len(content)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key: tuple) -> None:
+        _, content = self._entries.pop(key)
+        self._bytes -= len(content)
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for name in os.listdir(path):
+        try:
+            total += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return total
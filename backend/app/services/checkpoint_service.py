@@ -0,0 +1,398 @@
+"""
+Service pentru checkpoint-ul sesiunilor pe disc
+Fiecare sesiune e salvată într-un fișier .ckpt scris atomic: o linie JSON
+cu metadatele (model, configurație, optimizator, cursori pas cu pas) și
+descrierea array-urilor, urmată de bytes-ii brut ai array-urilor (istoric).
+La citire, array-urile sunt view-uri np.frombuffer peste conținutul
+fișierului, fără parsare de zip/header per array ca la .npz. Dataset-urile sunt
+salvate o singură dată, adresate după conținut, ca .npy în datasets/<hash>/,
+iar sesiunea păstrează doar referința. La restaurare, dataset-urile sunt
+deschise cu mmap (zero-copy, partajate între sesiuni prin page cache), deci
+timpul de restaurare depinde de numărul de sesiuni, nu de dimensiunea datelor.
+
+Checkpoint-ul periodic scrie doar sesiunile modificate de la ultimul checkpoint;
+fișierele sesiunilor evacuate și dataset-urile nereferențiate sunt șterse.
+"""
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset_service import DatasetStats
+from app.services.history_service import TrainingHistory
+from app.services.multivariate_service import MultivariateStats
+from app.services.optimizer_service import OptimizerState
+from app.services.session_service import SessionStore, TrainingState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = os.environ.get(
+    "CHECKPOINT_DIR", os.path.join(tempfile.gettempdir(), "ml_visualizer_checkpoints")
+)
+DEFAULT_INTERVAL_SECONDS = 30.0
+# Se schimbă când se schimbă formatul; checkpoint-urile vechi sunt ignorate
+CHECKPOINT_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 16 * 1024 ** 2
+SESSION_SUFFIX = ".ckpt"
+
+
+class CheckpointStore:
+    """Checkpoint și restaurare în masă a sesiunilor dintr-un SessionStore."""
+
+    def __init__(self, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR):
+        self.checkpoint_dir = checkpoint_dir
+        self.sessions_dir = os.path.join(checkpoint_dir, "sessions")
+        self.datasets_dir = os.path.join(checkpoint_dir, "datasets")
+        # session_id -> (versiunea stării la ultimul checkpoint, cheile dataset-urilor referite)
+        self._written: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self.last_checkpoint: Dict[str, float] = {"sessions": 0, "seconds": 0.0, "timestamp": 0.0}
+        self.last_restore: Dict[str, float] = {"sessions": 0, "seconds": 0.0, "timestamp": 0.0}
+
+    async def checkpoint(self, store: SessionStore) -> int:
+        """
+        Salvează sesiunile modificate de la ultimul checkpoint.
+        Starea e copiată sub lock-ul sesiunii; scrierea pe disc se face pe un
+        thread, fără lock. Returnează numărul de sesiuni scrise.
+        """
+        start = time.perf_counter()
+        written = 0
+        live = store.items()
+        # Sesiunile care împart aceleași array-uri sunt hash-uite o singură dată
+        known: Dict[int, Tuple[np.ndarray, str]] = {}
+        for session_id, state in live:
+            previous = self._written.get(session_id)
+            if previous is not None and previous[0] == _version(state):
+                continue
+            async with state.lock:
+                version = _version(state)
+                snapshot = self.snapshot(state)
+            _resolve_keys(snapshot, known)
+            keys = await asyncio.to_thread(self.write, session_id, snapshot)
+            _remember_arrays(snapshot, keys, known)
+            self._remember_keys(state, snapshot, keys)
+            self._written[session_id] = (version, tuple(key for key in keys.values() if key))
+            written += 1
+
+        await asyncio.to_thread(self.collect_garbage, {session_id for session_id, _ in live})
+        self.last_checkpoint = {"sessions": written, "seconds": time.perf_counter() - start, "timestamp": time.time()}
+        return written
+
+    async def run_periodic(self, store: SessionStore, interval: float = DEFAULT_INTERVAL_SECONDS) -> None:
+        """Task de fundal: checkpoint la fiecare `interval` secunde."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.checkpoint(store)
+            except Exception:
+                logger.exception("Periodic checkpoint failed")
+
+    def snapshot(self, state: TrainingState) -> Dict[str, Any]:
+        """Copie consistentă a stării (metadate + array-uri); dataset-urile sunt doar referite."""
+        data = state.data
+        multivariate = state.multivariate
+        minibatch = state.minibatch
+        history_meta, history_epochs, history_values = state.history.export()
+        arrays = {"history_epochs": history_epochs, "history_values": history_values}
+
+        meta: Dict[str, Any] = {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            # last_access e monoton; pe disc se păstrează momentul real
+            "last_access": time.time() - (time.monotonic() - state.last_access),
+            "model": {"w": state.model.w, "b": state.model.b},
+            "config": {"lr": state.config.lr, "current_epoch": state.config.current_epoch},
+            "point_by_point": dataclasses.asdict(state.point_by_point),
+            "minibatch": {
+                "active": minibatch.active,
+                "cursor": minibatch.cursor,
+                "seed": minibatch.seed,
+                "rng": minibatch.rng.bit_generator.state if minibatch.rng is not None else None
+            },
+            "optimizer": dataclasses.asdict(state.optimizer),
+            "history": history_meta,
+            "multivariate": None,
+        }
+        if minibatch.order is not None:
+            # Permutarea e înlocuită la fiecare epocă, nu modificată pe loc
+            arrays["minibatch_order"] = minibatch.order
+
+        datasets = {}
+        if multivariate.loaded:
+            mv_meta, mv_epochs, mv_values = multivariate.history.export()
+            meta["multivariate"] = {
+                "feature_names": list(multivariate.feature_names),
+                "bias": multivariate.bias,
+                "feature": multivariate.feature,
+                "current_epoch": multivariate.current_epoch,
+                "history": mv_meta,
+            }
+            arrays.update(mv_weights=multivariate.weights.copy(), mv_history_epochs=mv_epochs, mv_history_values=mv_values)
+            # Array-urile dataset-urilor nu sunt modificate pe loc, deci ajung referințele
+            datasets["multivariate"] = (multivariate.key, {"X": multivariate.X, "y": multivariate.y}, multivariate.stats)
+        elif data.x is not None:
+            datasets["data"] = (data.key, {"x": data.x, "y": data.y}, data.stats)
+
+        return {"meta": meta, "arrays": arrays, "datasets": datasets}
+
+    def write(self, session_id: str, snapshot: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Scrie dataset-urile lipsă și fișierul sesiunii; returnează cheile dataset-urilor."""
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        meta = snapshot["meta"]
+        keys: Dict[str, Optional[str]] = {}
+        for name, (key, arrays, stats) in snapshot["datasets"].items():
+            keys[name] = self._write_dataset(key, arrays, stats)
+        meta["datasets"] = keys
+
+        path = self._session_path(session_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.sessions_dir, prefix=".tmp-", suffix=SESSION_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _write_record(f, meta, snapshot["arrays"])
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+        return keys
+
+    def restore(self, store: SessionStore) -> int:
+        """
+        Restaurează toate sesiunile salvate (în ordinea ultimului acces), fără
+        cele expirate între timp. Returnează numărul de sesiuni restaurate.
+        """
+        start = time.perf_counter()
+        if not os.path.isdir(self.sessions_dir):
+            return 0
+
+        entries = []
+        for name in os.listdir(self.sessions_dir):
+            if name.startswith(".") or not name.endswith(SESSION_SUFFIX):
+                continue
+            session_id = name[:-len(SESSION_SUFFIX)]
+            try:
+                meta, arrays = _read_record(os.path.join(self.sessions_dir, name))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Skipping unreadable checkpoint %s: %s", name, e)
+                continue
+            if meta.get("version") != CHECKPOINT_FORMAT_VERSION:
+                continue
+            entries.append((meta["last_access"], session_id, meta, arrays))
+
+        now = time.time()
+        datasets: Dict[str, Any] = {}
+        restored: List[Tuple[str, TrainingState]] = []
+        for last_access, session_id, meta, arrays in sorted(entries, key=lambda entry: entry[0]):
+            idle = now - last_access
+            if idle > store.ttl_seconds:
+                continue
+            try:
+                state = self._build_state(meta, arrays, datasets)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Skipping checkpoint of session %s: %s", session_id, e)
+                continue
+            state.last_access = time.monotonic() - max(idle, 0.0)
+            restored.append((session_id, state))
+            self._written[session_id] = (_version(state), tuple(key for key in meta["datasets"].values() if key))
+
+        store.put_many(restored)
+        self.last_restore = {"sessions": len(restored), "seconds": time.perf_counter() - start, "timestamp": time.time()}
+        return len(restored)
+
+    def collect_garbage(self, live_sessions) -> None:
+        """Șterge checkpoint-urile sesiunilor evacuate și dataset-urile nereferențiate."""
+        with self._lock:
+            for session_id in list(self._written):
+                if session_id not in live_sessions:
+                    del self._written[session_id]
+                    _remove(self._session_path(session_id))
+            referenced = {key for _, keys in self._written.values() for key in keys}
+            if not os.path.isdir(self.datasets_dir):
+                return
+            for name in os.listdir(self.datasets_dir):
+                if name not in referenced and not name.startswith("."):
+                    shutil.rmtree(os.path.join(self.datasets_dir, name), ignore_errors=True)
+
+    def clear(self) -> None:
+        self._written.clear()
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+    def _build_state(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray], datasets: Dict[str, Any]) -> TrainingState:
+        state = TrainingState()
+        keys = meta["datasets"]
+        multivariate_meta = meta["multivariate"]
+        if multivariate_meta is not None:
+            X, y, stats = self._load_dataset(keys["multivariate"], ("X", "y"), MultivariateStats, datasets)
+            state.load_multivariate(X, y, multivariate_meta["feature_names"], stats, multivariate_meta["feature"])
+            multivariate = state.multivariate
+            multivariate.key = keys["multivariate"]
+            multivariate.weights = arrays["mv_weights"].copy()
+            multivariate.bias = multivariate_meta["bias"]
+            multivariate.current_epoch = multivariate_meta["current_epoch"]
+            multivariate.history = TrainingHistory.restore(
+                multivariate_meta["history"], arrays["mv_history_epochs"], arrays["mv_history_values"]
+            )
+        elif keys.get("data"):
+            x, y, stats = self._load_dataset(keys["data"], ("x", "y"), DatasetStats, datasets)
+            state.load_dataset(x, y, stats)
+            state.data.key = keys["data"]
+
+        state.model.w = meta["model"]["w"]
+        state.model.b = meta["model"]["b"]
+        state.config.lr = meta["config"]["lr"]
+        state.config.current_epoch = meta["config"]["current_epoch"]
+        state.history = TrainingHistory.restore(meta["history"], arrays["history_epochs"], arrays["history_values"])
+        state.optimizer = OptimizerState(**meta["optimizer"])
+        for name, value in meta["point_by_point"].items():
+            setattr(state.point_by_point, name, value)
+
+        minibatch = state.minibatch
+        minibatch.active = meta["minibatch"]["active"]
+        minibatch.cursor = meta["minibatch"]["cursor"]
+        minibatch.seed = meta["minibatch"]["seed"]
+        if meta["minibatch"]["rng"] is not None:
+            minibatch.rng = np.random.default_rng()
+            minibatch.rng.bit_generator.state = meta["minibatch"]["rng"]
+        minibatch.order = arrays.get("minibatch_order")
+        return state
+
+    def _write_dataset(self, key: Optional[str], arrays: Dict[str, np.ndarray], stats) -> str:
+        if key is None:
+            key = _content_key(arrays)
+        path = os.path.join(self.datasets_dir, key)
+        if os.path.isdir(path):
+            return key
+
+        os.makedirs(self.datasets_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=self.datasets_dir, prefix=".tmp-")
+        try:
+            for name, values in arrays.items():
+                target = os.path.join(tmp_path, f"{name}.npy")
+                # Un .npy din cache-ul de upload e doar legat (hard link), nu copiat
+                if not _link_npy(values, target):
+                    np.save(target, np.ascontiguousarray(values, dtype=np.float64))
+            fields = {field.name: np.asarray(getattr(stats, field.name)) for field in dataclasses.fields(stats)}
+            np.savez(os.path.join(tmp_path, "stats.npz"), **fields)
+            os.rename(tmp_path, path)
+        except OSError:
+            # Alt checkpoint a scris același dataset între timp
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        return key
+
+    def _load_dataset(self, key: str, names: Tuple[str, ...], stats_type, datasets: Dict[str, Any]):
+        """Dataset-ul memory-mapped; sesiunile cu același dataset primesc aceleași array-uri."""
+        if key not in datasets:
+            path = os.path.join(self.datasets_dir, key)
+            arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names]
+            with np.load(os.path.join(path, "stats.npz")) as archive:
+                fields = {
+                    name: (archive[name].item() if archive[name].ndim == 0 else archive[name])
+                    for name in archive.files
+                }
+            datasets[key] = (*arrays, stats_type(**fields))
+        return datasets[key]
+
+    def _remember_keys(self, state: TrainingState, snapshot: Dict[str, Any], keys: Dict[str, Optional[str]]) -> None:
+        """Memorează hash-ul pe stare, dacă dataset-ul nu s-a schimbat între timp."""
+        for name, key in keys.items():
+            arrays = snapshot["datasets"][name][1]
+            if name == "data" and state.data.x is arrays["x"]:
+                state.data.key = key
+            elif name == "multivariate" and state.multivariate.X is arrays["X"]:
+                state.multivariate.key = key
+
+    def _session_path(self, session_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{session_id}{SESSION_SUFFIX}")
+
+
+def _version(state: TrainingState) -> int:
+    """
+    Revizia stării: incrementată sub lock de fiecare cale care o modifică
+    (request-uri, job-uri din fundal, canalul live), deci o sesiune doar
+    citită nu este rescrisă, iar nicio modificare nu este ratată.
+    """
+    return state.revision
+
+
+def _resolve_keys(snapshot: Dict[str, Any], known: Dict[int, Tuple[np.ndarray, str]]) -> None:
+    for name, (key, arrays, stats) in snapshot["datasets"].items():
+        first = next(iter(arrays.values()))
+        entry = known.get(id(first))
+        if key is None and entry is not None and entry[0] is first:
+            snapshot["datasets"][name] = (entry[1], arrays, stats)
+
+
+def _remember_arrays(snapshot: Dict[str, Any], keys: Dict[str, Optional[str]], known: Dict[int, Tuple[np.ndarray, str]]) -> None:
+    for name, (_, arrays, _) in snapshot["datasets"].items():
+        first = next(iter(arrays.values()))
+        known[id(first)] = (first, keys[name])
+
+
+def _write_record(f, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    """Linia JSON (metadate + layout-ul array-urilor), apoi array-urile contigue."""
+    layout = {}
+    offset = 0
+    contiguous = {}
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        contiguous[name] = values
+        layout[name] = [values.dtype.str, list(values.shape), offset]
+        offset += values.nbytes
+    f.write(json.dumps({"meta": meta, "arrays": layout}).encode() + b"\n")
+    for values in contiguous.values():
+        f.write(values.tobytes())
+
+
+def _read_record(path: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    with open(path, "rb") as f:
+        content = f.read()
+    header_end = content.index(b"\n")
+    header = json.loads(content[:header_end])
+    base = header_end + 1
+    arrays = {}
+    for name, (dtype, shape, offset) in header["arrays"].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        arrays[name] = np.frombuffer(content, dtype=dtype, count=count, offset=base + offset).reshape(shape)
+    return header["meta"], arrays
+
+
+def _content_key(arrays: Dict[str, np.ndarray]) -> str:
+    hasher = hashlib.blake2b(f"checkpoint:{CHECKPOINT_FORMAT_VERSION}:".encode(), digest_size=20)
+    for name, values in sorted(arrays.items()):
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        hasher.update(f"{name}:{values.shape}:".encode())
+        flat = values.reshape(-1).view(np.uint8)
+        for start in range(0, len(flat), HASH_CHUNK_BYTES):
+            hasher.update(flat[start:start + HASH_CHUNK_BYTES])
+    return hasher.hexdigest()
+
+
+def _link_npy(values: np.ndarray, target: str) -> bool:
+    """Hard link către .npy-ul din care e mapat array-ul, dacă e mapat integral."""
+    filename = getattr(values, "filename", None)
+    if not isinstance(values, np.memmap) or filename is None or values.dtype != np.float64 or not values.flags.c_contiguous:
+        return False
+    try:
+        if np.load(filename, mmap_mode="r").shape != values.shape:
+            return False
+        os.link(filename, target)
+        return True
+    except OSError:
+        return False
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,227 @@
+"""
+Service pentru ingestia dataset-urilor din formate binare pe coloane
+(.npy/.npz, Arrow IPC/Feather, Parquet)
+Spre deosebire de CSV, valorile sunt deja binare: nu se parsează text, iar
+coloanele x/y (alese după nume) ajung în array-urile float64 ale dataset-ului
+cu o singură copiere (zero-copy pentru coloanele Arrow dintr-un singur
+chunk, fără null-uri).
+pyarrow este opțional: fără el, .npy/.npz funcționează, iar Arrow/Parquet
+sunt refuzate cu un mesaj explicit.
+"""
+import os
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset_service import (
+    CSV_CHUNK_ROWS, MAX_UPLOAD_BYTES, MAX_UPLOAD_ROWS, DatasetService, DatasetStats
+)
+
+try:
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as parquet
+except ImportError:  # pragma: no cover - depinde de mediu
+    feather = None
+    ipc = None
+    parquet = None
+
+# Extensie -> format; .feather (v2) este Arrow IPC în format fișier
+BINARY_FORMATS = {
+    ".npy": "npy",
+    ".npz": "npz",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+    ".feather": "arrow",
+    ".parquet": "parquet",
+}
+DEFAULT_COLUMNS = ("x", "y")
+
+Arrays = Tuple[np.ndarray, np.ndarray, DatasetStats]
+
+
+def detect_format(filename: str) -> Optional[str]:
+    """Formatul binar după extensie, sau None (ex. pentru .csv)."""
+    return BINARY_FORMATS.get(os.path.splitext(filename.lower())[1])
+
+
+def _file_size(fileobj: BinaryIO) -> int:
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def _read_exact(fileobj: BinaryIO, nbytes: int) -> bytes:
+    data = fileobj.read(nbytes)
+    if len(data) != nbytes:
+        raise ValueError("File is truncated")
+    return data
+
+
+def _missing_column(name: str, available) -> ValueError:
+    return ValueError(f"Column '{name}' not found (available: {', '.join(map(str, available))})")
+
+
+def _column_index(name: Optional[str], default: int, width: int) -> int:
+    """Pentru array-uri fără nume de câmpuri, coloanele sunt alese după index ("0", "1", ...)."""
+    if name is None:
+        return default
+    if not name.isdigit() or int(name) >= width:
+        raise _missing_column(name, range(width))
+    return int(name)
+
+
+class ColumnarService:
+    """Service pentru încărcarea coloanelor x/y din fișiere binare."""
+
+    @staticmethod
+    def load(
+        fileobj: BinaryIO,
+        file_format: str,
+        x_column: Optional[str] = None,
+        y_column: Optional[str] = None,
+        max_rows: int = MAX_UPLOAD_ROWS,
+        max_bytes: int = MAX_UPLOAD_BYTES
+    ) -> Arrays:
+        """
+        Încarcă coloanele x/y (implicit 'x' și 'y') din fișierul dat.
+        Returns: (x, y, stats)
+        """
+        if _file_size(fileobj) > max_bytes:
+            raise ValueError(f"File exceeds the {max_bytes} byte limit")
+
+        if file_format == "npy":
+            x, y = ColumnarService._load_npy(fileobj, x_column, y_column, max_rows)
+        elif file_format == "npz":
+            x, y = ColumnarService._load_npz(fileobj, x_column or DEFAULT_COLUMNS[0], y_column or DEFAULT_COLUMNS[1])
+        elif file_format in ("arrow", "parquet"):
+            if feather is None:
+                raise ValueError("Arrow and Parquet uploads require the optional pyarrow package")
+            columns = [x_column or DEFAULT_COLUMNS[0], y_column or DEFAULT_COLUMNS[1]]
+            # Doar schema (footer-ul), ca o coloană lipsă să fie raportată înainte de citire
+            if file_format == "arrow":
+                names = ipc.open_file(fileobj).schema.names
+            else:
+                names = parquet.read_schema(fileobj).names
+            fileobj.seek(0)
+            for name in columns:
+                if name not in names:
+                    raise _missing_column(name, names)
+            if file_format == "arrow":
+                table = feather.read_table(fileobj, columns=columns, memory_map=False)
+            else:
+                table = parquet.read_table(fileobj, columns=columns)
+            x, y = (ColumnarService._arrow_column(table, name) for name in columns)
+        else:
+            raise ValueError(f"Unsupported format: {file_format}")
+
+        if len(x) == 0:
+            raise ValueError("File contains no data rows")
+        if len(x) > max_rows:
+            raise ValueError(f"File exceeds the {max_rows} row limit")
+        return x, y, ColumnarService.compute_statistics(x, y)
+
+    @staticmethod
+    def compute_statistics(x: np.ndarray, y: np.ndarray, chunk_rows: int = CSV_CHUNK_ROWS) -> DatasetStats:
+        """Statisticile suficiente, pe bucăți (memorie temporară O(chunk_rows)), cu verificarea NaN."""
+        stats: Optional[DatasetStats] = None
+        for start in range(0, len(x), chunk_rows):
+            xs = x[start:start + chunk_rows]
+            ys = y[start:start + chunk_rows]
+            if np.isnan(xs).any() or np.isnan(ys).any():
+                raise ValueError("Data contains missing values")
+            chunk_stats = DatasetService.compute_statistics(xs, ys)
+            stats = chunk_stats if stats is None else DatasetService.merge_statistics(stats, chunk_stats)
+        return stats
+
+    @staticmethod
+    def _load_npy(
+        fileobj: BinaryIO,
+        x_column: Optional[str],
+        y_column: Optional[str],
+        max_rows: int,
+        chunk_rows: int = CSV_CHUNK_ROWS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Un array structurat (câmpuri după nume) sau 2D (n, k) (coloane după
+        index). Header-ul este citit direct, iar datele sunt copiate pe bucăți
+        din fișier în x/y, fără a materializa întâi tot array-ul.
+        """
+        version = np.lib.format.read_magic(fileobj)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fileobj)
+        elif version in ((2, 0), (3, 0)):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fileobj)
+        else:
+            raise ValueError(f"Unsupported .npy version {version}")
+        if dtype.hasobject:
+            raise ValueError(".npy files with Python objects are not allowed")
+
+        if dtype.names is not None and len(shape) == 1:
+            x_name, y_name = x_column or DEFAULT_COLUMNS[0], y_column or DEFAULT_COLUMNS[1]
+            for name in (x_name, y_name):
+                if name not in dtype.names:
+                    raise _missing_column(name, dtype.names)
+            n, width = shape[0], 1
+        elif dtype.names is None and len(shape) == 2:
+            n, width = shape
+            x_index = _column_index(x_column, 0, width)
+            y_index = _column_index(y_column, 1, width)
+        else:
+            raise ValueError(".npy must hold a structured array or a 2D array with one column per variable")
+        if n > max_rows:
+            raise ValueError(f"File exceeds the {max_rows} row limit")
+
+        x = np.empty(n)
+        y = np.empty(n)
+        offset = fileobj.tell()
+        if fortran_order and dtype.names is None:
+            # Column-major: fiecare coloană este contiguă în fișier
+            for target, index in ((x, x_index), (y, y_index)):
+                fileobj.seek(offset + index * n * dtype.itemsize)
+                for start in range(0, n, chunk_rows):
+                    rows = min(chunk_rows, n - start)
+                    target[start:start + rows] = np.frombuffer(_read_exact(fileobj, rows * dtype.itemsize), dtype)
+            return x, y
+
+        row_bytes = dtype.itemsize * width
+        for start in range(0, n, chunk_rows):
+            rows = min(chunk_rows, n - start)
+            block = np.frombuffer(_read_exact(fileobj, rows * row_bytes), dtype)
+            if dtype.names is not None:
+                x[start:start + rows] = block[x_name]
+                y[start:start + rows] = block[y_name]
+            else:
+                block = block.reshape(rows, width)
+                x[start:start + rows] = block[:, x_index]
+                y[start:start + rows] = block[:, y_index]
+        return x, y
+
+    @staticmethod
+    def _load_npz(fileobj: BinaryIO, x_name: str, y_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Arhivă cu câte un array 1D per coloană; fiecare membru e citit o singură dată."""
+        with np.load(fileobj, allow_pickle=False) as archive:
+            for name in (x_name, y_name):
+                if name not in archive.files:
+                    raise _missing_column(name, archive.files)
+            x = np.asarray(archive[x_name], dtype=np.float64)
+            y = np.asarray(archive[y_name], dtype=np.float64)
+        if x.ndim != 1 or y.ndim != 1 or len(x) != len(y):
+            raise ValueError("Columns must be 1D arrays of equal length")
+        return x, y
+
+    @staticmethod
+    def _arrow_column(table, name: str) -> np.ndarray:
+        """Coloana ca float64: zero-copy dintr-un singur chunk float64, altfel o singură copiere."""
+        column = table.column(name)
+        if column.null_count:
+            raise ValueError("Data contains missing values")
+        chunks = [chunk.to_numpy(zero_copy_only=False) for chunk in column.chunks]
+        if len(chunks) == 1:
+            values = chunks[0]
+        else:
+            values = np.concatenate(chunks) if chunks else np.empty(0)
+        if values.dtype.kind not in "fiu":
+            raise ValueError(f"Column '{name}' is not numeric")
+        return values.astype(np.float64, copy=False)
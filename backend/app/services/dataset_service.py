@@ -4,7 +4,89 @@ Service pentru management datasets
 import numpy as np
 import pandas as pd
 import io
-from typing import Tuple
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Limite pentru ingestia CSV în streaming
+CSV_CHUNK_ROWS = 1_000_000
+MAX_UPLOAD_ROWS = 50_000_000
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+
+# Generatorul sintetic: y = TRUE_W·x + TRUE_B + zgomot, x uniform în [X_MIN, X_MAX]
+TRUE_W = 2.0
+TRUE_B = 1.0
+X_MIN = 0.0
+X_MAX = 10.0
+OUTLIER_OFFSET = 10.0
+GENERATE_CHUNK_POINTS = 1_000_000
+GENERATED_CACHE_ENTRIES = 32
+GENERATED_CACHE_BYTES = 512 * 1024 ** 2
+
+DATASET_PRESETS = {
+    "simple": {"noise": 1.0, "outlier_fraction": 0.0, "description": "Date liniare simple cu zgomot mic"},
+    "noisy": {"noise": 3.0, "outlier_fraction": 0.0, "description": "Date liniare cu zgomot mare"},
+    "outliers": {"noise": 1.0, "outlier_fraction": 0.1, "description": "Date cu outlieri vizibili"},
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetStats:
+    """
+    Statistici suficiente pentru regresia liniară cu MSE.
+    Sumele de pătrate sunt centrate (Sxx = Σ(x-x̄)², etc.) pentru stabilitate
+    numerică pe date necentrate; sumele brute sunt derivate din ele.
+    """
+    n: int
+    mean_x: float
+    mean_y: float
+    sxx: float
+    sxy: float
+    syy: float
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+    @property
+    def sum_x(self) -> float:
+        return self.n * self.mean_x
+
+    @property
+    def sum_y(self) -> float:
+        return self.n * self.mean_y
+
+    @property
+    def sum_x2(self) -> float:
+        return self.sxx + self.n * self.mean_x ** 2
+
+    @property
+    def sum_xy(self) -> float:
+        return self.sxy + self.n * self.mean_x * self.mean_y
+
+    @property
+    def sum_y2(self) -> float:
+        return self.syy + self.n * self.mean_y ** 2
+
+
+class _ByteLimitedReader:
+    """Wrapper peste un fișier care oprește citirea după max_bytes."""
+    
+    def __init__(self, raw: BinaryIO, max_bytes: int):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self._max_bytes:
+            raise ValueError(f"File exceeds the {self._max_bytes} byte limit")
+        return chunk
+    
+    def __iter__(self):
+        return iter(self._raw)
 
 
 class DatasetService:
@@ -13,50 +95,253 @@ class DatasetService:
     @staticmethod
     def load_from_csv(content) -> Tuple[np.ndarray, np.ndarray]:
         """Încarcă dataset din CSV."""
-        # Acceptă fie bytes fie BytesIO
+        # Acceptă fie bytes fie un obiect file-like (BytesIO, fișier spooled)
         if isinstance(content, bytes):
-            df = pd.read_csv(io.StringIO(content.decode('utf-8')))
-        else:
-            # content e deja BytesIO
-            df = pd.read_csv(content)
-        
-        if len(df.columns) < 2:
-            raise ValueError("CSV must have at least 2 columns")
+            content = io.BytesIO(content)
+        x, y, _ = DatasetService.load_from_csv_stream(content)
+        return x, y
+    
+    @staticmethod
+    def load_from_csv_stream(
+        fileobj: BinaryIO,
+        chunk_rows: int = CSV_CHUNK_ROWS,
+        max_rows: int = MAX_UPLOAD_ROWS,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+        columns: Optional[Tuple[str, str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, "DatasetStats"]:
+        """
+        Încarcă un CSV pe bucăți, cu memorie proporțională cu chunk_rows.
+        Sunt parsate doar coloanele (x, y) date după nume în `columns`
+        (implicit primele două coloane), direct în array-uri float64
+        care cresc geometric; NaN-urile și limitele sunt verificate pe fiecare
+        bucată, iar statisticile suficiente sunt actualizate incremental.
+        Returns: (x, y, stats)
+        """
+        reader = _ByteLimitedReader(fileobj, max_bytes)
+        capacity = min(chunk_rows, max_rows)
+        x = np.empty(capacity)
+        y = np.empty(capacity)
+        n = 0
+        stats: Optional[DatasetStats] = None
         
-        x = df.iloc[:, 0].values.astype(float)
-        y = df.iloc[:, 1].values.astype(float)
+        try:
+            usecols = list(columns) if columns is not None else [0, 1]
+            chunks = pd.read_csv(reader, usecols=usecols, dtype=np.float64, chunksize=chunk_rows)
+            for chunk in chunks:
+                if columns is not None:
+                    # usecols păstrează ordinea din fișier, nu pe cea cerută
+                    chunk = chunk[list(columns)]
+                values = chunk.to_numpy(dtype=np.float64, copy=False)
+                rows = len(values)
+                if rows == 0:
+                    continue
+                if n + rows > max_rows:
+                    raise ValueError(f"CSV exceeds the {max_rows} row limit")
+                if np.isnan(values).any():
+                    raise ValueError("Data contains missing values")
+                
+                if n + rows > capacity:
+                    capacity = min(max(capacity * 2, n + rows), max_rows)
+                    x = np.resize(x, capacity)
+                    y = np.resize(y, capacity)
+                x[n:n + rows] = values[:, 0]
+                y[n:n + rows] = values[:, 1]
+                
+                chunk_stats = DatasetService.compute_statistics(x[n:n + rows], y[n:n + rows])
+                stats = chunk_stats if stats is None else DatasetService.merge_statistics(stats, chunk_stats)
+                n += rows
+        except pd.errors.EmptyDataError:
+            raise ValueError("CSV is empty")
+        except ValueError as e:
+            if "usecols" in str(e).lower():
+                if columns is not None:
+                    raise ValueError(f"CSV must have the columns {', '.join(columns)}")
+                raise ValueError("CSV must have at least 2 columns")
+            raise
         
-        if np.any(np.isnan(x)) or np.any(np.isnan(y)):
-            raise ValueError("Data contains missing values")
+        if n == 0:
+            raise ValueError("CSV contains no data rows")
         
-        return x, y
+        # Eliberează capacitatea nefolosită
+        if n < capacity:
+            x = x[:n].copy()
+            y = y[:n].copy()
+        return x, y, stats
     
     @staticmethod
-    def generate_dataset(dataset_type: str) -> Tuple[np.ndarray, np.ndarray, str]:
+    def compute_statistics(x: np.ndarray, y: np.ndarray) -> DatasetStats:
+        """Calculează o singură dată statisticile suficiente ale dataset-ului."""
+        n = len(x)
+        mean_x = float(x.mean())
+        mean_y = float(y.mean())
+        dx = x - mean_x
+        dy = y - mean_y
+        return DatasetStats(
+            n=n,
+            mean_x=mean_x,
+            mean_y=mean_y,
+            sxx=float(np.dot(dx, dx)),
+            sxy=float(np.dot(dx, dy)),
+            syy=float(np.dot(dy, dy)),
+            x_min=float(x.min()),
+            x_max=float(x.max()),
+            y_min=float(y.min()),
+            y_max=float(y.max())
+        )
+    
+    @staticmethod
+    def merge_statistics(a: DatasetStats, b: DatasetStats) -> DatasetStats:
+        """
+        Combină statisticile a două părți disjuncte ale unui dataset
+        (algoritmul paralel al lui Chan), fără a reciti datele.
+        """
+        n = a.n + b.n
+        delta_x = b.mean_x - a.mean_x
+        delta_y = b.mean_y - a.mean_y
+        weight = a.n * b.n / n
+        return DatasetStats(
+            n=n,
+            mean_x=a.mean_x + delta_x * b.n / n,
+            mean_y=a.mean_y + delta_y * b.n / n,
+            sxx=a.sxx + b.sxx + delta_x * delta_x * weight,
+            sxy=a.sxy + b.sxy + delta_x * delta_y * weight,
+            syy=a.syy + b.syy + delta_y * delta_y * weight,
+            x_min=min(a.x_min, b.x_min),
+            x_max=max(a.x_max, b.x_max),
+            y_min=min(a.y_min, b.y_min),
+            y_max=max(a.y_max, b.y_max)
+        )
+    
+    @staticmethod
+    def iter_dataset_chunks(
+        dataset_type: str,
+        num_points: int = 20,
+        noise_level: Optional[float] = None,
+        seed: Optional[int] = 42,
+        outlier_fraction: Optional[float] = None,
+        chunk_size: int = GENERATE_CHUNK_POINTS
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
         """
-        Generează dataset predefinit.
-        Returns: (x, y, description)
+        Generează dataset-ul în bucăți de cel mult chunk_size puncte.
+        Zgomotul vine dintr-un singur stream RNG consumat secvențial, iar
+        pozițiile outlierilor sunt deterministe, deci rezultatul nu depinde
+        de chunk_size.
         """
-        np.random.seed(42)
+        if num_points < 2:
+            raise ValueError("num_points must be at least 2")
+        noise, fraction = _resolve_preset(dataset_type, noise_level, outlier_fraction)
+        if noise < 0:
+            raise ValueError("noise_level must be non-negative")
+        if not 0 <= fraction <= 1:
+            raise ValueError("outlier_fraction must be between 0 and 1")
         
-        if dataset_type == "simple":
-            x = np.linspace(0, 10, 20)
-            y = 2 * x + 1 + np.random.normal(0, 1, 20)
-            description = "Date liniare simple cu zgomot mic"
-            
-        elif dataset_type == "noisy":
-            x = np.linspace(0, 10, 20)
-            y = 2 * x + 1 + np.random.normal(0, 3, 20)
-            description = "Date liniare cu zgomot mare"
-            
-        elif dataset_type == "outliers":
-            x = np.linspace(0, 10, 20)
-            y = 2 * x + 1 + np.random.normal(0, 1, 20)
-            y[5] += 10
-            y[15] -= 10
-            description = "Date cu outlieri vizibili"
+        rng = np.random.default_rng(seed)
+        step = (X_MAX - X_MIN) / (num_points - 1)
+        
+        for start in range(0, num_points, chunk_size):
+            count = min(chunk_size, num_points - start)
+            x = X_MIN + step * np.arange(start, start + count, dtype=np.float64)
+            y = rng.normal(TRUE_B, noise, count) if noise > 0 else np.full(count, TRUE_B)
+            y += TRUE_W * x
             
-        else:
-            raise ValueError(f"Unknown dataset type: {dataset_type}")
+            if fraction > 0:
+                # Un outlier la fiecare `period` puncte, deplasat alternativ în sus și în jos
+                # (pentru 20 de puncte și 10%: +10 la indexul 5, -10 la indexul 15)
+                period = max(int(round(1 / fraction)), 1)
+                index = np.arange(start, start + count)
+                mask = index % period == period // 2
+                signs = np.where((index // period) % 2 == 0, 1.0, -1.0)
+                y[mask] += OUTLIER_OFFSET * signs[mask]
+            yield x, y
+    
+    @staticmethod
+    def generate_dataset(
+        dataset_type: str,
+        num_points: int = 20,
+        noise_level: Optional[float] = None,
+        seed: Optional[int] = 42,
+        outlier_fraction: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray, str, DatasetStats]:
+        """
+        Generează dataset predefinit (simple, noisy, outliers).
+        Rezultatele cu seed fix sunt memoizate într-un LRU mărginit și sunt
+        returnate read-only, pentru a putea fi partajate între sesiuni.
+        Returns: (x, y, description, stats)
+        """
+        # Cheia folosește valorile efective: None (implicitul preset-ului) și
+        # valoarea explicită a preset-ului descriu același dataset
+        noise_level, outlier_fraction = _resolve_preset(dataset_type, noise_level, outlier_fraction)
+        key = (dataset_type, num_points, float(noise_level), seed, float(outlier_fraction))
+        if seed is not None:
+            cached = _generated_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        x = np.empty(num_points)
+        y = np.empty(num_points)
+        stats = None
+        offset = 0
+        for x_chunk, y_chunk in DatasetService.iter_dataset_chunks(
+            dataset_type, num_points, noise_level, seed, outlier_fraction
+        ):
+            count = len(x_chunk)
+            x[offset:offset + count] = x_chunk
+            y[offset:offset + count] = y_chunk
+            chunk_stats = DatasetService.compute_statistics(x_chunk, y_chunk)
+            stats = chunk_stats if stats is None else DatasetService.merge_statistics(stats, chunk_stats)
+            offset += count
         
-        return x, y, description
+        x.flags.writeable = False
+        y.flags.writeable = False
+        result = (x, y, DATASET_PRESETS[dataset_type]["description"], stats)
+        if seed is not None:
+            _generated_cache.put(key, result, x.nbytes + y.nbytes)
+        return result
+
+
+def _resolve_preset(
+    dataset_type: str,
+    noise_level: Optional[float],
+    outlier_fraction: Optional[float]
+) -> Tuple[float, float]:
+    """(zgomot, fracția de outlieri) efective: parametrii lipsă iau valorile preset-ului."""
+    if dataset_type not in DATASET_PRESETS:
+        raise ValueError(f"Unknown dataset type: {dataset_type}")
+    preset = DATASET_PRESETS[dataset_type]
+    noise = preset["noise"] if noise_level is None else noise_level
+    fraction = preset["outlier_fraction"] if outlier_fraction is None else outlier_fraction
+    return noise, fraction
+
+
+class _GeneratedCache:
+    """LRU thread-safe pentru dataset-uri generate, mărginit ca număr și bytes."""
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key: tuple, value: tuple, nbytes: int) -> None:
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+
+
+_generated_cache = _GeneratedCache(GENERATED_CACHE_ENTRIES, GENERATED_CACHE_BYTES)
@@ -1,14 +1,58 @@
 """
 Service pentru generare explicații automate
-Analizează starea algoritmului și generează text explicativ
+Analizează starea algoritmului și generează text explicativ.
+Textul depinde doar de câteva mărimi (numărul de erori pozitive/negative,
+gradienții formatați, categoria pasului, punctul cu eroarea maximă), deci
+listele generate sunt memorate după aceste intrări: pașii consecutivi cu
+aceleași mesaje nu mai formatează nimic.
 """
+import math
 import numpy as np
-from typing import List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+EXPLANATION_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorSummary:
+    """Statisticile erorilor de care au nevoie explicațiile."""
+    n: int
+    positive_errors: int
+    negative_errors: int
+    max_error_index: int
+    max_error: float
+    mean_abs_error: float
 
 
 class ExplanationService:
     """Service pentru generare explicații despre procesul de învățare"""
     
+    @staticmethod
+    def summarize_errors(
+        errors: np.ndarray,
+        error_magnitudes: Optional[np.ndarray] = None,
+        max_error_index: Optional[int] = None
+    ) -> ErrorSummary:
+        """
+        Rezumatul erorilor; magnitudinile și indexul maximului pot veni
+        direct din pasul de training, ca să nu fie recalculate.
+        """
+        n = len(errors)
+        if error_magnitudes is None:
+            error_magnitudes = np.abs(errors)
+        if max_error_index is None:
+            max_error_index = int(np.argmax(error_magnitudes))
+        return ErrorSummary(
+            n=n,
+            positive_errors=int(np.count_nonzero(errors > 0)),
+            negative_errors=int(np.count_nonzero(errors < 0)),
+            max_error_index=max_error_index,
+            max_error=float(error_magnitudes[max_error_index]),
+            mean_abs_error=float(error_magnitudes.sum()) / n
+        )
+    
     @staticmethod
     def generate_step_explanation(
         x: np.ndarray,
@@ -24,65 +68,65 @@ class ExplanationService:
         """
         Generează explicații textuale despre ce se întâmplă în acest pas.
         """
-        explanations = []
-        n = len(x)
-        
-        # 1. Analiză poziționare linie vs puncte
-        positive_errors = np.sum(errors > 0)
-        negative_errors = np.sum(errors < 0)
+        return ExplanationService.explain_step(ExplanationService.summarize_errors(errors), dw, db, lr)
+    
+    @staticmethod
+    def explain_step(summary: ErrorSummary, dw: float, db: float, lr: float) -> List[str]:
+        """Explicațiile unui pas, din rezumatul erorilor (fără a reparcurge datele)."""
+        n = summary.n
+        positive_errors = summary.positive_errors
+        negative_errors = summary.negative_errors
         
+        # Cheia conține exact ce apare în text sau decide ramura, deci cache-ul e exact
         if positive_errors > negative_errors * 1.5:
-            explanations.append(f"🔴 Linia este SUB majoritatea punctelor ({positive_errors}/{n})")
-            explanations.append("➡️ Bias-ul (b) va CREȘTE pentru a ridica linia")
+            position = (1, positive_errors, n)
         elif negative_errors > positive_errors * 1.5:
-            explanations.append(f"🔵 Linia este PESTE majoritatea punctelor ({negative_errors}/{n})")
-            explanations.append("➡️ Bias-ul (b) va SCĂDEA pentru a coborî linia")
+            position = (-1, negative_errors, n)
         else:
-            explanations.append("🟢 Linia este relativ echilibrată față de puncte")
+            position = (0,)
         
-        # 2. Analiză gradient w (pantă)
-        if abs(dw) > 0.1:
-            direction = "SCADĂ" if dw > 0 else "CREASCĂ"
-            explanations.append(f"📊 Panta trebuie să {direction} (gradient w = {dw:.3f})")
-        else:
-            explanations.append("✅ Panta este aproape optimă")
-        
-        # 3. Analiză gradient b
-        if abs(db) > 0.1:
-            direction = "SCĂDEA" if db > 0 else "CREȘTE"
-            explanations.append(f"⬆️⬇️ Interceptul va {direction} (gradient b = {db:.3f})")
-        
-        # 4. Analiză learning rate
         step_size = lr * abs(dw) + lr * abs(db)
-        if step_size > 1.0:
-            explanations.append("⚠️ ATENȚIE: Learning rate prea mare → pași foarte mari!")
-            explanations.append("Riscul de oscilație sau divergență este crescut")
-        elif step_size < 0.001:
-            explanations.append("🐌 Learning rate mic → progres foarte lent")
-        
-        # 5. Identifică punctele problematice
-        error_magnitudes = np.abs(errors)
-        max_error_idx = np.argmax(error_magnitudes)
-        max_error = error_magnitudes[max_error_idx]
+        step_category = 1 if step_size > 1.0 else (-1 if step_size < 0.001 else 0)
         
-        if max_error > np.mean(error_magnitudes) * 2:
-            explanations.append(f"⭐ Punctul {max_error_idx} are eroarea cea mai mare ({max_error:.2f})")
-            explanations.append("Acest punct 'trage' puternic gradientul în direcția sa")
+        if summary.max_error > summary.mean_abs_error * 2:
+            max_error = (summary.max_error_index, f"{summary.max_error:.2f}")
+        else:
+            max_error = None
         
-        # 6. Predicție convergență
-        gradient_mag = np.sqrt(dw**2 + db**2)
-        if gradient_mag < 0.01:
-            explanations.append("✨ CONVERGENȚĂ APROAPE! Gradientul este foarte mic")
-        elif gradient_mag > 1.0:
-            explanations.append("🚀 Încă departe de optimum, gradient mare")
+        gradient_mag = math.hypot(dw, db)
+        gradient_category = -1 if gradient_mag < 0.01 else (1 if gradient_mag > 1.0 else 0)
         
-        return explanations
+        key = (
+            position,
+            f"{dw:.3f}" if abs(dw) > 0.1 else None,
+            f"{db:.3f}" if abs(db) > 0.1 else None,
+            step_category,
+            max_error,
+            gradient_category
+        )
+        return list(_render_step_explanation(key))
     
     @staticmethod
-    def analyze_learning_rate(lr: float) -> List[str]:
-        """Analizează dacă learning rate-ul este adecvat."""
+    def analyze_learning_rate(lr: float, optimizer: str = "sgd") -> List[str]:
+        """
+        Analizează dacă learning rate-ul este adecvat pentru optimizatorul folosit.
+        Pragurile de gradient descent nu se aplică la adam (lr este chiar
+        mărimea pasului) și nici la line_search (lr este ignorat).
+        """
         warnings = []
         
+        if optimizer == "line_search":
+            return warnings
+        if optimizer == "adam":
+            if lr > 1.0:
+                warnings.append("⚠️ Learning rate FOARTE MARE pentru Adam! Parametrii vor sări în jurul optimului.")
+            elif lr < 0.001:
+                warnings.append("🐌 Learning rate foarte mic. Convergența va fi lentă.")
+            return warnings
+        
+        if optimizer in ("momentum", "nesterov"):
+            warnings.append("ℹ️ Cu momentum, pasul efectiv poate fi de până la 10× learning rate-ul.")
+        
         if lr > 0.1:
             warnings.append("⚠️ Learning rate FOARTE MARE! Risc de oscilație sau divergență.")
         elif lr > 0.05:
@@ -91,3 +135,52 @@ class ExplanationService:
             warnings.append("🐌 Learning rate foarte mic. Convergența va fi lentă.")
         
         return warnings
+
+
+@lru_cache(maxsize=EXPLANATION_CACHE_SIZE)
+def _render_step_explanation(key: Tuple) -> Tuple[str, ...]:
+    """Construiește textul explicațiilor pentru o cheie (memorat)."""
+    position, dw_text, db_text, step_category, max_error, gradient_category = key
+    explanations = []
+    
+    # 1. Analiză poziționare linie vs puncte
+    if position[0] > 0:
+        explanations.append(f"🔴 Linia este SUB majoritatea punctelor ({position[1]}/{position[2]})")
+        explanations.append("➡️ Bias-ul (b) va CREȘTE pentru a ridica linia")
+    elif position[0] < 0:
+        explanations.append(f"🔵 Linia este PESTE majoritatea punctelor ({position[1]}/{position[2]})")
+        explanations.append("➡️ Bias-ul (b) va SCĂDEA pentru a coborî linia")
+    else:
+        explanations.append("🟢 Linia este relativ echilibrată față de puncte")
+    
+    # 2. Analiză gradient w (pantă)
+    if dw_text is not None:
+        direction = "SCADĂ" if float(dw_text) > 0 else "CREASCĂ"
+        explanations.append(f"📊 Panta trebuie să {direction} (gradient w = {dw_text})")
+    else:
+        explanations.append("✅ Panta este aproape optimă")
+    
+    # 3. Analiză gradient b
+    if db_text is not None:
+        direction = "SCĂDEA" if float(db_text) > 0 else "CREȘTE"
+        explanations.append(f"⬆️⬇️ Interceptul va {direction} (gradient b = {db_text})")
+    
+    # 4. Analiză learning rate
+    if step_category > 0:
+        explanations.append("⚠️ ATENȚIE: Learning rate prea mare → pași foarte mari!")
+        explanations.append("Riscul de oscilație sau divergență este crescut")
+    elif step_category < 0:
+        explanations.append("🐌 Learning rate mic → progres foarte lent")
+    
+    # 5. Identifică punctele problematice
+    if max_error is not None:
+        explanations.append(f"⭐ Punctul {max_error[0]} are eroarea cea mai mare ({max_error[1]})")
+        explanations.append("Acest punct 'trage' puternic gradientul în direcția sa")
+    
+    # 6. Predicție convergență
+    if gradient_category < 0:
+        explanations.append("✨ CONVERGENȚĂ APROAPE! Gradientul este foarte mic")
+    elif gradient_category > 0:
+        explanations.append("🚀 Încă departe de optimum, gradient mare")
+    
+    return tuple(explanations)
@@ -0,0 +1,303 @@
+"""
+Service pentru istoricul de training
+Istoricul (epocă, loss, w, b) este ținut în array-uri float64 prealocate,
+cu o politică de retenție care menține memoria constantă pe rulări lungi:
+    ring      - păstrează ultimele max_entries epoci
+    decimate  - păstrează toată rularea, dar la rezoluție tot mai mică
+                (la umplere se păstrează doar epocile multiple de 2·stride)
+"""
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+RETENTION_POLICIES = ("ring", "decimate")
+DOWNSAMPLE_METHODS = ("lttb", "minmax", "stride")
+
+DEFAULT_MAX_ENTRIES = 100_000
+INITIAL_CAPACITY = 1024
+
+# Coloanele din _values
+_LOSS, _W, _B = 0, 1, 2
+
+
+class TrainingHistory:
+    """Istoric compact și mărginit al epocilor de training."""
+
+    __slots__ = ("max_entries", "policy", "stride", "_epochs", "_values", "_start", "_end", "_last")
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, policy: str = "ring"):
+        _validate(max_entries, policy)
+        self.max_entries = max_entries
+        self.policy = policy
+        self.clear()
+
+    def configure(self, max_entries: int, policy: str) -> None:
+        """Schimbă politica de retenție păstrând cât din istoric încape în ea."""
+        _validate(max_entries, policy)
+        retained = self.snapshot()
+        last = self._last
+        self.max_entries = max_entries
+        self.policy = policy
+        self.clear()
+
+        if policy == "ring":
+            retained = {key: values[-max_entries:] for key, values in retained.items()}
+        self._write(retained["epochs"], retained["loss"], retained["w"], retained["b"])
+        while len(self) > max_entries:
+            self._decimate()
+        self._last = last
+
+    def clear(self) -> None:
+        capacity = min(INITIAL_CAPACITY, self._capacity_limit())
+        self.stride = 1
+        self._epochs = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((3, capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        # Ultima epocă e păstrată mereu, chiar dacă decimarea o sare
+        self._last: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def total_epochs(self) -> int:
+        """Numărul de epoci înregistrate (inclusiv cele eliminate de retenție)."""
+        return self._last[0] if self._last is not None else 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._epochs.nbytes + self._values.nbytes
+
+    @property
+    def epochs(self) -> np.ndarray:
+        return self._epochs[self._start:self._end]
+
+    @property
+    def loss(self) -> np.ndarray:
+        return self._values[_LOSS, self._start:self._end]
+
+    @property
+    def w(self) -> np.ndarray:
+        return self._values[_W, self._start:self._end]
+
+    @property
+    def b(self) -> np.ndarray:
+        return self._values[_B, self._start:self._end]
+
+    @property
+    def last(self) -> Optional[Dict]:
+        if self._last is None:
+            return None
+        epoch, loss, w, b = self._last
+        return {"epoch": epoch, "loss": loss, "w": w, "b": b}
+
+    def append(self, loss: float, w: float, b: float) -> None:
+        """Adaugă epoca următoare."""
+        self.extend(np.array([loss]), np.array([w]), np.array([b]))
+
+    def extend(self, loss: np.ndarray, w: np.ndarray, b: np.ndarray) -> None:
+        """Adaugă vectorizat un bloc de epoci consecutive."""
+        count = len(loss)
+        if count == 0:
+            return
+        first_epoch = self.total_epochs + 1
+        epochs = np.arange(first_epoch, first_epoch + count, dtype=np.int64)
+        self._last = (int(epochs[-1]), float(loss[-1]), float(w[-1]), float(b[-1]))
+
+        if self.policy == "ring":
+            # Doar ultimele max_entries contează
+            if count > self.max_entries:
+                epochs, loss, w, b = (a[-self.max_entries:] for a in (epochs, loss, w, b))
+            self._write(epochs, loss, w, b)
+            if len(self) > self.max_entries:
+                self._start = self._end - self.max_entries
+            return
+
+        # decimate: se păstrează doar epocile multiple de stride
+        offset = 0
+        while offset < len(epochs):
+            mask = epochs[offset:] % self.stride == 0
+            kept = np.flatnonzero(mask)[:self.max_entries - len(self)] + offset
+            if len(kept):
+                self._write(epochs[kept], loss[kept], w[kept], b[kept])
+            if len(self) < self.max_entries:
+                break
+            # Plin: dublează stride-ul și continuă cu epocile rămase
+            offset = int(kept[-1]) + 1 if len(kept) else len(epochs)
+            self._decimate()
+
+    def export(self) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+        """Configurația și copii ale intrărilor reținute (epochs, values[3, k]), pentru checkpoint."""
+        meta = {
+            "max_entries": self.max_entries,
+            "policy": self.policy,
+            "stride": self.stride,
+            "last": list(self._last) if self._last is not None else None
+        }
+        return meta, self.epochs.copy(), self._values[:, self._start:self._end].copy()
+
+    @classmethod
+    def restore(cls, meta: Dict[str, Any], epochs: np.ndarray, values: np.ndarray) -> "TrainingHistory":
+        """Reconstruiește istoricul salvat de export()."""
+        history = cls(meta["max_entries"], meta["policy"])
+        history._write(epochs, values[_LOSS], values[_W], values[_B])
+        history.stride = meta["stride"]
+        last = meta["last"]
+        history._last = (int(last[0]), float(last[1]), float(last[2]), float(last[3])) if last is not None else None
+        return history
+
+    def at(self, epoch: int, nearest: bool = False) -> Optional[Dict]:
+        """
+        Intrarea (epoch, loss, w, b) pentru o epocă reținută; cu nearest, cea
+        mai apropiată epocă reținută. None dacă epoca nu e disponibilă.
+        """
+        if self._last is not None and epoch == self._last[0]:
+            return self.last
+        epochs = self.epochs
+        if len(epochs) == 0:
+            return self.last if nearest else None
+        index = int(np.searchsorted(epochs, epoch))
+        if index < len(epochs) and epochs[index] == epoch:
+            return self._entry(index)
+        if not nearest:
+            return None
+        # Vecinii din stânga/dreapta, plus ultima epocă (păstrată mereu)
+        candidates = [self._entry(i) for i in (index - 1, index) if 0 <= i < len(epochs)]
+        candidates.append(self.last)
+        return min(candidates, key=lambda entry: (abs(entry["epoch"] - epoch), entry["epoch"]))
+
+    def since(self, epoch: int) -> Dict[str, np.ndarray]:
+        """Intrările reținute cu epoca > epoch."""
+        start = int(np.searchsorted(self.epochs, epoch, side="right"))
+        return self._select(slice(start, None))
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        return self._select(slice(None))
+
+    def downsample(self, max_points: int, method: str = "lttb") -> Dict[str, np.ndarray]:
+        """
+        Subeșantionare fidelă vizual a curbei de loss, la cel mult max_points puncte.
+        lttb   - Largest-Triangle-Three-Buckets
+        minmax - minimul și maximul din fiecare bucket (păstrează oscilațiile)
+        stride - puncte distribuite uniform
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown downsample method: {method}")
+        n = len(self)
+        if n <= max_points:
+            return self.snapshot()
+        if method == "lttb":
+            indices = _lttb_indices(self.epochs.astype(np.float64), self.loss, max_points)
+        elif method == "minmax":
+            indices = _minmax_indices(self.loss, max_points)
+        else:
+            indices = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+        return self._select(indices)
+
+    def _entry(self, index: int) -> Dict:
+        position = self._start + index
+        return {
+            "epoch": int(self._epochs[position]),
+            "loss": float(self._values[_LOSS, position]),
+            "w": float(self._values[_W, position]),
+            "b": float(self._values[_B, position])
+        }
+
+    def _select(self, index) -> Dict[str, np.ndarray]:
+        return {
+            "epochs": self.epochs[index],
+            "loss": self.loss[index],
+            "w": self.w[index],
+            "b": self.b[index]
+        }
+
+    def _capacity_limit(self) -> int:
+        # Ring-ul are nevoie de spațiu suplimentar ca să compacteze rar
+        return self.max_entries + max(self.max_entries // 4, 1)
+
+    def _write(self, epochs: np.ndarray, loss: np.ndarray, w: np.ndarray, b: np.ndarray) -> None:
+        count = len(epochs)
+        if self._end + count > len(self._epochs):
+            self._make_room(count)
+        end = self._end + count
+        self._epochs[self._end:end] = epochs
+        self._values[_LOSS, self._end:end] = loss
+        self._values[_W, self._end:end] = w
+        self._values[_B, self._end:end] = b
+        self._end = end
+
+    def _make_room(self, count: int) -> None:
+        size = len(self)
+        # Ring: aruncă de la început ce nu mai încape în fereastră
+        if self.policy == "ring" and size + count > self.max_entries:
+            self._start = self._end - max(self.max_entries - count, 0)
+            size = len(self)
+
+        needed = size + count
+        capacity = len(self._epochs)
+        if needed > capacity:
+            capacity = min(max(needed, capacity * 2), max(self._capacity_limit(), needed))
+            epochs = np.empty(capacity, dtype=np.int64)
+            values = np.empty((3, capacity), dtype=np.float64)
+        else:
+            epochs, values = self._epochs, self._values
+
+        epochs[:size] = self._epochs[self._start:self._end]
+        values[:, :size] = self._values[:, self._start:self._end]
+        self._epochs, self._values = epochs, values
+        self._start, self._end = 0, size
+
+    def _decimate(self) -> None:
+        self.stride *= 2
+        keep = np.flatnonzero(self.epochs % self.stride == 0) + self._start
+        size = len(keep)
+        self._epochs[:size] = self._epochs[keep]
+        self._values[:, :size] = self._values[:, keep]
+        self._start, self._end = 0, size
+
+
+def _validate(max_entries: int, policy: str) -> None:
+    if policy not in RETENTION_POLICIES:
+        raise ValueError(f"Unknown retention policy: {policy}")
+    if max_entries < 2:
+        raise ValueError("max_entries must be at least 2")
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indicii selectați de Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.unique(np.linspace(0, n - 1, max(min(threshold, n), 2)).round().astype(np.int64))
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    prev = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean() if next_hi > next_lo else x[-1]
+        avg_y = y[next_lo:next_hi].mean() if next_hi > next_lo else y[-1]
+        # Aria triunghiului (prev, candidat, media bucket-ului următor)
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        indices[i + 1] = prev
+    return indices
+
+
+def _minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indicii minimului și maximului din fiecare bucket, plus capetele."""
+    n = len(y)
+    buckets = max((max_points - 2) // 2, 1)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    lengths = np.diff(edges)
+    valid = lengths > 0
+    starts, lengths = starts[valid], lengths[valid]
+    mins = np.array([s + np.argmin(y[s:s + l]) for s, l in zip(starts, lengths)], dtype=np.int64)
+    maxs = np.array([s + np.argmax(y[s:s + l]) for s, l in zip(starts, lengths)], dtype=np.int64)
+    return np.unique(np.concatenate(([0], mins, maxs, [n - 1])))
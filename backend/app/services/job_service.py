@@ -0,0 +1,221 @@
+"""
+Service pentru job-uri de training în fundal
+Un job rulează epocile pe bucăți (chunk-uri) într-un pool mărginit de
+thread-uri, deci event loop-ul rămâne liber pentru ceilalți utilizatori.
+Lock-ul sesiunii e ținut doar pe durata unui chunk, astfel încât request-urile
+interactive din aceeași sesiune se intercalează între chunk-uri.
+Rezultatele parțiale (câte unul per chunk) pot fi citite prin polling sau
+în streaming, iar anularea are efect la granița următorului chunk.
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUEUED = 16
+DEFAULT_MAX_PER_SESSION = 2
+DEFAULT_MAX_FINISHED = 256
+DEFAULT_CHUNK_EPOCHS = 20_000
+MAX_PARTIAL_RESULTS = 1000
+
+
+class JobLimitError(Exception):
+    """Sesiunea are deja numărul maxim de job-uri active."""
+
+
+class JobQueueFullError(Exception):
+    """Coada globală de job-uri este plină; clientul trebuie să reîncerce."""
+
+
+class JobAbandonedError(Exception):
+    """Ridicată de run_chunk când starea sesiunii nu mai aparține job-ului (evacuare, reset)."""
+
+
+@dataclass
+class Job:
+    id: str
+    session_id: str
+    epochs: int
+    tolerance: Optional[float]
+    chunk_epochs: int
+    status: str = "queued"
+    epochs_done: int = 0
+    converged: bool = False
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Numărul de actualizări publicate; partial[-1]["sequence"] == sequence
+    sequence: int = 0
+    partial: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_PARTIAL_RESULTS))
+    cancel_requested: bool = False
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def updates_since(self, sequence: int) -> List[Dict[str, Any]]:
+        return [update for update in self.partial if update["sequence"] > sequence]
+
+
+class JobManager:
+    """
+    Pool mărginit de job-uri: cel mult max_workers rulează simultan,
+    cel mult max_queued așteaptă, iar o sesiune are cel mult max_per_session
+    job-uri active (în coadă sau în rulare).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        max_per_session: int = DEFAULT_MAX_PER_SESSION,
+        max_finished: int = DEFAULT_MAX_FINISHED,
+    ):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_per_session = max_per_session
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(
+        self,
+        session_id: str,
+        lock: asyncio.Lock,
+        run_chunk: Callable[[int, Optional[float]], Dict[str, Any]],
+        epochs: int,
+        tolerance: Optional[float] = None,
+        chunk_epochs: int = DEFAULT_CHUNK_EPOCHS,
+    ) -> Job:
+        """
+        Pune un job în coadă. run_chunk(epochs, tolerance) rulează pe un thread
+        din pool, cu lock-ul sesiunii ținut, și returnează rezultatul chunk-ului.
+        """
+        active = [job for job in self._jobs.values() if not job.finished]
+        if sum(1 for job in active if job.session_id == session_id) >= self.max_per_session:
+            raise JobLimitError(f"At most {self.max_per_session} active jobs per session")
+        if sum(1 for job in active if job.status == "queued") >= self.max_queued:
+            raise JobQueueFullError("Job queue is full")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            session_id=session_id,
+            epochs=epochs,
+            tolerance=tolerance,
+            chunk_epochs=chunk_epochs,
+        )
+        self._jobs[job.id] = job
+        self._prune()
+        self._tasks[job.id] = asyncio.get_running_loop().create_task(self._run(job, lock, run_chunk))
+        return job
+
+    def get(self, job_id: str, session_id: Optional[str] = None) -> Optional[Job]:
+        """Job-ul cu id-ul dat; cu session_id, doar dacă aparține sesiunii."""
+        job = self._jobs.get(job_id)
+        if job is None or (session_id is not None and job.session_id != session_id):
+            return None
+        return job
+
+    def list(self, session_id: str) -> List[Job]:
+        return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    def all(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    async def cancel(self, job: Job) -> None:
+        """Cere anularea; un job din coadă e anulat imediat, unul care rulează după chunk-ul curent."""
+        if job.finished:
+            return
+        job.cancel_requested = True
+        if job.status == "queued":
+            await self._finish(job, "cancelled")
+
+    async def wait_for_update(self, job: Job, sequence: int, timeout: Optional[float] = None) -> None:
+        """Așteaptă o actualizare mai nouă decât `sequence` sau terminarea job-ului."""
+        async with job.changed:
+            await asyncio.wait_for(
+                job.changed.wait_for(lambda: job.sequence > sequence or job.finished),
+                timeout
+            )
+
+    def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, job: Job, lock: asyncio.Lock, run_chunk: Callable) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                if job.finished:
+                    return
+                job.status = "running"
+                job.started_at = time.time()
+                await self._publish(job, None)
+
+                while job.epochs_done < job.epochs and not job.cancel_requested:
+                    chunk = min(job.chunk_epochs, job.epochs - job.epochs_done)
+                    async with lock:
+                        result = await loop.run_in_executor(self._executor, run_chunk, chunk, job.tolerance)
+                    job.epochs_done += result["epochs_run"]
+                    job.converged = result["converged"]
+                    job.result = result
+                    await self._publish(job, result)
+                    # Convergență, divergență (oprire înainte de chunk) sau gata
+                    if job.converged or result["epochs_run"] < chunk:
+                        break
+
+                await self._finish(job, "cancelled" if job.cancel_requested else "completed")
+        except asyncio.CancelledError:
+            await self._finish(job, "cancelled")
+            raise
+        except JobAbandonedError as e:
+            job.error = str(e)
+            await self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = str(e)
+            await self._finish(job, "failed")
+        finally:
+            self._tasks.pop(job.id, None)
+
+    async def _publish(self, job: Job, result: Optional[Dict[str, Any]]) -> None:
+        async with job.changed:
+            job.sequence += 1
+            if result is not None:
+                job.partial.append({
+                    "sequence": job.sequence,
+                    "epochs_done": job.epochs_done,
+                    "epoch": result["epoch"],
+                    "w": result["w_final"],
+                    "b": result["b_final"],
+                    "loss": result["loss_final"],
+                    "gradient_magnitude": result["gradient_magnitude"]
+                })
+            job.changed.notify_all()
+
+    async def _finish(self, job: Job, status: str) -> None:
+        if job.finished:
+            return
+        job.status = status
+        job.finished_at = time.time()
+        await self._publish(job, None)
+
+    def _prune(self) -> None:
+        """Păstrează doar ultimele max_finished job-uri terminate."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,171 @@
+"""
+Service pentru suprafața de loss MSE(w, b)
+Suprafața e evaluată în formă închisă din statisticile suficiente ale
+dataset-ului, deci costul depinde doar de mărimea grilei, nu de n:
+    MSE(w, b) = (Syy - 2w·Sxy + w²·Sxx) / n + (ȳ - w·x̄ - b)²
+
+Pentru zoom progresiv, planul (w, b) e împărțit în tile-uri pe niveluri:
+nivelul 0 este fereastra de bază a dataset-ului, iar fiecare nivel următor
+înjumătățește latura unui tile. Tile-urile și ferestrele calculate sunt
+ținute într-un cache LRU cheiat după statisticile dataset-ului.
+"""
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset_service import DatasetStats
+
+TILE_SIZE = 64
+MAX_RESOLUTION = 512
+MAX_LEVEL = 24
+# Câte tile-uri de bază se pot parcurge în afara ferestrei de bază (pan)
+TILE_MARGIN = 1
+LANDSCAPE_CACHE_ENTRIES = 1024
+LANDSCAPE_CACHE_BYTES = 64 * 1024 ** 2
+# Fereastra de bază acoperă optimul și punctul de start, cu o margine
+BASE_WINDOW_PADDING = 1.5
+
+Window = Tuple[float, float, float, float]  # w_min, w_max, b_min, b_max
+
+
+class _GridCache:
+    """LRU thread-safe pentru grile de loss, mărginit ca număr și bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, value: Dict) -> None:
+        nbytes = value["loss"].nbytes
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["loss"].nbytes
+
+
+_grid_cache = _GridCache(LANDSCAPE_CACHE_ENTRIES, LANDSCAPE_CACHE_BYTES)
+
+
+class LandscapeService:
+    """Service pentru grile de loss peste planul (w, b)"""
+
+    @staticmethod
+    def optimum(stats: DatasetStats) -> Tuple[float, float, float]:
+        """
+        Minimul MSE (soluția OLS).
+        Returns: (w_opt, b_opt, loss_opt)
+        """
+        w_opt = stats.sxy / stats.sxx if stats.sxx > 0 else 0.0
+        b_opt = stats.mean_y - w_opt * stats.mean_x
+        loss_opt = max(stats.syy - w_opt * stats.sxy, 0.0) / stats.n
+        return w_opt, b_opt, loss_opt
+
+    @staticmethod
+    def loss_grid(stats: DatasetStats, w_values: np.ndarray, b_values: np.ndarray) -> np.ndarray:
+        """
+        MSE pe grila w_values × b_values, în O(grilă).
+        Returns: matrice (len(b_values), len(w_values)) - rândurile sunt b, coloanele w
+        """
+        with np.errstate(over="ignore", invalid="ignore"):
+            # Partea centrată depinde doar de w
+            centered = (stats.syy - 2 * w_values * stats.sxy + w_values * w_values * stats.sxx) / stats.n
+            centered = np.maximum(centered, 0.0)
+            mean_error = (stats.mean_y - w_values * stats.mean_x)[np.newaxis, :] - b_values[:, np.newaxis]
+            loss = centered[np.newaxis, :] + mean_error * mean_error
+        # Ferestrele foarte îndepărtate pot depăși float64; JSON nu suportă inf
+        return np.nan_to_num(loss, nan=np.finfo(np.float64).max, posinf=np.finfo(np.float64).max)
+
+    @staticmethod
+    def base_window(stats: DatasetStats, anchor_w: float, anchor_b: float) -> Window:
+        """
+        Fereastra nivelului 0: centrată pe optim și destul de largă cât să
+        includă punctul de start (anchor) al optimizatorului.
+        """
+        w_opt, b_opt, _ = LandscapeService.optimum(stats)
+        half_w = BASE_WINDOW_PADDING * max(abs(w_opt - anchor_w), 0.5 * abs(w_opt), 1.0)
+        half_b = BASE_WINDOW_PADDING * max(abs(b_opt - anchor_b), 0.5 * abs(b_opt), 1.0)
+        return w_opt - half_w, w_opt + half_w, b_opt - half_b, b_opt + half_b
+
+    @staticmethod
+    def level_for_window(base: Window, window: Window) -> int:
+        """Nivelul de tile-uri potrivit pentru zoom-ul ferestrei cerute."""
+        ratio = min(
+            (base[1] - base[0]) / (window[1] - window[0]),
+            (base[3] - base[2]) / (window[3] - window[2])
+        )
+        return int(min(max(math.floor(math.log2(ratio)), 0), MAX_LEVEL)) if ratio > 0 else 0
+
+    @staticmethod
+    def window(stats: DatasetStats, window: Window, resolution: int) -> Dict:
+        """Grila de loss pentru o fereastră arbitrară, din cache dacă a mai fost cerută."""
+        key = ("window", stats, window, resolution)
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        w_min, w_max, b_min, b_max = window
+        w_values = np.linspace(w_min, w_max, resolution)
+        b_values = np.linspace(b_min, b_max, resolution)
+        grid = LandscapeService._grid(stats, w_values, b_values)
+        _grid_cache.put(key, grid)
+        return grid
+
+    @staticmethod
+    def tile(stats: DatasetStats, base: Window, level: int, tx: int, ty: int, size: int = TILE_SIZE) -> Dict:
+        """
+        Tile-ul (tx, ty) de la nivelul `level`: la nivelul z fereastra de bază e
+        împărțită în 2^z × 2^z tile-uri. Tile-urile vecine au marginile comune.
+        """
+        if not 0 <= level <= MAX_LEVEL:
+            raise ValueError(f"level must be between 0 and {MAX_LEVEL}")
+        tiles = 1 << level
+        limit = TILE_MARGIN * tiles
+        if not (-limit <= tx < tiles + limit and -limit <= ty < tiles + limit):
+            raise ValueError("Tile is outside the landscape")
+
+        key = ("tile", stats, base, level, tx, ty, size)
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        tile_w = (base[1] - base[0]) / tiles
+        tile_b = (base[3] - base[2]) / tiles
+        w_lo = base[0] + tx * tile_w
+        b_lo = base[2] + ty * tile_b
+        w_values = np.linspace(w_lo, w_lo + tile_w, size)
+        b_values = np.linspace(b_lo, b_lo + tile_b, size)
+        grid = LandscapeService._grid(stats, w_values, b_values)
+        _grid_cache.put(key, grid)
+        return grid
+
+    @staticmethod
+    def _grid(stats: DatasetStats, w_values: np.ndarray, b_values: np.ndarray) -> Dict:
+        loss = LandscapeService.loss_grid(stats, w_values, b_values)
+        loss.flags.writeable = False
+        return {
+            "w_values": w_values,
+            "b_values": b_values,
+            "loss": loss,
+            "loss_min": float(loss.min()),
+            "loss_max": float(loss.max())
+        }
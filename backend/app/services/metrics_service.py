@@ -0,0 +1,212 @@
+"""
+Service pentru metrici în format Prometheus (text exposition 0.0.4)
+Histograme și gauge-uri minimale, fără dependențe externe.
+O observație costă un bisect și câteva incrementări sub un lock, deci
+instrumentarea poate rămâne activă în producție.
+Gauge-urile calculate (sesiuni, dimensiuni de dataset) sunt evaluate doar
+la scrape, prin callback-uri.
+"""
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASE_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(11))  # 256 B ... 256 MiB
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+EVENT_LOOP_PROBE_SECONDS = 0.5
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Labels, float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """Histogramă cu bucket-uri fixe, pe combinații de label-uri."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (ultimul = +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        names = self.label_names + ("le",)
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            suffix = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge setat explicit sau calculat la scrape de un callback."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Sample]]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.callback = callback
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        samples = list(self.callback()) if self.callback is not None else list(self._values.items())
+        for labels, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Colecția de metrici expusă la /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Sample]]] = None
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names, callback))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency per route", ("method", "route", "status")
+)
+request_size = registry.histogram(
+    "http_request_size_bytes", "HTTP request body size", ("method", "route"), SIZE_BUCKETS
+)
+response_size = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS
+)
+requests_in_progress = registry.gauge("http_requests_in_progress", "HTTP requests currently being served")
+phase_duration = registry.histogram(
+    "ml_phase_duration_seconds", "Duration of the phases inside the training endpoints", ("endpoint", "phase"), PHASE_BUCKETS
+)
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Delay of the event loop when waking up from a scheduled sleep", (), LAG_BUCKETS
+)
+
+_current_timer: ContextVar[Optional["PhaseTimer"]] = ContextVar("phase_timer", default=None)
+
+
+class PhaseTimer:
+    """
+    Cronometru pe faze pentru un endpoint: fiecare lap(faza) înregistrează
+    timpul scurs de la lap-ul anterior. Cât timp e activ (with), funcțiile
+    apelate din handler pot marca faze cu metrics_service.lap().
+    """
+    __slots__ = ("endpoint", "_last", "_token")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self._last = time.perf_counter()
+        self._token = None
+
+    def __enter__(self) -> "PhaseTimer":
+        self._token = _current_timer.set(self)
+        self._last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _current_timer.reset(self._token)
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        phase_duration.observe(now - self._last, self.endpoint, phase)
+        self._last = now
+
+    def skip(self) -> None:
+        """Ignoră timpul de la ultimul lap (ex. o fază care nu a fost cerută)."""
+        self._last = time.perf_counter()
+
+
+def lap(phase: str) -> None:
+    """Marchează sfârșitul unei faze pe cronometrul activ (no-op în afara unui endpoint cronometrat)."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.lap(phase)
+
+
+async def monitor_event_loop(interval: float = EVENT_LOOP_PROBE_SECONDS) -> None:
+    """
+    Măsoară lag-ul event loop-ului: cât de târziu se trezește un sleep de
+    `interval` secunde. Un handler care blochează loop-ul apare direct aici.
+    """
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(time.perf_counter() - start - interval, 0.0))
@@ -2,8 +2,38 @@
 Service pentru operații de Machine Learning
 Conține toată logica de calcul pentru gradient descent și predicții
 """
+import math
 import numpy as np
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
+
+from app.services.dataset_service import DatasetStats
+from app.services.optimizer_service import OptimizerService, OptimizerState
+from app.services.parallel_service import shard_pool
+
+
+ERROR_CATEGORIES = ("low", "medium", "high")
+# O configurație din sweep diverge când loss-ul crește de atâtea ori peste cel inițial
+SWEEP_DIVERGENCE_FACTOR = 1e6
+MAX_SWEEP_CONFIGURATIONS = 10_000
+# Traiectoria în formă închisă e evaluată pe blocuri, ca oprirea devreme să nu calculeze toate epocile
+CLOSED_FORM_BLOCK_EPOCHS = 65_536
+
+
+class StepBuffers:
+    """Buffere prealocate pentru fused_step, refolosite de la un pas la altul."""
+    
+    __slots__ = (
+        "predictions_before", "errors", "error_magnitudes", "dw_individual",
+        "db_individual", "predictions_after", "scratch"
+    )
+    
+    def __init__(self, n: int):
+        for name in self.__slots__:
+            setattr(self, name, np.empty(n))
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
 
 
 class MLService:
@@ -47,12 +77,13 @@ class MLService:
         Returns: (dw, db, gradient_magnitude)
         """
         n = len(x)
-        errors = y - y_pred
+        # Sume parțiale pe shard-uri (în paralel peste prag), fără array-ul de erori
+        sum_errors, sum_x_errors, _ = shard_pool.prediction_sums(x, y, y_pred)
         
-        dw = -(2/n) * np.sum(x * errors)
-        db = -(2/n) * np.sum(errors)
+        dw = -(2/n) * sum_x_errors
+        db = -(2/n) * sum_errors
         
-        gradient_magnitude = np.sqrt(dw**2 + db**2)
+        gradient_magnitude = math.hypot(dw, db)
         
         return dw, db, gradient_magnitude
     
@@ -70,10 +101,30 @@ class MLService:
         
         return w_new, b_new, delta_w, delta_b
     
+    @staticmethod
+    def apply_update(
+        w: float,
+        b: float,
+        dw: float,
+        db: float,
+        lr: float,
+        optimizer: Optional[OptimizerState] = None,
+        stats: Optional[DatasetStats] = None
+    ) -> Tuple[float, float, float, float]:
+        """
+        Actualizează parametrii cu optimizatorul sesiunii (sau gradient descent simplu).
+        Returns: (w_new, b_new, delta_w, delta_b)
+        """
+        if optimizer is None or optimizer.name == "sgd":
+            if optimizer is not None:
+                optimizer.step += 1
+            return MLService.update_parameters(w, b, dw, db, lr)
+        return OptimizerService.step(optimizer, w, b, dw, db, lr, stats)
+    
     @staticmethod
     def calculate_mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
         """Calculează Mean Squared Error."""
-        return float(np.mean((y_true - y_pred) ** 2))
+        return shard_pool.squared_error_sum(y_true, y_pred) / len(y_true)
     
     @staticmethod
     def categorize_errors(error_magnitudes: np.ndarray) -> List[str]:
@@ -81,15 +132,444 @@ class MLService:
         Clasifică punctele după magnitudinea erorii.
         Returns: listă cu categorii ('low', 'medium', 'high')
         """
-        max_error = np.max(error_magnitudes)
-        categories = []
+        return [ERROR_CATEGORIES[i] for i in MLService.categorize_errors_codes(error_magnitudes)]
+    
+    @staticmethod
+    def categorize_errors_codes(error_magnitudes: np.ndarray, max_error: Optional[float] = None) -> np.ndarray:
+        """
+        Clasificare vectorizată: 0 = low (< 20% din max), 1 = medium (< 50%), 2 = high.
+        """
+        if max_error is None:
+            max_error = np.max(error_magnitudes)
+        return np.digitize(error_magnitudes, (max_error * 0.2, max_error * 0.5))
+    
+    @staticmethod
+    def fused_step(
+        x: np.ndarray,
+        y: np.ndarray,
+        w: float,
+        b: float,
+        lr: float,
+        buffers: "StepBuffers",
+        optimizer: Optional[OptimizerState] = None,
+        stats: Optional[DatasetStats] = None
+    ) -> Dict:
+        """
+        Un pas complet de gradient descent cu toate datele per punct:
+        predicții, erori, contribuții, gradienți, loss înainte/după și categorii.
+        Reziduurile sunt calculate o singură dată, iar toate array-urile sunt
+        scrise în buffere prealocate, fără temporare noi.
+        Array-urile returnate sunt view-uri în buffere, valide până la pasul următor.
+        Peste pragul de sharding, fiecare shard e procesat de un thread separat
+        (shard-urile scriu în felii disjuncte ale bufferelor).
+        """
+        n = len(x)
+        pred_before = buffers.predictions_before
+        errors = buffers.errors
+        magnitudes = buffers.error_magnitudes
+        dw_individual = buffers.dw_individual
+        db_individual = buffers.db_individual
+        pred_after = buffers.predictions_after
+        scratch = buffers.scratch
+        
+        def before(start: int, stop: int) -> Tuple[float, float, float, int]:
+            xs, e, m = x[start:stop], errors[start:stop], magnitudes[start:stop]
+            p = pred_before[start:stop]
+            np.multiply(xs, w, out=p)
+            p += b
+            np.subtract(y[start:stop], p, out=e)
+            np.abs(e, out=m)
+            np.multiply(xs, e, out=dw_individual[start:stop])
+            dw_individual[start:stop] *= -2
+            np.multiply(e, -2, out=db_individual[start:stop])
+            return float(e.sum()), float(np.dot(xs, e)), float(np.dot(e, e)), start + int(np.argmax(m))
+        
+        parts = shard_pool.map(before, n)
+        sum_errors = sum(part[0] for part in parts)
+        sum_x_errors = sum(part[1] for part in parts)
+        sum_squared_errors = sum(part[2] for part in parts)
+        # Prima apariție a maximului, ca np.argmax pe tot array-ul
+        max_error_index = parts[0][3]
+        for part in parts[1:]:
+            if magnitudes[part[3]] > magnitudes[max_error_index]:
+                max_error_index = part[3]
         
-        for mag in error_magnitudes:
-            if mag < max_error * 0.2:
-                categories.append("low")
-            elif mag < max_error * 0.5:
-                categories.append("medium")
-            else:
-                categories.append("high")
+        dw = -(2/n) * sum_x_errors
+        db = -(2/n) * sum_errors
+        w_new, b_new, delta_w, delta_b = MLService.apply_update(w, b, dw, db, lr, optimizer, stats)
         
-        return categories
+        # ŷ_după = ŷ_înainte + Δw·x + Δb, iar reziduurile noi = y - ŷ_după
+        def after(start: int, stop: int) -> float:
+            p, r = pred_after[start:stop], scratch[start:stop]
+            np.multiply(x[start:stop], delta_w, out=p)
+            p += pred_before[start:stop]
+            p += delta_b
+            np.subtract(y[start:stop], p, out=r)
+            return float(np.dot(r, r))
+        
+        sum_squared_errors_after = sum(shard_pool.map(after, n))
+        
+        return {
+            "dw": dw,
+            "db": db,
+            "gradient_magnitude": math.hypot(dw, db),
+            "w_new": w_new,
+            "b_new": b_new,
+            "delta_w": delta_w,
+            "delta_b": delta_b,
+            "sum_errors": sum_errors,
+            "sum_x_errors": sum_x_errors,
+            "sum_squared_errors": sum_squared_errors,
+            "loss_before": sum_squared_errors / n,
+            "loss_after": sum_squared_errors_after / n,
+            "predictions_before": pred_before,
+            "predictions_after": pred_after,
+            "errors": errors,
+            "error_magnitudes": magnitudes,
+            "dw_individual": dw_individual,
+            "db_individual": db_individual,
+            # Indexul erorii maxime servește și categoriilor, și explicațiilor
+            "max_error_index": max_error_index,
+            "error_category_codes": MLService.categorize_errors_codes(magnitudes, magnitudes[max_error_index])
+        }
+    
+    @staticmethod
+    def calculate_residual_sums(stats: DatasetStats, w: float, b: float) -> Tuple[float, float, float]:
+        """
+        Calculează Σr, Σx·r și Σr² (r = y - ŷ) în O(1) din statisticile suficiente.
+        Returns: (sum_errors, sum_x_errors, sum_squared_errors)
+        """
+        n = stats.n
+        mean_error = stats.mean_y - w * stats.mean_x - b
+        sum_errors = n * mean_error
+        sum_x_errors = (stats.sxy - w * stats.sxx) + stats.mean_x * sum_errors
+        sum_squared_errors = stats.syy - 2 * w * stats.sxy + w * w * stats.sxx + n * mean_error * mean_error
+        return sum_errors, sum_x_errors, max(sum_squared_errors, 0.0)
+    
+    @staticmethod
+    def calculate_mse_from_stats(stats: DatasetStats, w: float, b: float) -> float:
+        """MSE în O(1), fără a parcurge datele."""
+        _, _, sum_squared_errors = MLService.calculate_residual_sums(stats, w, b)
+        return sum_squared_errors / stats.n
+    
+    @staticmethod
+    def calculate_gradients_from_stats(stats: DatasetStats, w: float, b: float) -> Tuple[float, float, float]:
+        """
+        Gradienții pentru w și b în O(1).
+        Returns: (dw, db, gradient_magnitude)
+        """
+        sum_errors, sum_x_errors, _ = MLService.calculate_residual_sums(stats, w, b)
+        dw = -(2/stats.n) * sum_x_errors
+        db = -(2/stats.n) * sum_errors
+        return dw, db, math.hypot(dw, db)
+    
+    @staticmethod
+    def fast_step(
+        stats: DatasetStats,
+        w: float,
+        b: float,
+        lr: float,
+        optimizer: Optional[OptimizerState] = None
+    ) -> Dict:
+        """
+        Un pas complet de gradient descent în timp constant:
+        loss înainte, gradienți, parametri noi și loss după.
+        """
+        sum_errors, sum_x_errors, sum_squared_errors = MLService.calculate_residual_sums(stats, w, b)
+        n = stats.n
+        dw = -(2/n) * sum_x_errors
+        db = -(2/n) * sum_errors
+        w_new, b_new, delta_w, delta_b = MLService.apply_update(w, b, dw, db, lr, optimizer, stats)
+        
+        return {
+            "dw": dw,
+            "db": db,
+            "gradient_magnitude": math.hypot(dw, db),
+            "w_new": w_new,
+            "b_new": b_new,
+            "delta_w": delta_w,
+            "delta_b": delta_b,
+            "sum_errors": sum_errors,
+            "sum_x_errors": sum_x_errors,
+            "sum_squared_errors": sum_squared_errors,
+            "loss_before": sum_squared_errors / n,
+            "loss_after": MLService.calculate_mse_from_stats(stats, w_new, b_new)
+        }
+    
+    @staticmethod
+    def run_gradient_descent(
+        stats: DatasetStats,
+        w: float,
+        b: float,
+        lr: float,
+        epochs: int,
+        tolerance: Optional[float] = None,
+        optimizer: Optional[OptimizerState] = None
+    ) -> Dict:
+        """
+        Rulează mai multe epoci de gradient descent într-o singură buclă.
+        Fiecare epocă costă O(1) datorită statisticilor suficiente.
+        Se oprește devreme dacă magnitudinea gradientului scade sub tolerance.
+        Cu un optimizator, fiecare epocă e un pas al acestuia, iar starea lui
+        (viteză, momente) continuă de la un apel la altul.
+        Fără optimizator (SGD simplu), traiectoria are formă închisă și este
+        calculată vectorizat (_run_plain_descent).
+        Returns: dict cu traiectoria (w, b, loss după fiecare epocă),
+        gradientul final și flag-ul de convergență.
+        """
+        if optimizer is None or optimizer.name == "sgd":
+            result = MLService._run_plain_descent(stats, w, b, lr, epochs, tolerance)
+            if optimizer is not None:
+                optimizer.step += len(result["loss"])
+            return result
+        
+        n = stats.n
+        w_hist = np.empty(epochs)
+        b_hist = np.empty(epochs)
+        loss_hist = np.empty(epochs)
+        
+        sum_errors, sum_x_errors, _ = MLService.calculate_residual_sums(stats, w, b)
+        dw = -(2/n) * sum_x_errors
+        db = -(2/n) * sum_errors
+        grad_magnitude = math.hypot(dw, db)
+        converged = tolerance is not None and grad_magnitude < tolerance
+        
+        epochs_run = 0
+        while epochs_run < epochs and not converged:
+            w, b, _, _ = OptimizerService.step(optimizer, w, b, dw, db, lr, stats)
+            
+            # Sumele după update dau și loss-ul epocii, și gradientul următor
+            sum_errors, sum_x_errors, sum_squared_errors = MLService.calculate_residual_sums(stats, w, b)
+            dw = -(2/n) * sum_x_errors
+            db = -(2/n) * sum_errors
+            grad_magnitude = math.hypot(dw, db)
+            
+            w_hist[epochs_run] = w
+            b_hist[epochs_run] = b
+            loss_hist[epochs_run] = sum_squared_errors / n
+            epochs_run += 1
+            
+            if tolerance is not None and grad_magnitude < tolerance:
+                converged = True
+            elif not np.isfinite(grad_magnitude):
+                break
+        
+        return {
+            "w": w_hist[:epochs_run],
+            "b": b_hist[:epochs_run],
+            "loss": loss_hist[:epochs_run],
+            "gradient_w": float(dw),
+            "gradient_b": float(db),
+            "gradient_magnitude": float(grad_magnitude),
+            "converged": bool(converged)
+        }
+    
+    @staticmethod
+    def _eigenbasis(stats: DatasetStats) -> Tuple[float, float, float, np.ndarray, np.ndarray]:
+        """
+        Optimul OLS, loss-ul minim și descompunerea proprie a hessianei MSE.
+        La x constant, optimul ales este punctul de pe dreapta optimă cu w = 0.
+        Returns: (w_opt, b_opt, loss_opt, eigenvalues, eigenvectors)
+        """
+        n = stats.n
+        w_opt = stats.sxy / stats.sxx if stats.sxx > 0 else 0.0
+        b_opt = stats.mean_y - w_opt * stats.mean_x
+        loss_opt = max(stats.syy - w_opt * stats.sxy, 0.0) / n
+        hessian = 2 * np.array([[stats.sxx / n + stats.mean_x ** 2, stats.mean_x], [stats.mean_x, 1.0]])
+        eigenvalues, eigenvectors = np.linalg.eigh(hessian)
+        return w_opt, b_opt, loss_opt, np.maximum(eigenvalues, 0.0), eigenvectors
+    
+    @staticmethod
+    def _run_plain_descent(
+        stats: DatasetStats,
+        w: float,
+        b: float,
+        lr: float,
+        epochs: int,
+        tolerance: Optional[float] = None
+    ) -> Dict:
+        """
+        Gradient descent simplu în formă închisă: în baza proprie a hessianei,
+        distanța față de optim se înmulțește la fiecare epocă cu ρ = 1 - lr·λ,
+        deci parametrii după epoca t sunt optim + V·(z·ρ^t). Loss-ul și
+        gradientul fiecărei epoci vin din statisticile suficiente, ca în bucla
+        iterativă; oprirea (convergență sau gradient nefinit) este aceeași.
+        """
+        n = stats.n
+        sum_errors, sum_x_errors, _ = MLService.calculate_residual_sums(stats, w, b)
+        dw = -(2/n) * sum_x_errors
+        db = -(2/n) * sum_errors
+        grad_magnitude = math.hypot(dw, db)
+        converged = tolerance is not None and grad_magnitude < tolerance
+        
+        w_blocks, b_blocks, loss_blocks = [], [], []
+        if not converged and epochs > 0:
+            w_opt, b_opt, _, eigenvalues, eigenvectors = MLService._eigenbasis(stats)
+            z = np.array([w - w_opt, b - b_opt]) @ eigenvectors
+            rho = 1 - lr * eigenvalues
+            # ρ^k pentru k = 1..bloc, calculat o singură dată (exp e mult mai ieftin
+            # decât power); blocul care începe la epoca s folosește ρ^s · ρ^k
+            offsets = np.arange(1, min(CLOSED_FORM_BLOCK_EPOCHS, epochs) + 1, dtype=np.float64)[:, None]
+            with np.errstate(divide="ignore", over="ignore"):
+                powers = np.exp(offsets * np.log(np.abs(rho)))
+            powers[(rho < 0) & (offsets % 2 == 1)] *= -1
+            
+            for start in range(0, epochs, CLOSED_FORM_BLOCK_EPOCHS):
+                count = min(CLOSED_FORM_BLOCK_EPOCHS, epochs - start)
+                with np.errstate(over="ignore", invalid="ignore"):
+                    params = (z * np.power(rho, start) * powers[:count]) @ eigenvectors.T
+                    w_t = params[:, 0] + w_opt
+                    b_t = params[:, 1] + b_opt
+                    # calculate_residual_sums, vectorizat pe epoci
+                    mean_error = stats.mean_y - w_t * stats.mean_x - b_t
+                    sums = n * mean_error
+                    sums_x = (stats.sxy - w_t * stats.sxx) + stats.mean_x * sums
+                    sums_squared = stats.syy - 2 * w_t * stats.sxy + w_t * w_t * stats.sxx + n * mean_error * mean_error
+                    dws = -(2/n) * sums_x
+                    dbs = -(2/n) * sums
+                    gradients = np.hypot(dws, dbs)
+                    stop = ~np.isfinite(gradients)
+                    if tolerance is not None:
+                        stop |= gradients < tolerance
+                
+                hits = np.flatnonzero(stop)
+                if len(hits):
+                    count = int(hits[0]) + 1
+                w_blocks.append(w_t[:count])
+                b_blocks.append(b_t[:count])
+                loss_blocks.append(np.maximum(sums_squared[:count], 0.0) / n)
+                dw, db, grad_magnitude = float(dws[count - 1]), float(dbs[count - 1]), float(gradients[count - 1])
+                if len(hits):
+                    converged = tolerance is not None and grad_magnitude < tolerance
+                    break
+        
+        def join(blocks):
+            return np.concatenate(blocks) if blocks else np.empty(0)
+        
+        return {
+            "w": join(w_blocks),
+            "b": join(b_blocks),
+            "loss": join(loss_blocks),
+            "gradient_w": float(dw),
+            "gradient_b": float(db),
+            "gradient_magnitude": float(grad_magnitude),
+            "converged": bool(converged)
+        }
+    
+    @staticmethod
+    def run_sweep(
+        stats: DatasetStats,
+        lr: np.ndarray,
+        w: np.ndarray,
+        b: np.ndarray,
+        epochs: int,
+        tolerance: float,
+        sample_epochs: np.ndarray,
+        divergence_factor: float = SWEEP_DIVERGENCE_FACTOR
+    ) -> Dict:
+        """
+        Gradient descent simplu pentru K configurații (lr, w₀, b₀) deodată.
+        Pentru MSE, un pas este liniar în (w, b): în baza proprie a hessianei H,
+        fiecare mod al distanței față de optim se înmulțește la fiecare epocă
+        cu ρ = 1 - lr·λ. Traiectoria la epoca t are deci formă închisă (ρ^t),
+        iar toate configurațiile și epocile cerute se calculează printr-un
+        singur broadcast NumPy; costul nu depinde de numărul de epoci.
+        O configurație se oprește la prima epocă cu |∇| < tolerance
+        (convergență) sau cu loss nefinit ori de divergence_factor ori peste
+        cel inițial (divergență), ca în run_gradient_descent.
+        sample_epochs: epocile (0 = inițial) la care se întoarce loss-ul.
+        Returns: dict cu w/b/loss finale, epochs_run, converged, diverged și
+        loss_curves (len(sample_epochs) × K, NaN după oprirea configurației).
+        """
+        w_opt, b_opt, loss_opt, eigenvalues, eigenvectors = MLService._eigenbasis(stats)
+        
+        # K × 2: coordonatele distanței inițiale față de optim, în baza proprie
+        z = np.column_stack([np.asarray(w, dtype=np.float64) - w_opt, np.asarray(b, dtype=np.float64) - b_opt]) @ eigenvectors
+        rho = 1 - np.asarray(lr, dtype=np.float64)[:, None] * eigenvalues
+        rho2 = rho * rho
+        # Loss - loss_opt = ½ Σ λ z² ρ^2t, |∇|² = Σ λ² z² ρ^2t
+        excess_coef = 0.5 * eigenvalues * z * z
+        gradient_coef = eigenvalues * eigenvalues * z * z
+        
+        # log ρ², mărginit: ρ = 0 face modul să dispară după o epocă fără -inf·0
+        with np.errstate(divide="ignore"):
+            rates = np.maximum(np.log(rho2), -1e4)
+        
+        def evaluate(coef: np.ndarray, t: np.ndarray) -> np.ndarray:
+            decay = np.exp(rates * t[:, None])
+            return coef[:, 0] * decay[:, 0] + coef[:, 1] * decay[:, 1]
+        
+        def minimum_epoch(coef: np.ndarray) -> np.ndarray:
+            """
+            Epoca (întreagă, în [0, epochs]) care minimizează Σ c·ρ^2t: o sumă
+            de exponențiale e convexă în t, deci minimul continuu are formă
+            închisă; se alege apoi cel mai bun dintre vecinii întregi.
+            """
+            slope = coef * rates
+            decreasing = -np.where(slope < 0, slope, 0.0).sum(axis=1)
+            increasing = np.where(slope > 0, slope, 0.0).sum(axis=1)
+            spread = np.abs(rates[:, 1] - rates[:, 0])
+            t = np.clip((np.log(decreasing) - np.log(increasing)) / spread, 0, epochs)
+            t = np.where(increasing == 0, epochs, np.where(decreasing == 0, 0, t))
+            t = np.nan_to_num(t, nan=0.0)
+            low = np.floor(t).astype(np.int64)
+            high = np.minimum(low + 1, epochs)
+            return np.where(evaluate(coef, high) < evaluate(coef, low), high, low)
+        
+        def first_epoch(condition, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+            """Căutare binară vectorială: prima epocă din [low, high] cu condiția adevărată, altfel high + 1."""
+            low, high = low.copy(), high + 1
+            while True:
+                searching = low < high
+                if not searching.any():
+                    return low
+                middle = (low + high) // 2
+                hit = condition(middle)
+                high = np.where(searching & hit, middle, high)
+                low = np.where(searching & ~hit, middle + 1, low)
+        
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            k = len(rho)
+            zero = np.zeros(k, dtype=np.int64)
+            loss_initial = loss_opt + excess_coef.sum(axis=1)
+            limit = divergence_factor * np.maximum(loss_initial, np.finfo(float).tiny) - loss_opt
+            
+            # |∇|² scade până la minimul său, deci convergența e căutată doar până acolo
+            gradient_min = minimum_epoch(gradient_coef)
+            converged_at = first_epoch(lambda t: evaluate(gradient_coef, t) < tolerance * tolerance, zero, gradient_min)
+            converged = converged_at <= gradient_min
+            # Loss-ul crește după minimul său, deci divergența e căutată doar de acolo
+            excess_min = np.maximum(minimum_epoch(excess_coef), 1)
+            diverged_at = first_epoch(
+                lambda t: ~(evaluate(excess_coef, t) <= limit), excess_min, np.full(k, epochs, dtype=np.int64)
+            )
+            diverged = ~converged & (diverged_at <= epochs)
+            epochs_run = np.where(converged, converged_at, np.where(diverged, diverged_at, epochs))
+            
+            sample_epochs = np.asarray(sample_epochs, dtype=np.int64)
+            decay = np.exp(sample_epochs[:, None, None] * rates[None])
+            curves = loss_opt + excess_coef[:, 0] * decay[:, :, 0] + excess_coef[:, 1] * decay[:, :, 1]
+            curves[sample_epochs[:, None] > epochs_run[None]] = np.nan
+            
+            params = (z * np.power(rho, epochs_run[:, None])) @ eigenvectors.T
+            final_loss = loss_opt + evaluate(excess_coef, epochs_run)
+        
+        return {
+            "w": params[:, 0] + w_opt,
+            "b": params[:, 1] + b_opt,
+            "loss": final_loss,
+            "epochs_run": epochs_run,
+            "converged": converged,
+            "diverged": diverged,
+            "loss_curves": curves
+        }
+    
+    @staticmethod
+    def sample_indices(length: int, max_samples: int) -> np.ndarray:
+        """
+        Indici distribuiți uniform pentru subeșantionarea unei traiectorii.
+        Primul și ultimul element sunt păstrați mereu.
+        """
+        if length <= max_samples:
+            return np.arange(length)
+        return np.unique(np.linspace(0, length - 1, max_samples).round().astype(int))
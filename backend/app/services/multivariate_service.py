@@ -0,0 +1,354 @@
+"""
+Service pentru regresia liniară multivariată: ŷ = X·w + b, cu X de forma (n, d)
+Predicțiile și gradienții sunt produse matrice-vector (X @ w, X.T @ r), deci
+rulează prin BLAS, pe mai multe core-uri. Ca în cazul cu o singură variabilă,
+statisticile suficiente (media, Sxx = Xcᵀ·Xc, Sxy = Xcᵀ·yc) permit epoci în
+O(d²), independent de n.
+"""
+import math
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from app.models.schemas import MAX_MULTIVARIATE_CELLS
+from app.services.dataset_service import (
+    CSV_CHUNK_ROWS, MAX_UPLOAD_BYTES, MAX_UPLOAD_ROWS, DatasetStats, _ByteLimitedReader
+)
+
+MAX_FEATURES = 1024
+# Generatorul sintetic: y = X·w + TRUE_BIAS + zgomot, cu X ~ N(0, 1)
+TRUE_BIAS = 1.0
+TRUE_WEIGHT_RANGE = 3.0
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class MultivariateStats:
+    """
+    Statistici suficiente pentru regresia multivariată cu MSE.
+    sxx este matricea (d, d) a sumelor centrate Σ(x-x̄)(x-x̄)ᵀ, sxy vectorul Σ(x-x̄)(y-ȳ).
+    """
+    n: int
+    mean_x: np.ndarray
+    mean_y: float
+    sxx: np.ndarray
+    sxy: np.ndarray
+    syy: float
+    x_min: np.ndarray
+    x_max: np.ndarray
+    y_min: float
+    y_max: float
+
+    @property
+    def num_features(self) -> int:
+        return len(self.mean_x)
+
+    def feature_stats(self, feature: int) -> DatasetStats:
+        """Statisticile perechii (x_feature, y), pentru endpoint-urile cu o singură variabilă."""
+        return DatasetStats(
+            n=self.n,
+            mean_x=float(self.mean_x[feature]),
+            mean_y=self.mean_y,
+            sxx=float(self.sxx[feature, feature]),
+            sxy=float(self.sxy[feature]),
+            syy=self.syy,
+            x_min=float(self.x_min[feature]),
+            x_max=float(self.x_max[feature]),
+            y_min=self.y_min,
+            y_max=self.y_max
+        )
+
+
+class MultivariateService:
+    """Service pentru dataset-uri (n, d) și gradient descent multivariat"""
+
+    @staticmethod
+    def load_from_csv_stream(
+        fileobj: BinaryIO,
+        target: Optional[str] = None,
+        chunk_rows: int = CSV_CHUNK_ROWS,
+        max_rows: int = MAX_UPLOAD_ROWS,
+        max_bytes: int = MAX_UPLOAD_BYTES
+    ) -> Tuple[np.ndarray, np.ndarray, List[str], MultivariateStats]:
+        """
+        Încarcă un CSV numeric pe bucăți. Ținta este coloana `target`
+        (implicit ultima), iar restul coloanelor sunt feature-uri.
+        Matricea X are cel mult MAX_MULTIVARIATE_CELLS celule (rânduri × feature-uri),
+        verificat pe măsură ce bucățile sunt citite.
+        Returns: (X, y, feature_names, stats)
+        """
+        reader = _ByteLimitedReader(fileobj, max_bytes)
+        X: Optional[np.ndarray] = None
+        y: Optional[np.ndarray] = None
+        names: List[str] = []
+        target_index = -1
+        n = 0
+        stats: Optional[MultivariateStats] = None
+
+        try:
+            for chunk in pd.read_csv(reader, dtype=np.float64, chunksize=chunk_rows):
+                if X is None:
+                    columns = [str(c) for c in chunk.columns]
+                    if len(columns) < 2:
+                        raise ValueError("CSV must have at least 2 columns")
+                    if len(columns) - 1 > MAX_FEATURES:
+                        raise ValueError(f"CSV exceeds the {MAX_FEATURES} feature limit")
+                    if target is not None:
+                        if target not in columns:
+                            raise ValueError(f"Target column not found: {target}")
+                        target_index = columns.index(target)
+                    else:
+                        target_index = len(columns) - 1
+                    names = [c for i, c in enumerate(columns) if i != target_index]
+                    cell_rows = MAX_MULTIVARIATE_CELLS // len(names)
+                    row_limit = min(max_rows, cell_rows)
+                    capacity = min(chunk_rows, row_limit)
+                    X = np.empty((capacity, len(names)))
+                    y = np.empty(capacity)
+
+                values = chunk.to_numpy(dtype=np.float64, copy=False)
+                rows = len(values)
+                if rows == 0:
+                    continue
+                if n + rows > max_rows:
+                    raise ValueError(f"CSV exceeds the {max_rows} row limit")
+                if n + rows > cell_rows:
+                    raise ValueError(
+                        f"CSV exceeds the {MAX_MULTIVARIATE_CELLS} cell limit ({cell_rows} rows with {len(names)} features)"
+                    )
+                if np.isnan(values).any():
+                    raise ValueError("Data contains missing values")
+
+                if n + rows > len(X):
+                    capacity = min(max(len(X) * 2, n + rows), row_limit)
+                    X = np.resize(X, (capacity, len(names)))
+                    y = np.resize(y, capacity)
+                y[n:n + rows] = values[:, target_index]
+                X[n:n + rows] = np.delete(values, target_index, axis=1)
+
+                chunk_stats = MultivariateService.compute_statistics(X[n:n + rows], y[n:n + rows])
+                stats = chunk_stats if stats is None else MultivariateService.merge_statistics(stats, chunk_stats)
+                n += rows
+        except pd.errors.EmptyDataError:
+            raise ValueError("CSV is empty")
+
+        if n == 0:
+            raise ValueError("CSV contains no data rows")
+
+        # Eliberează capacitatea nefolosită
+        if n < len(X):
+            X = X[:n].copy()
+            y = y[:n].copy()
+        return X, y, names, stats
+
+    @staticmethod
+    def compute_statistics(X: np.ndarray, y: np.ndarray) -> MultivariateStats:
+        """Statisticile suficiente, cu produsele centrate calculate prin BLAS (Xcᵀ·Xc)."""
+        n = len(X)
+        mean_x = X.mean(axis=0)
+        mean_y = float(y.mean())
+        dx = X - mean_x
+        dy = y - mean_y
+        return MultivariateStats(
+            n=n,
+            mean_x=mean_x,
+            mean_y=mean_y,
+            sxx=dx.T @ dx,
+            sxy=dx.T @ dy,
+            syy=float(np.dot(dy, dy)),
+            x_min=X.min(axis=0),
+            x_max=X.max(axis=0),
+            y_min=float(y.min()),
+            y_max=float(y.max())
+        )
+
+    @staticmethod
+    def merge_statistics(a: MultivariateStats, b: MultivariateStats) -> MultivariateStats:
+        """Combină statisticile a două părți disjuncte (algoritmul lui Chan, forma matriceală)."""
+        n = a.n + b.n
+        delta_x = b.mean_x - a.mean_x
+        delta_y = b.mean_y - a.mean_y
+        weight = a.n * b.n / n
+        return MultivariateStats(
+            n=n,
+            mean_x=a.mean_x + delta_x * b.n / n,
+            mean_y=a.mean_y + delta_y * b.n / n,
+            sxx=a.sxx + b.sxx + np.outer(delta_x, delta_x) * weight,
+            sxy=a.sxy + b.sxy + delta_x * delta_y * weight,
+            syy=a.syy + b.syy + delta_y * delta_y * weight,
+            x_min=np.minimum(a.x_min, b.x_min),
+            x_max=np.maximum(a.x_max, b.x_max),
+            y_min=min(a.y_min, b.y_min),
+            y_max=max(a.y_max, b.y_max)
+        )
+
+    @staticmethod
+    def generate_dataset(
+        num_points: int,
+        num_features: int,
+        noise_level: float = 1.0,
+        seed: Optional[int] = 42
+    ) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray]:
+        """
+        Dataset sintetic cu feature-uri N(0, 1) și ponderi adevărate aleatoare.
+        Returns: (X, y, feature_names, true_weights)
+        """
+        if num_points < 2:
+            raise ValueError("num_points must be at least 2")
+        if not 1 <= num_features <= MAX_FEATURES:
+            raise ValueError(f"num_features must be between 1 and {MAX_FEATURES}")
+        if num_points * num_features > MAX_MULTIVARIATE_CELLS:
+            raise ValueError(f"num_points * num_features exceeds the {MAX_MULTIVARIATE_CELLS} cell limit")
+        if noise_level < 0:
+            raise ValueError("noise_level must be non-negative")
+
+        rng = np.random.default_rng(seed)
+        true_weights = rng.uniform(-TRUE_WEIGHT_RANGE, TRUE_WEIGHT_RANGE, num_features)
+        X = rng.standard_normal((num_points, num_features))
+        y = X @ true_weights + TRUE_BIAS
+        if noise_level > 0:
+            y += rng.normal(0.0, noise_level, num_points)
+        names = [f"x{i + 1}" for i in range(num_features)]
+        return X, y, names, true_weights
+
+    @staticmethod
+    def calculate_predictions(X: np.ndarray, w: np.ndarray, b: float) -> np.ndarray:
+        """ŷ = X·w + b (gemv)."""
+        return X @ w + b
+
+    @staticmethod
+    def calculate_gradients(X: np.ndarray, y: np.ndarray, w: np.ndarray, b: float) -> Tuple[np.ndarray, float, float]:
+        """
+        Gradienții MSE pe date, cu un singur gemv pentru predicții și unul pentru Xᵀ·r.
+        Returns: (dw, db, loss)
+        """
+        n = len(X)
+        residuals = y - X @ w
+        residuals -= b
+        dw = -(2/n) * (X.T @ residuals)
+        db = -(2/n) * float(residuals.sum())
+        loss = float(np.dot(residuals, residuals)) / n
+        return dw, db, loss
+
+    @staticmethod
+    def calculate_gradients_from_stats(stats: MultivariateStats, w: np.ndarray, b: float) -> Tuple[np.ndarray, float, float]:
+        """
+        Gradienții și loss-ul în O(d²) din statisticile suficiente.
+        Returns: (dw, db, loss)
+        """
+        n = stats.n
+        mean_error = stats.mean_y - float(np.dot(stats.mean_x, w)) - b
+        sxx_w = stats.sxx @ w
+        # Xᵀ·r = (Sxy - Sxx·w) + n·x̄·ē
+        dw = -(2/n) * ((stats.sxy - sxx_w) + n * mean_error * stats.mean_x)
+        db = -2 * mean_error
+        centered = stats.syy - 2 * float(np.dot(w, stats.sxy)) + float(np.dot(w, sxx_w))
+        loss = max(centered, 0.0) / n + mean_error * mean_error
+        return dw, db, loss
+
+    @staticmethod
+    def feature_contributions(stats: MultivariateStats, w: np.ndarray, dw: np.ndarray, delta_w: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Contribuția fiecărui feature:
+            importance        |w_j|·σ_j - cât variază predicția din cauza feature-ului j
+            loss_contribution dw_j·Δw_j - schimbarea de ordinul 1 a loss-ului dată de pasul pe w_j
+        """
+        std = np.sqrt(np.maximum(np.diag(stats.sxx), 0.0) / stats.n)
+        return {
+            "importance": np.abs(w) * std,
+            "loss_contribution": dw * delta_w
+        }
+
+    @staticmethod
+    def step(
+        X: np.ndarray,
+        y: np.ndarray,
+        stats: MultivariateStats,
+        w: np.ndarray,
+        b: float,
+        lr: float
+    ) -> Dict:
+        """Un pas de gradient descent pe date (BLAS), cu contribuțiile per feature."""
+        dw, db, loss_before = MultivariateService.calculate_gradients(X, y, w, b)
+        delta_w = -lr * dw
+        delta_b = -lr * db
+        w_new = w + delta_w
+        b_new = b + delta_b
+        _, _, loss_after = MultivariateService.calculate_gradients_from_stats(stats, w_new, b_new)
+        contributions = MultivariateService.feature_contributions(stats, w_new, dw, delta_w)
+        return {
+            "dw": dw,
+            "db": db,
+            "gradient_magnitude": math.sqrt(float(np.dot(dw, dw)) + db * db),
+            "w_new": w_new,
+            "b_new": b_new,
+            "delta_w": delta_w,
+            "delta_b": delta_b,
+            "loss_before": loss_before,
+            "loss_after": loss_after,
+            **contributions
+        }
+
+    @staticmethod
+    def run_gradient_descent(
+        stats: MultivariateStats,
+        w: np.ndarray,
+        b: float,
+        lr: float,
+        epochs: int,
+        tolerance: Optional[float] = None,
+        feature: int = 0
+    ) -> Dict:
+        """
+        Mai multe epoci de gradient descent, fiecare în O(d²).
+        Traiectoria păstrează loss-ul, b și ponderea feature-ului proiectat
+        (traiectoria completă ar ocupa epochs × d).
+        """
+        w = np.array(w, dtype=np.float64)
+        w_hist = np.empty(epochs)
+        b_hist = np.empty(epochs)
+        loss_hist = np.empty(epochs)
+
+        dw, db, _ = MultivariateService.calculate_gradients_from_stats(stats, w, b)
+        grad_magnitude = math.sqrt(float(np.dot(dw, dw)) + db * db)
+        converged = tolerance is not None and grad_magnitude < tolerance
+
+        epochs_run = 0
+        while epochs_run < epochs and not converged:
+            w -= lr * dw
+            b = b - lr * db
+            dw, db, loss = MultivariateService.calculate_gradients_from_stats(stats, w, b)
+            grad_magnitude = math.sqrt(float(np.dot(dw, dw)) + db * db)
+
+            w_hist[epochs_run] = w[feature]
+            b_hist[epochs_run] = b
+            loss_hist[epochs_run] = loss
+            epochs_run += 1
+
+            if tolerance is not None and grad_magnitude < tolerance:
+                converged = True
+            elif not math.isfinite(grad_magnitude):
+                break
+
+        return {
+            "w": w,
+            "b": b,
+            "w_projected": w_hist[:epochs_run],
+            "b_history": b_hist[:epochs_run],
+            "loss": loss_hist[:epochs_run],
+            "gradient_w": dw,
+            "gradient_b": float(db),
+            "gradient_magnitude": float(grad_magnitude),
+            "converged": bool(converged)
+        }
+
+    @staticmethod
+    def projection(stats: MultivariateStats, w: np.ndarray, b: float, feature: int) -> Tuple[float, float]:
+        """
+        Dreapta y = w_j·x_j + b_j desenată pentru feature-ul j: celelalte
+        feature-uri sunt fixate la media lor, deci b_j = b + Σ_{k≠j} w_k·x̄_k.
+        Returns: (w_j, b_j)
+        """
+        w_j = float(w[feature])
+        b_j = b + float(np.dot(w, stats.mean_x)) - w_j * float(stats.mean_x[feature])
+        return w_j, b_j
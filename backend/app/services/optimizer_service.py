@@ -0,0 +1,120 @@
+"""
+Service pentru optimizatori
+Starea optimizatorului (viteză, momente, contor de pași) e ținută în
+OptimizerState, care face parte din starea sesiunii de training:
+    sgd          - gradient descent simplu: θ ← θ - lr·g
+    momentum     - heavy ball: v ← μ·v + g, θ ← θ - lr·v
+    nesterov     - momentum Nesterov (forma cu gradientul în punctul curent)
+    adam         - momente adaptive, invariant la scalarea fiecărui parametru
+    line_search  - pas exact de-a lungul lui -g pentru MSE (ignoră lr)
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from app.services.dataset_service import DatasetStats
+
+OPTIMIZERS = ("sgd", "momentum", "nesterov", "adam", "line_search")
+
+DEFAULT_MOMENTUM = 0.9
+DEFAULT_BETA1 = 0.9
+DEFAULT_BETA2 = 0.999
+DEFAULT_EPSILON = 1e-8
+
+
+@dataclass(slots=True)
+class OptimizerState:
+    name: str = "sgd"
+    momentum: float = DEFAULT_MOMENTUM
+    beta1: float = DEFAULT_BETA1
+    beta2: float = DEFAULT_BETA2
+    epsilon: float = DEFAULT_EPSILON
+    step: int = 0
+    velocity_w: float = 0.0  # momentum / nesterov
+    velocity_b: float = 0.0
+    m_w: float = 0.0  # adam: primul moment
+    m_b: float = 0.0
+    v_w: float = 0.0  # adam: al doilea moment
+    v_b: float = 0.0
+
+    def reset(self) -> None:
+        """Șterge starea acumulată, păstrând configurația."""
+        self.step = 0
+        self.velocity_w = self.velocity_b = 0.0
+        self.m_w = self.m_b = 0.0
+        self.v_w = self.v_b = 0.0
+
+
+class OptimizerService:
+    """Service pentru pașii optimizatorilor"""
+
+    @staticmethod
+    def validate(name: str) -> None:
+        if name not in OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer: {name}")
+
+    @staticmethod
+    def step(
+        state: OptimizerState,
+        w: float,
+        b: float,
+        dw: float,
+        db: float,
+        lr: float,
+        stats: Optional[DatasetStats] = None
+    ) -> Tuple[float, float, float, float]:
+        """
+        Aplică un pas al optimizatorului și îi actualizează starea.
+        Returns: (w_new, b_new, delta_w, delta_b)
+        """
+        state.step += 1
+        name = state.name
+
+        if name == "momentum":
+            state.velocity_w = state.momentum * state.velocity_w + dw
+            state.velocity_b = state.momentum * state.velocity_b + db
+            delta_w = -lr * state.velocity_w
+            delta_b = -lr * state.velocity_b
+        elif name == "nesterov":
+            state.velocity_w = state.momentum * state.velocity_w + dw
+            state.velocity_b = state.momentum * state.velocity_b + db
+            delta_w = -lr * (dw + state.momentum * state.velocity_w)
+            delta_b = -lr * (db + state.momentum * state.velocity_b)
+        elif name == "adam":
+            beta1, beta2 = state.beta1, state.beta2
+            state.m_w = beta1 * state.m_w + (1 - beta1) * dw
+            state.m_b = beta1 * state.m_b + (1 - beta1) * db
+            state.v_w = beta2 * state.v_w + (1 - beta2) * dw * dw
+            state.v_b = beta2 * state.v_b + (1 - beta2) * db * db
+            # Corecția de bias pentru momentele inițializate cu 0
+            correction1 = 1 - beta1 ** state.step
+            correction2 = 1 - beta2 ** state.step
+            delta_w = -lr * (state.m_w / correction1) / (math.sqrt(state.v_w / correction2) + state.epsilon)
+            delta_b = -lr * (state.m_b / correction1) / (math.sqrt(state.v_b / correction2) + state.epsilon)
+        elif name == "line_search":
+            if stats is None:
+                raise ValueError("line_search needs dataset statistics")
+            alpha = OptimizerService.exact_step_length(stats, dw, db)
+            delta_w = -alpha * dw
+            delta_b = -alpha * db
+        else:
+            delta_w = -lr * dw
+            delta_b = -lr * db
+
+        return w + delta_w, b + delta_b, delta_w, delta_b
+
+    @staticmethod
+    def exact_step_length(stats: DatasetStats, dw: float, db: float) -> float:
+        """
+        Lungimea pasului care minimizează MSE de-a lungul lui -g.
+        MSE e pătratic, cu Hessiana H = (2/n)·[[Σx², Σx], [Σx, n]], deci
+        α* = gᵀg / gᵀHg.
+        """
+        n = stats.n
+        g_dot_g = dw * dw + db * db
+        # Σx² = Sxx + n·x̄², scris cu x̄ ca să evite anularea numerică
+        mean_part = dw * stats.mean_x + db
+        g_h_g = (2 / n) * (dw * dw * stats.sxx + n * mean_part * mean_part)
+        if g_dot_g == 0.0 or not g_h_g > 0.0:
+            return 0.0
+        return g_dot_g / g_h_g
@@ -0,0 +1,149 @@
+"""
+Service pentru calcul paralel pe shard-uri
+Peste un prag de dimensiune, x/y sunt împărțite în shard-uri contigue
+(view-uri, fără copii), iar sumele parțiale (Σr, Σx·r, Σr²) sunt calculate
+în paralel de un pool persistent de thread-uri și reduse în request.
+NumPy eliberează GIL-ul în ufunc-uri și în dot (BLAS), deci thread-urile
+rulează pe core-uri diferite; datele memory-mapped din cache sunt partajate
+prin page cache, fără copii per worker.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from app.services.dataset_service import DatasetService, DatasetStats
+
+# Sub acest număr de puncte, overhead-ul thread-urilor depășește câștigul
+SHARD_THRESHOLD_POINTS = 2_000_000
+MIN_SHARD_POINTS = 500_000
+# Blocurile din interiorul unui shard încap în cache și evită temporare de lungime n
+BLOCK_POINTS = 65_536
+
+T = TypeVar("T")
+
+
+class ShardPool:
+    """Pool persistent de thread-uri pentru reduceri pe shard-uri."""
+
+    def __init__(self, workers: Optional[int] = None, threshold: int = SHARD_THRESHOLD_POINTS):
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, workers: Optional[int] = None, threshold: Optional[int] = None) -> None:
+        """Schimbă numărul de workeri și/sau pragul; pool-ul e recreat la nevoie."""
+        with self._lock:
+            if workers is not None and workers != self.workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+                self.workers = max(workers, 1)
+            if threshold is not None:
+                self.threshold = threshold
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def shards(self, n: int) -> List[Tuple[int, int]]:
+        """Intervalele [start, stop) ale shard-urilor pentru n puncte."""
+        if n < self.threshold or self.workers == 1:
+            return [(0, n)]
+        count = max(min(self.workers, n // MIN_SHARD_POINTS), 1)
+        bounds = np.linspace(0, n, count + 1).astype(np.int64)
+        return [(int(bounds[i]), int(bounds[i + 1])) for i in range(count)]
+
+    def map(self, fn: Callable[[int, int], T], n: int) -> List[T]:
+        """Aplică fn(start, stop) pe fiecare shard; rezultatele sunt în ordinea shard-urilor."""
+        shards = self.shards(n)
+        if len(shards) == 1:
+            return [fn(0, n)]
+        executor = self._get_executor()
+        futures = [executor.submit(fn, start, stop) for start, stop in shards]
+        return [future.result() for future in futures]
+
+    def residual_sums(self, x: np.ndarray, y: np.ndarray, w: float, b: float) -> Tuple[float, float, float]:
+        """
+        Σr, Σx·r și Σr² pentru r = y - (w·x + b), direct din date.
+        Returns: (sum_errors, sum_x_errors, sum_squared_errors)
+        """
+        def shard(start: int, stop: int) -> Tuple[float, float, float]:
+            buffer = np.empty(min(BLOCK_POINTS, stop - start))
+            sums = [0.0, 0.0, 0.0]
+            for lo in range(start, stop, BLOCK_POINTS):
+                hi = min(lo + BLOCK_POINTS, stop)
+                r = buffer[:hi - lo]
+                np.multiply(x[lo:hi], w, out=r)
+                r += b
+                np.subtract(y[lo:hi], r, out=r)
+                _accumulate(sums, x[lo:hi], r)
+            return tuple(sums)
+
+        return _reduce(self.map(shard, len(x)))
+
+    def prediction_sums(self, x: np.ndarray, y: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float]:
+        """
+        Aceleași sume pentru r = y - y_pred, cu predicțiile deja calculate.
+        Returns: (sum_errors, sum_x_errors, sum_squared_errors)
+        """
+        def shard(start: int, stop: int) -> Tuple[float, float, float]:
+            buffer = np.empty(min(BLOCK_POINTS, stop - start))
+            sums = [0.0, 0.0, 0.0]
+            for lo in range(start, stop, BLOCK_POINTS):
+                hi = min(lo + BLOCK_POINTS, stop)
+                r = buffer[:hi - lo]
+                np.subtract(y[lo:hi], y_pred[lo:hi], out=r)
+                _accumulate(sums, x[lo:hi], r)
+            return tuple(sums)
+
+        return _reduce(self.map(shard, len(y)))
+
+    def squared_error_sum(self, y_true: np.ndarray, y_pred: np.ndarray) -> float:
+        """Σ(y - ŷ)² pe shard-uri."""
+        def shard(start: int, stop: int) -> float:
+            buffer = np.empty(min(BLOCK_POINTS, stop - start))
+            total = 0.0
+            for lo in range(start, stop, BLOCK_POINTS):
+                hi = min(lo + BLOCK_POINTS, stop)
+                r = buffer[:hi - lo]
+                np.subtract(y_true[lo:hi], y_pred[lo:hi], out=r)
+                total += float(np.dot(r, r))
+            return total
+
+        return sum(self.map(shard, len(y_true)))
+
+    def compute_statistics(self, x: np.ndarray, y: np.ndarray) -> DatasetStats:
+        """Statisticile suficiente pe shard-uri, combinate cu algoritmul lui Chan."""
+        parts = self.map(lambda start, stop: DatasetService.compute_statistics(x[start:stop], y[start:stop]), len(x))
+        stats = parts[0]
+        for part in parts[1:]:
+            stats = DatasetService.merge_statistics(stats, part)
+        return stats
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard")
+            return self._executor
+
+
+def _accumulate(sums: list, x: np.ndarray, r: np.ndarray) -> None:
+    sums[0] += float(r.sum())
+    sums[1] += float(np.dot(x, r))
+    sums[2] += float(np.dot(r, r))
+
+
+def _reduce(parts: List[Tuple[float, float, float]]) -> Tuple[float, float, float]:
+    sum_errors = sum(part[0] for part in parts)
+    sum_x_errors = sum(part[1] for part in parts)
+    sum_squared_errors = sum(part[2] for part in parts)
+    return sum_errors, sum_x_errors, sum_squared_errors
+
+
+shard_pool = ShardPool()
@@ -0,0 +1,329 @@
+"""
+Service pentru stocarea stării de training per sesiune
+Fiecare sesiune (tab de browser, student, client de load-test) are propriul
+dataset, model, istoric și cursor point-by-point.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.services.dataset_service import DatasetStats
+from app.services.history_service import TrainingHistory
+from app.services.multivariate_service import MultivariateStats
+from app.services.ml_service import StepBuffers
+from app.services.optimizer_service import OptimizerState
+from app.services.parallel_service import shard_pool
+
+
+DEFAULT_W = 1.0
+DEFAULT_B = 1.0
+DEFAULT_LR = 0.01
+
+
+@dataclass(slots=True)
+class DataState:
+    x: Optional[np.ndarray] = None
+    y: Optional[np.ndarray] = None
+    stats: Optional[DatasetStats] = None
+    buffers: Optional[StepBuffers] = None
+    key: Optional[str] = None  # hash-ul conținutului, calculat la primul checkpoint
+
+    def step_buffers(self) -> StepBuffers:
+        """Bufferele pentru fused_step, alocate la prima folosire."""
+        if self.buffers is None:
+            self.buffers = StepBuffers(len(self.x))
+        return self.buffers
+
+
+@dataclass(slots=True)
+class ModelState:
+    w: float = DEFAULT_W
+    b: float = DEFAULT_B
+
+
+@dataclass(slots=True)
+class ConfigState:
+    lr: float = DEFAULT_LR
+    current_epoch: int = 0
+
+
+@dataclass(slots=True)
+class PointByPointState:
+    active: bool = False
+    current_index: int = 0
+    accumulated_dw: float = 0.0
+    accumulated_db: float = 0.0
+
+    def reset(self) -> None:
+        self.active = False
+        self.current_index = 0
+        self.accumulated_dw = 0.0
+        self.accumulated_db = 0.0
+
+
+@dataclass(slots=True)
+class MiniBatchState:
+    active: bool = False
+    cursor: int = 0  # poziția în permutarea epocii curente
+    seed: Optional[int] = None
+    rng: Optional[np.random.Generator] = None
+    order: Optional[np.ndarray] = None  # permutarea punctelor pentru epoca curentă
+
+    def reset(self) -> None:
+        self.active = False
+        self.cursor = 0
+        self.seed = None
+        self.rng = None
+        self.order = None
+
+
+@dataclass(slots=True)
+class MultivariateState:
+    """Dataset (n, d) și modelul multivariat; endpoint-urile 1D văd proiecția pe `feature`."""
+    X: Optional[np.ndarray] = None
+    y: Optional[np.ndarray] = None
+    feature_names: List[str] = field(default_factory=list)
+    stats: Optional[MultivariateStats] = None
+    weights: Optional[np.ndarray] = None
+    bias: float = DEFAULT_B
+    feature: int = 0
+    current_epoch: int = 0
+    # Coloana w din istoric este ponderea feature-ului proiectat
+    history: TrainingHistory = field(default_factory=TrainingHistory)
+    key: Optional[str] = None  # hash-ul conținutului, calculat la primul checkpoint
+
+    @property
+    def loaded(self) -> bool:
+        return self.X is not None
+
+    def load(self, X: np.ndarray, y: np.ndarray, feature_names: List[str], stats: MultivariateStats) -> None:
+        self.X = X
+        self.y = y
+        self.feature_names = feature_names
+        self.stats = stats
+        self.feature = 0
+        self.key = None
+        self.reset_model()
+
+    def reset_model(self) -> None:
+        self.weights = np.full(len(self.feature_names), DEFAULT_W) if self.X is not None else None
+        self.bias = DEFAULT_B
+        self.current_epoch = 0
+        self.history.clear()
+
+    def clear(self) -> None:
+        self.X = None
+        self.y = None
+        self.feature_names = []
+        self.stats = None
+        self.key = None
+        self.reset_model()
+
+
+@dataclass(slots=True)
+class TrainingState:
+    """Starea completă a unei sesiuni de training."""
+    data: DataState = field(default_factory=DataState)
+    model: ModelState = field(default_factory=ModelState)
+    history: TrainingHistory = field(default_factory=TrainingHistory)
+    config: ConfigState = field(default_factory=ConfigState)
+    point_by_point: PointByPointState = field(default_factory=PointByPointState)
+    minibatch: MiniBatchState = field(default_factory=MiniBatchState)
+    optimizer: OptimizerState = field(default_factory=OptimizerState)
+    multivariate: MultivariateState = field(default_factory=MultivariateState)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+    last_access: float = field(default_factory=time.monotonic, compare=False)
+    # Incrementat (sub lock) la fiecare modificare; amprenta folosită de checkpoint-uri
+    revision: int = field(default=0, compare=False)
+
+    def load_dataset(self, x: np.ndarray, y: np.ndarray, stats: Optional[DatasetStats] = None) -> None:
+        """Încarcă date noi (cu statisticile lor suficiente) și resetează modelul."""
+        self.multivariate.clear()
+        self._load_single(x, y, stats)
+
+    def load_multivariate(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        feature_names: List[str],
+        stats: MultivariateStats,
+        feature: int = 0
+    ) -> None:
+        """Încarcă un dataset (n, d); endpoint-urile 1D primesc proiecția pe `feature`."""
+        self.multivariate.load(X, y, feature_names, stats)
+        self.select_feature(feature)
+
+    def select_feature(self, feature: int) -> None:
+        """Schimbă feature-ul proiectat pentru endpoint-urile 1D (resetează modelul 1D)."""
+        multivariate = self.multivariate
+        if not 0 <= feature < len(multivariate.feature_names):
+            raise ValueError(f"feature must be between 0 and {len(multivariate.feature_names) - 1}")
+        multivariate.feature = feature
+        x = np.ascontiguousarray(multivariate.X[:, feature])
+        self._load_single(x, multivariate.y, multivariate.stats.feature_stats(feature))
+
+    def _load_single(self, x: np.ndarray, y: np.ndarray, stats: Optional[DatasetStats]) -> None:
+        self.data.x = x
+        self.data.y = y
+        self.data.stats = stats if stats is not None else shard_pool.compute_statistics(x, y)
+        self.data.buffers = None
+        self.data.key = None
+        self.reset_model()
+
+    def reset_model(self) -> None:
+        """Resetează modelul, istoricul și modul pas cu pas; păstrează datele."""
+        self.model.w = DEFAULT_W
+        self.model.b = DEFAULT_B
+        self.history.clear()
+        self.config.current_epoch = 0
+        self.point_by_point.reset()
+        self.minibatch.reset()
+        self.optimizer.reset()
+
+    def reset_all(self) -> None:
+        """Resetează complet sesiunea (date, model, learning rate)."""
+        self.data.x = None
+        self.data.y = None
+        self.data.stats = None
+        self.data.buffers = None
+        self.data.key = None
+        self.multivariate.clear()
+        self.reset_model()
+        self.config.lr = DEFAULT_LR
+        self.optimizer = OptimizerState()
+
+    def nbytes(self) -> int:
+        """Estimare a memoriei ocupate de sesiune (date + istoric)."""
+        total = 0
+        # Array-urile memory-mapped din cache sunt partajate prin page cache, nu per sesiune
+        if self.data.x is not None and not isinstance(self.data.x, np.memmap):
+            total += self.data.x.nbytes + self.data.y.nbytes
+        if self.data.buffers is not None:
+            total += self.data.buffers.nbytes
+        if self.minibatch.order is not None:
+            total += self.minibatch.order.nbytes
+        multivariate = self.multivariate
+        if multivariate.X is not None and not isinstance(multivariate.X, np.memmap):
+            # y este partajat cu proiecția 1D, deja numărat mai sus
+            total += multivariate.X.nbytes + multivariate.stats.sxx.nbytes
+        total += self.history.nbytes + multivariate.history.nbytes
+        return total
+
+
+class SessionStore:
+    """
+    Store thread-safe de sesiuni cu evicție LRU, TTL și plafon de memorie.
+    OrderedDict-ul este ținut în ordinea accesului, deci sesiunile expirate
+    sau cele mai vechi sunt mereu la început.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 500,
+        ttl_seconds: float = 3600.0,
+        max_memory_bytes: int = 1024 ** 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self._clock = clock
+        self._sessions: "OrderedDict[str, TrainingState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> TrainingState:
+        """Returnează starea sesiunii, creând-o dacă nu există."""
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = TrainingState()
+                self._sessions[session_id] = state
+            else:
+                self._sessions.move_to_end(session_id)
+            state.last_access = now
+            self._enforce_limits(keep=session_id)
+            return state
+
+    def put_many(self, items: List[tuple]) -> None:
+        """
+        Inserează stări existente (ex. restaurate din checkpoint), de la cea mai
+        veche la cea mai recentă, păstrându-le last_access; limitele sunt
+        aplicate o singură dată, la final.
+        """
+        if not items:
+            return
+        with self._lock:
+            for session_id, state in items:
+                self._sessions[session_id] = state
+                self._sessions.move_to_end(session_id)
+            self._enforce_limits(keep=items[-1][0])
+
+    def peek(self, session_id: str) -> Optional[TrainingState]:
+        """Returnează starea fără a o crea și fără a actualiza ordinea LRU."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def touch(self, session_id: str, state: TrainingState) -> bool:
+        """
+        Marchează sesiunea ca folosită, dacă încă ține exact această stare.
+        Returnează False dacă sesiunea a fost evacuată (sau înlocuită) între timp.
+        """
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+            if self._sessions.get(session_id) is not state:
+                return False
+            self._sessions.move_to_end(session_id)
+            state.last_access = now
+            return True
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def items(self) -> List[tuple]:
+        """Snapshot (session_id, state) pentru iterare în afara lock-ului."""
+        with self._lock:
+            return list(self._sessions.items())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def memory_usage(self) -> int:
+        with self._lock:
+            return sum(state.nbytes() for state in self._sessions.values())
+
+    def _evict_expired(self, now: float) -> None:
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if now - state.last_access <= self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+
+    def _enforce_limits(self, keep: str) -> None:
+        while len(self._sessions) > self.max_sessions:
+            if not self._pop_oldest(keep):
+                break
+
+        total = sum(state.nbytes() for state in self._sessions.values())
+        while total > self.max_memory_bytes:
+            evicted = self._pop_oldest(keep)
+            if evicted is None:
+                break
+            total -= evicted.nbytes()
+
+    def _pop_oldest(self, keep: str) -> Optional[TrainingState]:
+        for session_id in self._sessions:
+            if session_id != keep:
+                return self._sessions.pop(session_id)
+        return None
@@ -0,0 +1,24 @@
+"""
+Service pentru interogări asupra epocilor trecute (time-travel)
+Istoricul păstrează doar (loss, w, b) per epocă; vederea completă a unei
+epoci (predicții, erori, contribuții) este recalculată la cerere din dataset
+și din (w, b)-ul epocii. Răspunsurile serializate sunt ținute într-un LRU
+mărginit în bytes, deci parcurgerea repetată a acelorași epoci (scrubbing)
+nu mai reface nici calculul, nici serializarea.
+"""
+from typing import FrozenSet, Optional
+
+import numpy as np
+
+from app.services.cache_service import ResponseCache
+
+
+class EpochStateCache(ResponseCache):
+    """Cache-ul vederilor serializate ale epocilor, pe (dataset, epocă, w, b, câmpuri)."""
+
+    @staticmethod
+    def key(x: np.ndarray, epoch: int, w: float, b: float, fields: Optional[FrozenSet[str]]) -> tuple:
+        return (id(x), epoch, w, b, fields)
+
+
+epoch_state_cache = EpochStateCache()
@@ -0,0 +1,112 @@
+"""
+Service pentru datele de vizualizare ale dataset-urilor mari
+Browser-ul nu poate desena (și nici descărca rezonabil) milioane de puncte,
+deci scatter-ul primește fie un subeșantion reprezentativ, fie o grilă de
+densitate la rezoluția în pixeli a graficului.
+Subeșantionul este stratificat pe o grilă (x, y), deci zonele rare rămân
+vizibile, și păstrează mereu punctele extreme și reziduurile cele mai mari
+față de dreapta OLS (outlier-ii sunt exact punctele interesante în regresie).
+"""
+from typing import Tuple
+
+import numpy as np
+
+from app.services.dataset_service import DatasetStats
+
+SAMPLE_GRID = 32  # celule pe axă pentru stratificare
+OUTLIER_FRACTION = 0.05  # partea din buget rezervată reziduurilor mari
+SAMPLE_SEED = 0  # eșantionul e determinist, deci poate fi pus în cache
+DEFAULT_SAMPLE_POINTS = 5_000
+MAX_SAMPLE_POINTS = 200_000
+DEFAULT_DENSITY_SIZE = 256
+MAX_DENSITY_SIZE = 1024
+CHUNK_SIZE = 1 << 20
+
+Window = Tuple[float, float, float, float]
+
+
+def _padded(low: float, high: float) -> Tuple[float, float]:
+    """Un interval degenerat (toate valorile egale) devine [v - 0.5, v + 0.5]."""
+    if high > low:
+        return low, high
+    return low - 0.5, high + 0.5
+
+
+def _bins(values: np.ndarray, low: float, high: float, count: int) -> np.ndarray:
+    """Indexul bin-ului pentru fiecare valoare; marginea dreaptă intră în ultimul bin."""
+    scaled = (values - low) * (count / (high - low))
+    return np.clip(scaled, 0, count - 1).astype(np.intp)
+
+
+class VisualizationService:
+    """Subeșantionare stratificată și grile de densitate pentru scatter."""
+
+    @staticmethod
+    def default_window(stats: DatasetStats) -> Window:
+        return (*_padded(stats.x_min, stats.x_max), *_padded(stats.y_min, stats.y_max))
+
+    @staticmethod
+    def sample(x: np.ndarray, y: np.ndarray, stats: DatasetStats, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (indici, outlieri): cel mult max_points indici, în ordinea din dataset,
+        și indicii reziduurilor mari păstrați obligatoriu. Un dataset care
+        încape în buget este returnat integral, deci indicii coincid cu cei
+        folosiți de endpoint-urile de training.
+        """
+        n = len(x)
+        if n <= max_points:
+            return np.arange(n), np.empty(0, dtype=np.intp)
+
+        # Punctele extreme pe fiecare axă: scatter-ul are aceleași limite ca dataset-ul
+        extremes = np.array([np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)])
+
+        # Reziduurile față de dreapta OLS, calculată din statisticile suficiente
+        slope = stats.sxy / stats.sxx if stats.sxx > 0 else 0.0
+        intercept = stats.mean_y - slope * stats.mean_x
+        residuals = np.abs(y - (intercept + slope * x))
+        num_outliers = max(1, int(max_points * OUTLIER_FRACTION))
+        outliers = np.argpartition(residuals, n - num_outliers)[n - num_outliers:]
+        outliers = outliers[residuals[outliers] > 0]
+        forced = np.union1d(extremes, outliers)
+
+        # Stratificare: fiecare celulă nevidă primește un punct, restul bugetului
+        # se împarte proporțional cu numărul de puncte din celulă
+        x_low, x_high, y_low, y_high = VisualizationService.default_window(stats)
+        cells = _bins(x, x_low, x_high, SAMPLE_GRID) * SAMPLE_GRID + _bins(y, y_low, y_high, SAMPLE_GRID)
+        counts = np.bincount(cells, minlength=SAMPLE_GRID * SAMPLE_GRID)
+        budget = max_points - len(forced)
+        nonempty = np.count_nonzero(counts)
+        if budget >= nonempty:
+            quota = np.where(counts > 0, 1 + (counts * (budget - nonempty)) // n, 0)
+        else:
+            quota = (counts * budget) // n
+        quota = np.minimum(quota, counts)
+
+        # În fiecare celulă se aleg punctele cu cele mai mici priorități aleatoare
+        priority = np.random.default_rng(SAMPLE_SEED).random(n)
+        order = np.lexsort((priority, cells))
+        sorted_cells = cells[order]
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(n) - starts[sorted_cells]
+        stratified = order[rank < quota[sorted_cells]]
+
+        return np.union1d(stratified, forced), np.sort(outliers)
+
+    @staticmethod
+    def density(x: np.ndarray, y: np.ndarray, window: Window, width: int, height: int) -> np.ndarray:
+        """
+        Numărul de puncte pe pixel în fereastra dată, ca grilă height × width
+        (rândul 0 corespunde lui y_min). Dataset-ul e parcurs pe bucăți, deci
+        array-urile memory-mapped nu sunt copiate integral în memorie.
+        """
+        x_low, x_high, y_low, y_high = window
+        counts = np.zeros(width * height, dtype=np.int64)
+        for start in range(0, len(x), CHUNK_SIZE):
+            xs = np.asarray(x[start:start + CHUNK_SIZE])
+            ys = np.asarray(y[start:start + CHUNK_SIZE])
+            inside = (xs >= x_low) & (xs <= x_high) & (ys >= y_low) & (ys <= y_high)
+            if not inside.all():
+                xs, ys = xs[inside], ys[inside]
+            pixels = _bins(ys, y_low, y_high, height) * width + _bins(xs, x_low, x_high, width)
+            counts += np.bincount(pixels, minlength=width * height)
+        return counts.reshape(height, width)
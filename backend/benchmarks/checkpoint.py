@@ -0,0 +1,83 @@
+"""
+Benchmark pentru checkpoint-ul și restaurarea sesiunilor.
+
+Rulare (din directorul backend):
+    python -m benchmarks.checkpoint [--sessions 2000] [--datasets 10]
+                                    [--points 1000000] [--epochs 1000]
+
+Creează --sessions sesiuni care împart --datasets dataset-uri, fiecare cu un
+istoric de --epochs epoci, apoi măsoară checkpoint-ul complet, un checkpoint
+fără modificări și restaurarea într-un SessionStore nou (ca la pornirea
+după un deploy). Restaurarea mapează dataset-urile, deci nu depinde de --points.
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.checkpoint_service import CheckpointStore
+from app.services.ml_service import MLService
+from app.services.session_service import SessionStore, TrainingState
+
+
+def build_store(sessions: int, datasets: int, points: int, epochs: int) -> SessionStore:
+    rng = np.random.default_rng(0)
+    store = SessionStore(max_sessions=sessions, max_memory_bytes=1 << 62)
+    shared = []
+    for _ in range(datasets):
+        x = rng.uniform(0, 10, points)
+        y = 2 * x + 1 + rng.normal(0, 2, points)
+        template = TrainingState()
+        template.load_dataset(x, y)
+        shared.append((x, y, template.data.stats))
+
+    for i in range(sessions):
+        state = TrainingState()
+        state.load_dataset(*shared[i % datasets])
+        result = MLService.run_gradient_descent(state.data.stats, 1.0, 1.0, 0.01, epochs)
+        state.history.extend(result["loss"], result["w"], result["b"])
+        state.model.w, state.model.b = float(result["w"][-1]), float(result["b"][-1])
+        state.config.current_epoch = epochs
+        store.put_many([(f"session-{i}", state)])
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--datasets", type=int, default=10)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--epochs", type=int, default=1000)
+    args = parser.parse_args()
+
+    store = build_store(args.sessions, args.datasets, args.points, args.epochs)
+    directory = tempfile.mkdtemp(prefix="checkpoint-bench-")
+    try:
+        checkpoints = CheckpointStore(directory)
+        start = time.perf_counter()
+        asyncio.run(checkpoints.checkpoint(store))
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(checkpoints.checkpoint(store))
+        unchanged = time.perf_counter() - start
+
+        restored_store = SessionStore(max_sessions=args.sessions, max_memory_bytes=1 << 62)
+        start = time.perf_counter()
+        restored = CheckpointStore(directory).restore(restored_store)
+        restore = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"sessions={args.sessions:,}  datasets={args.datasets}  points={args.points:,}  epochs={args.epochs:,}")
+    print(f"{'operation':<28}{'total [s]':>12}{'per session [ms]':>18}")
+    for name, seconds in (("checkpoint (first)", first), ("checkpoint (unchanged)", unchanged), ("restore", restore)):
+        print(f"{name:<28}{seconds:>12.3f}{seconds / args.sessions * 1000:>18.3f}")
+    print(f"restored {restored:,} sessions")
+
+
+if __name__ == "__main__":
+    main()
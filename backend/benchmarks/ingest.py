@@ -0,0 +1,116 @@
+"""
+Benchmark pentru ingestia dataset-urilor: CSV (pandas, calea existentă)
+comparat cu formatele binare pe coloane.
+
+Rulare (din directorul backend):
+    python -m benchmarks.ingest [--points 5000000] [--repeat 3]
+                                [--formats csv,npy,npz,arrow,parquet]
+
+Fiecare format este scris o singură dată într-un director temporar, apoi
+citit de --repeat ori din fișierul deschis (ca fișierul spooled al unui
+upload); se raportează cel mai bun timp. Măsurătoarea acoperă parsarea și
+statisticile suficiente, nu și hash-ul sau scrierea în cache-ul de
+dataset-uri, care sunt identice pentru toate formatele.
+Formatele Arrow/Parquet sunt sărite dacă pyarrow nu este instalat.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services import columnar_service
+from app.services.columnar_service import ColumnarService
+from app.services.dataset_service import DatasetService
+
+
+def _write_files(directory: str, x: np.ndarray, y: np.ndarray) -> dict:
+    """nume -> (cale, format); format None înseamnă CSV."""
+    files = {}
+    path = os.path.join(directory, "data.csv")
+    pd.DataFrame({"x": x, "y": y}).to_csv(path, index=False)
+    files["csv"] = (path, None)
+
+    path = os.path.join(directory, "structured.npy")
+    np.save(path, np.rec.fromarrays([x, y], names="x,y"))
+    files["npy (structured)"] = (path, "npy")
+    path = os.path.join(directory, "columns.npy")
+    np.save(path, np.asfortranarray(np.column_stack([x, y])))
+    files["npy (2D, column-major)"] = (path, "npy")
+    path = os.path.join(directory, "data.npz")
+    np.savez(path, x=x, y=y)
+    files["npz"] = (path, "npz")
+    path = os.path.join(directory, "compressed.npz")
+    np.savez_compressed(path, x=x, y=y)
+    files["npz (compressed)"] = (path, "npz")
+
+    if columnar_service.feather is not None:
+        import pyarrow as pa
+        table = pa.table({"x": x, "y": y})
+        path = os.path.join(directory, "data.arrow")
+        columnar_service.feather.write_feather(table, path, compression="uncompressed")
+        files["arrow ipc"] = (path, "arrow")
+        path = os.path.join(directory, "data.feather")
+        columnar_service.feather.write_feather(table, path)
+        files["feather (lz4)"] = (path, "arrow")
+        path = os.path.join(directory, "data.parquet")
+        columnar_service.parquet.write_table(table, path)
+        files["parquet (snappy)"] = (path, "parquet")
+    return files
+
+
+def _load(path: str, file_format) -> int:
+    with open(path, "rb") as f:
+        if file_format is None:
+            x, _, _ = DatasetService.load_from_csv_stream(f)
+        else:
+            x, _, _ = ColumnarService.load(f, file_format)
+    return len(x)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--formats", default=None, help="prefixe de nume separate prin virgulă (ex. csv,npy)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, args.points)
+    y = 2 * x + 1 + rng.normal(0, 2, args.points)
+
+    directory = tempfile.mkdtemp(prefix="ingest-bench-")
+    try:
+        files = _write_files(directory, x, y)
+        if args.formats:
+            prefixes = tuple(args.formats.split(","))
+            files = {name: entry for name, entry in files.items() if name.startswith(prefixes)}
+
+        results = []
+        for name, (path, file_format) in files.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                rows = _load(path, file_format)
+                best = min(best, time.perf_counter() - start)
+            assert rows == args.points
+            results.append((name, os.path.getsize(path), best))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    csv_seconds = next((seconds for name, _, seconds in results if name == "csv"), None)
+    print(f"points={args.points:,}  repeat={args.repeat}  (pyarrow {'available' if columnar_service.feather else 'missing'})")
+    print(f"{'format':<24}{'size [MB]':>11}{'time [s]':>10}{'Mrows/s':>10}{'MB/s':>9}{'vs csv':>9}")
+    for name, size, seconds in results:
+        speedup = f"{csv_seconds / seconds:.1f}x" if csv_seconds else "-"
+        print(
+            f"{name:<24}{size / 1e6:>11.1f}{seconds:>10.3f}{args.points / seconds / 1e6:>10.1f}"
+            f"{size / seconds / 1e6:>9.0f}{speedup:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark pentru optimizatori: epoci până la toleranță și timp de rulare.
+
+Rulare (din directorul backend):
+    python -m benchmarks.optimizers [--tolerance 1e-6] [--max-epochs 1000000]
+
+Pentru familia gradient descent (sgd, momentum, nesterov) learning rate-ul
+implicit este 1/L, unde L e cea mai mare valoare proprie a Hessianei MSE,
+adică cel mai mare pas stabil pentru sgd. Adam folosește --adam-lr.
+"""
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+from app.services.dataset_service import DatasetService, DatasetStats
+from app.services.ml_service import MLService
+from app.services.optimizer_service import OPTIMIZERS, OptimizerState
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+START_W = 1.0
+START_B = 1.0
+
+
+def load_datasets():
+    datasets = {}
+    for name in ("dataset_100_noisy.csv", "sample_data.csv"):
+        path = os.path.join(REPO_ROOT, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                _, _, stats = DatasetService.load_from_csv_stream(f)
+            datasets[name] = stats
+
+    # x necentrat și la scară mare: Hessiana e foarte prost condiționată
+    rng = np.random.default_rng(0)
+    x = rng.uniform(100, 110, 10_000)
+    y = 0.5 * x + 20 + rng.normal(0, 1, len(x))
+    datasets["shifted_x_100_110"] = DatasetService.compute_statistics(x, y)
+    return datasets
+
+
+def smoothness(stats: DatasetStats) -> float:
+    """Cea mai mare valoare proprie a Hessianei (2/n)·[[Σx², Σx], [Σx, n]]."""
+    n = stats.n
+    hessian = (2 / n) * np.array([[stats.sum_x2, stats.sum_x], [stats.sum_x, n]])
+    return float(np.linalg.eigvalsh(hessian)[-1])
+
+
+def run(stats: DatasetStats, name: str, lr: float, tolerance: float, max_epochs: int):
+    optimizer = OptimizerState(name=name)
+    start = time.perf_counter()
+    result = MLService.run_gradient_descent(stats, START_W, START_B, lr, max_epochs, tolerance, optimizer)
+    elapsed = time.perf_counter() - start
+    return {
+        "epochs": len(result["loss"]),
+        "converged": result["converged"],
+        "loss": float(result["loss"][-1]) if len(result["loss"]) else math.nan,
+        "seconds": elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    parser.add_argument("--max-epochs", type=int, default=1_000_000)
+    parser.add_argument("--adam-lr", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'dataset':<24}{'optimizer':<13}{'lr':>10}{'epochs':>10}{'converged':>11}{'loss':>14}{'time [ms]':>12}")
+    for dataset, stats in load_datasets().items():
+        safe_lr = 1.0 / smoothness(stats)
+        for name in OPTIMIZERS:
+            lr = args.adam_lr if name == "adam" else safe_lr
+            r = run(stats, name, lr, args.tolerance, args.max_epochs)
+            print(
+                f"{dataset:<24}{name:<13}{lr:>10.3g}{r['epochs']:>10}{str(r['converged']):>11}"
+                f"{r['loss']:>14.6g}{r['seconds'] * 1000:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
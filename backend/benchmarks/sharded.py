@@ -0,0 +1,76 @@
+"""
+Benchmark pentru calculul pe shard-uri: timp și speedup în funcție de numărul de workeri.
+
+Rulare (din directorul backend):
+    python -m benchmarks.sharded [--points 10000000] [--max-workers 8] [--repeat 5]
+
+Pentru fiecare număr de workeri (1, 2, 4, ... până la --max-workers, implicit
+numărul de core-uri) se măsoară sumele reziduale (Σr, Σx·r, Σr²), kernel-ul
+fused_step și calculul statisticilor suficiente. Speedup-ul e raportat față
+de rularea cu un singur worker.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.services.ml_service import MLService, StepBuffers
+from app.services.parallel_service import shard_pool
+
+
+def best_time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def worker_counts(max_workers: int):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, args.points)
+    y = 2 * x + 1 + rng.normal(0, 3, args.points)
+    buffers = StepBuffers(args.points)
+    w, b = 1.3, 0.4
+
+    kernels = {
+        "residual_sums": lambda: shard_pool.residual_sums(x, y, w, b),
+        "fused_step": lambda: MLService.fused_step(x, y, w, b, 0.01, buffers),
+        "statistics": lambda: shard_pool.compute_statistics(x, y),
+    }
+
+    print(f"points={args.points:,}  cores={os.cpu_count()}")
+    print(f"{'kernel':<16}{'workers':>8}{'shards':>8}{'time [ms]':>12}{'speedup':>10}")
+    for name, kernel in kernels.items():
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            # Pragul 0 forțează sharding-ul, ca toate rulările să treacă prin pool
+            shard_pool.configure(workers=workers, threshold=0)
+            kernel()  # încălzire (pool, page faults)
+            elapsed = best_time(kernel, args.repeat)
+            baseline = baseline or elapsed
+            print(
+                f"{name:<16}{workers:>8}{len(shard_pool.shards(args.points)):>8}"
+                f"{elapsed * 1000:>12.2f}{baseline / elapsed:>10.2f}"
+            )
+    shard_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Suită de benchmark-uri reproductibile pentru service-uri și endpoint-uri.
+
+Rulare (din directorul backend):
+    python -m benchmarks.suite [--sizes 20,1000,100000,1000000,10000000]
+                               [--filter ml.] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--threshold 0.1]
+    python -m benchmarks.suite --input results.json --compare baseline.json
+
+Acoperă toate metodele MLService, ExplanationService.generate_step_explanation,
+DatasetService.load_from_csv și endpoint-urile gradient_step / get_current_state
+printr-un client ASGI in-process (httpx, fără server și fără rețea).
+Datele sunt generate cu seed fix, deci rulările sunt comparabile între commit-uri.
+
+Pentru fiecare (caz, dimensiune) se raportează min/median/mean/stdev pe runde;
+apelurile foarte scurte sunt repetate într-o rundă până la ~1 ms. Rezultatele
+sunt scrise ca JSON. Cu --compare, medianele sunt comparate cu un baseline
+salvat: un caz e regresie dacă e mai lent cu peste --threshold (relativ) și
+peste --min-delta (absolut); codul de ieșire e 1 dacă există regresii.
+
+Endpoint-urile care returnează toate punctele sunt rulate doar până la
+--max-payload-points (un răspuns JSON cu 10⁷ puncte are câțiva GB).
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset_service import DatasetService
+from app.services.explanation_service import ExplanationService, _render_step_explanation
+from app.services.ml_service import MLService, StepBuffers
+from app.services.optimizer_service import OptimizerState
+from app.services.parallel_service import shard_pool
+
+DEFAULT_SIZES = (20, 1_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_MAX_PAYLOAD_POINTS = 100_000
+SEED = 0
+W, B, LR = 1.3, 0.4, 0.01
+RUN_EPOCHS = 1_000
+SWEEP_CONFIGURATIONS = 1_000
+BENCH_SESSION = "benchmark"
+# O rundă durează cel puțin atât; apelurile mai scurte sunt repetate în rundă
+MIN_ROUND_SECONDS = 0.001
+MAX_CALLS_PER_ROUND = 10_000
+
+
+@dataclass
+class Case:
+    name: str
+    # setup(x, y) -> context; run(context) e partea cronometrată
+    setup: Callable[[np.ndarray, np.ndarray], Any]
+    run: Callable[[Any], Any]
+    # Rulat înaintea fiecărei runde, necronometrat (cazuri care modifică starea)
+    reset: Optional[Callable[[Any], None]] = None
+    full_payload: bool = False
+
+
+def make_data(n: int):
+    rng = np.random.default_rng(SEED)
+    x = rng.uniform(0, 10, n)
+    y = 2 * x + 1 + rng.normal(0, 2, n)
+    return x, y
+
+
+def ml_cases() -> List[Case]:
+    def data(x, y):
+        y_pred = MLService.calculate_predictions(x, W, B)
+        errors, magnitudes = MLService.calculate_errors_per_point(y, y_pred)
+        return {
+            "x": x, "y": y, "y_pred": y_pred, "errors": errors, "magnitudes": magnitudes,
+            "stats": DatasetService.compute_statistics(x, y), "buffers": StepBuffers(len(x)),
+            "sweep_lr": np.logspace(-4, -1, SWEEP_CONFIGURATIONS),
+            "sweep_samples": MLService.sample_indices(RUN_EPOCHS + 1, 100)
+        }
+
+    def adam(ctx):
+        ctx["optimizer"] = OptimizerState(name="adam")
+
+    return [
+        Case("ml.calculate_predictions", data, lambda c: MLService.calculate_predictions(c["x"], W, B)),
+        Case("ml.calculate_errors_per_point", data, lambda c: MLService.calculate_errors_per_point(c["y"], c["y_pred"])),
+        Case("ml.calculate_point_contributions", data, lambda c: MLService.calculate_point_contributions(c["x"], c["y"], c["y_pred"])),
+        Case("ml.calculate_gradients", data, lambda c: MLService.calculate_gradients(c["x"], c["y"], c["y_pred"])),
+        Case("ml.update_parameters", data, lambda c: MLService.update_parameters(W, B, 0.5, -0.2, LR)),
+        Case("ml.apply_update", data, lambda c: MLService.apply_update(W, B, 0.5, -0.2, LR)),
+        Case("ml.apply_update_adam", data, lambda c: MLService.apply_update(W, B, 0.5, -0.2, LR, c["optimizer"], c["stats"]), reset=adam),
+        Case("ml.calculate_mse", data, lambda c: MLService.calculate_mse(c["y"], c["y_pred"])),
+        Case("ml.categorize_errors", data, lambda c: MLService.categorize_errors(c["magnitudes"])),
+        Case("ml.categorize_errors_codes", data, lambda c: MLService.categorize_errors_codes(c["magnitudes"])),
+        Case("ml.fused_step", data, lambda c: MLService.fused_step(c["x"], c["y"], W, B, LR, c["buffers"])),
+        Case("ml.calculate_residual_sums", data, lambda c: MLService.calculate_residual_sums(c["stats"], W, B)),
+        Case("ml.calculate_mse_from_stats", data, lambda c: MLService.calculate_mse_from_stats(c["stats"], W, B)),
+        Case("ml.calculate_gradients_from_stats", data, lambda c: MLService.calculate_gradients_from_stats(c["stats"], W, B)),
+        Case("ml.fast_step", data, lambda c: MLService.fast_step(c["stats"], W, B, LR)),
+        Case("ml.run_gradient_descent", data, lambda c: MLService.run_gradient_descent(c["stats"], W, B, LR, RUN_EPOCHS)),
+        Case("ml.run_sweep", data, lambda c: MLService.run_sweep(
+            c["stats"], c["sweep_lr"], np.full(SWEEP_CONFIGURATIONS, W), np.full(SWEEP_CONFIGURATIONS, B),
+            RUN_EPOCHS, 1e-6, c["sweep_samples"]
+        )),
+        Case("ml.sample_indices", data, lambda c: MLService.sample_indices(len(c["x"]), 500)),
+    ]
+
+
+def explanation_cases() -> List[Case]:
+    def data(x, y):
+        y_pred = MLService.calculate_predictions(x, W, B)
+        errors = y - y_pred
+        dw, db, _ = MLService.calculate_gradients(x, y, y_pred)
+        return {"args": (x, y, y_pred, W, B, dw, db, LR, errors)}
+
+    def cold(ctx):
+        _render_step_explanation.cache_clear()
+
+    return [
+        Case("explanation.generate_step_explanation", data, lambda c: ExplanationService.generate_step_explanation(*c["args"])),
+        # Fără cache: include și randarea textului
+        Case("explanation.generate_step_explanation_cold", data, lambda c: ExplanationService.generate_step_explanation(*c["args"]), reset=cold),
+    ]
+
+
+def dataset_cases() -> List[Case]:
+    def csv(x, y):
+        buffer = io.StringIO()
+        buffer.write("x,y\n")
+        np.savetxt(buffer, np.column_stack((x, y)), delimiter=",", fmt="%.10g")
+        return buffer.getvalue().encode()
+
+    return [Case("dataset.load_from_csv", csv, DatasetService.load_from_csv)]
+
+
+def endpoint_cases() -> Tuple[List[Case], Callable[[], None]]:
+    """Cazurile pentru endpoint-uri și funcția care închide clientul și event loop-ul."""
+    try:
+        import httpx
+    except ImportError:
+        print("httpx nu este instalat: endpoint-urile sunt sărite", file=sys.stderr)
+        return [], lambda: None
+
+    from app.api.session import session_store
+    from main import app
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+        headers={"X-Session-ID": BENCH_SESSION}
+    )
+
+    def data(x, y):
+        state = session_store.get(BENCH_SESSION)
+        state.load_dataset(x, y)
+        return state
+
+    def reset(state):
+        # Istoricul nu crește de la o rundă la alta
+        state.reset_model()
+
+    def diverge(state):
+        # Modelul după o divergență: loss-ul și gradienții devin inf/NaN
+        state.reset_model()
+        state.model.w = state.model.b = 1e200
+
+    def request(method: str, url: str):
+        def run(_):
+            response = loop.run_until_complete(client.request(method, url))
+            response.raise_for_status()
+            return response
+        return run
+
+    def close():
+        loop.run_until_complete(client.aclose())
+        # Task-urile pornite de aplicație (ex. monitorul event loop-ului)
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.close()
+        session_store.delete(BENCH_SESSION)
+
+    return [
+        Case("endpoint.gradient_step", data, request("POST", "/api/gradient/step"), reset, full_payload=True),
+        Case("endpoint.gradient_step_delta", data, request("POST", "/api/gradient/step?since_epoch=0"), reset),
+        Case("endpoint.get_current_state", data, request("GET", "/api/state/current"), reset, full_payload=True),
+        Case("endpoint.get_current_state_scalars", data, request("GET", "/api/state/current?fields=model,loss,gradient,epoch"), reset),
+        Case("endpoint.get_current_state_scalars_diverged", data, request("GET", "/api/state/current?fields=model,loss,gradient,epoch"), diverge),
+    ], close
+
+
+def measure(case: Case, ctx: Any, min_time: float, max_rounds: int) -> Dict[str, Any]:
+    """Runde cronometrate până la min_time secunde (cel puțin 3, cel mult max_rounds)."""
+    if case.reset is not None:
+        case.reset(ctx)
+    start = time.perf_counter()
+    case.run(ctx)  # încălzire (cache-uri, pool-uri, page faults)
+    first = time.perf_counter() - start
+
+    calls = 1
+    if case.reset is None and first < MIN_ROUND_SECONDS:
+        calls = min(int(MIN_ROUND_SECONDS / max(first, 1e-7)) + 1, MAX_CALLS_PER_ROUND)
+
+    times = []
+    total = 0.0
+    while len(times) < max_rounds and (len(times) < 3 or total < min_time):
+        if case.reset is not None:
+            case.reset(ctx)
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.run(ctx)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed / calls)
+        total += elapsed
+
+    return {
+        "rounds": len(times),
+        "calls_per_round": calls,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> Dict[str, Any]:
+    endpoints, close = endpoint_cases()
+    cases = ml_cases() + explanation_cases() + dataset_cases() + endpoints
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.name]
+
+    results = []
+    print(f"{'case':<48}{'points':>12}{'median [ms]':>14}{'min [ms]':>12}{'rounds':>8}")
+    for size in args.sizes:
+        x, y = make_data(size)
+        for case in cases:
+            entry = {"name": case.name, "size": size}
+            if case.full_payload and size > args.max_payload_points:
+                entry["skipped"] = f"payload cap {args.max_payload_points}"
+                results.append(entry)
+                print(f"{case.name:<48}{size:>12,}  skipped ({entry['skipped']})")
+                continue
+            ctx = case.setup(x, y)
+            entry.update(measure(case, ctx, args.min_time, args.max_rounds))
+            del ctx
+            results.append(entry)
+            print(
+                f"{case.name:<48}{size:>12,}{entry['median'] * 1000:>14.4f}"
+                f"{entry['min'] * 1000:>12.4f}{entry['rounds']:>8}"
+            )
+    close()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "shard_workers": shard_pool.workers,
+            "sizes": list(args.sizes),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta: float) -> int:
+    """Compară medianele cu baseline-ul; returnează numărul de regresii."""
+    reference = {
+        (entry["name"], entry["size"]): entry for entry in baseline["results"] if "median" in entry
+    }
+    regressions = 0
+    print(f"\n{'case':<48}{'points':>12}{'baseline [ms]':>15}{'current [ms]':>14}{'ratio':>8}  status")
+    for entry in current["results"]:
+        base = reference.get((entry["name"], entry["size"]))
+        if "median" not in entry or base is None:
+            continue
+        ratio = entry["median"] / base["median"] if base["median"] > 0 else float("inf")
+        delta = entry["median"] - base["median"]
+        if ratio > 1 + threshold and delta > min_delta:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold) and -delta > min_delta:
+            status = "faster"
+        else:
+            status = "ok"
+        print(
+            f"{entry['name']:<48}{entry['size']:>12,}{base['median'] * 1000:>15.4f}"
+            f"{entry['median'] * 1000:>14.4f}{ratio:>8.2f}  {status}"
+        )
+    print(f"\n{regressions} regression(s) (threshold {threshold:.0%}, min delta {min_delta * 1e6:.0f} µs)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", type=lambda s: [int(v) for v in s.split(",")], default=list(DEFAULT_SIZES),
+        help="dimensiunile dataset-urilor, separate prin virgulă"
+    )
+    parser.add_argument("--filter", default=None, help="rulează doar cazurile care conțin acest text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="secunde cronometrate per caz și dimensiune")
+    parser.add_argument("--max-rounds", type=int, default=50)
+    parser.add_argument("--max-payload-points", type=int, default=DEFAULT_MAX_PAYLOAD_POINTS)
+    parser.add_argument("--output", default=None, help="fișierul JSON cu rezultatele")
+    parser.add_argument("--input", default=None, help="compară un fișier de rezultate existent, fără a rula suita")
+    parser.add_argument("--compare", default=None, help="baseline JSON pentru detectarea regresiilor")
+    parser.add_argument("--threshold", type=float, default=0.10, help="încetinire relativă considerată regresie")
+    parser.add_argument("--min-delta", type=float, default=5e-6, help="încetinire absolută minimă (secunde)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args)
+        shard_pool.shutdown()
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold, args.min_delta):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 """
 Main entry point - versiune simplificată și organizată
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import training, dataset
+from app.api import training, dataset, live, landscape, multivariate, jobs, metrics
+from app.api.session import checkpoint_store, get_state, session_store
+from app.services.session_service import TrainingState
+
+logger = logging.getLogger(__name__)
 
 # Creează aplicația FastAPI
 app = FastAPI(
@@ -21,9 +28,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latența, payload-urile și lag-ul event loop-ului pentru /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Înregistrează routerele
 app.include_router(training.router)
 app.include_router(dataset.router)
+app.include_router(live.router)
+app.include_router(landscape.router)
+app.include_router(multivariate.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -34,13 +49,38 @@ async def root():
         "message": "ML Explicative System API",
         "version": "1.0.0",
         "endpoints": {
-            "training": "/api/gradient/step, /api/state/current, /api/model/reset",
+            "training": "/api/gradient/step, /api/gradient/run, /api/gradient/sweep, /api/state/current, /api/model/reset",
             "dataset": "/api/dataset/upload, /api/dataset/generate, /api/dataset/info",
-            "config": "/api/config/learning-rate"
+            "config": "/api/config/learning-rate",
+            "live": "/api/ws/training",
+            "landscape": "/api/landscape, /api/landscape/tiles/{level}/{tile_x}/{tile_y}",
+            "multivariate": "/api/multivariate/upload, /api/multivariate/generate, /api/multivariate/step, /api/multivariate/run",
+            "jobs": "/api/jobs, /api/jobs/{job_id}, /api/jobs/{job_id}/stream",
+            "metrics": "/metrics"
         }
     }
 
 
+@app.on_event("startup")
+async def startup():
+    """Restaurează sesiunile din checkpoint și pornește checkpoint-ul periodic."""
+    restored = await asyncio.to_thread(checkpoint_store.restore, session_store)
+    logger.info(
+        "Restored %d sessions in %.3f s", restored, checkpoint_store.last_restore["seconds"]
+    )
+    app.state.checkpoint_task = asyncio.create_task(checkpoint_store.run_periodic(session_store))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Oprește job-urile din fundal și salvează sesiunile (ex. la un deploy)."""
+    jobs.job_manager.shutdown()
+    task = getattr(app.state, "checkpoint_task", None)
+    if task is not None:
+        task.cancel()
+    await checkpoint_store.checkpoint(session_store)
+
+
 @app.get("/health")
 async def health():
     """Health check pentru monitoring"""
@@ -49,19 +89,11 @@ async def health():
 
 @app.post("/api/reset")
 @app.get("/api/reset")
-async def reset_all():
-    """Resetează complet aplicația - wrapper care apelează reset-ul din dataset."""
-    from app.api.training import state
-    
-    state["data"]["x"] = None
-    state["data"]["y"] = None
-    state["model"]["w"] = 1.0
-    state["model"]["b"] = 1.0
-    state["history"]["loss"] = []
-    state["history"]["w"] = []
-    state["history"]["b"] = []
-    state["config"]["lr"] = 0.01
-    state["config"]["current_epoch"] = 0
+async def reset_all(state: TrainingState = Depends(get_state)):
+    """Resetează complet sesiunea curentă (date, model, learning rate)."""
+    # Și varianta GET modifică starea, deci revizia e incrementată explicit
+    state.revision += 1
+    state.reset_all()
     
     return {"message": "Complete reset successful"}
 
@@ -0,0 +1,36 @@
+"""Fixture-uri comune pentru testele backend-ului."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.dataset_service import DatasetService  # noqa: E402
+
+
+@pytest.fixture
+def dataset():
+    """Dataset mic, cu zgomot, și statisticile lui suficiente: (x, y, stats)."""
+    rng = np.random.default_rng(7)
+    x = rng.uniform(0.0, 10.0, 400)
+    y = 2.0 * x + 1.0 + rng.normal(0.0, 3.0, 400)
+    return x, y, DatasetService.compute_statistics(x, y)
+
+
+def iterate_descent(x, y, w, b, lr, epochs, tolerance=None):
+    """Gradient descent direct pe puncte, epocă cu epocă (referința testelor)."""
+    n = len(x)
+    w_hist, b_hist, loss_hist = [], [], []
+    for _ in range(epochs):
+        errors = y - (w * x + b)
+        dw = -(2 / n) * np.dot(x, errors)
+        db = -(2 / n) * errors.sum()
+        if tolerance is not None and np.hypot(dw, db) < tolerance:
+            break
+        w, b = w - lr * dw, b - lr * db
+        w_hist.append(w)
+        b_hist.append(b)
+        loss_hist.append(np.mean((y - (w * x + b)) ** 2))
+    return np.array(w_hist), np.array(b_hist), np.array(loss_hist)
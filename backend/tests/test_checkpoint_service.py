@@ -0,0 +1,104 @@
+"""Checkpoint pe disc și restaurare a sesiunilor."""
+import asyncio
+import os
+
+import numpy as np
+
+from app.services.checkpoint_service import CheckpointStore
+from app.services.ml_service import MLService
+from app.services.multivariate_service import MultivariateService
+from app.services.session_service import SessionStore
+
+
+def _train(state, epochs=40):
+    result = MLService.run_gradient_descent(state.data.stats, state.model.w, state.model.b, state.config.lr, epochs)
+    state.history.extend(result["loss"], result["w"], result["b"])
+    state.model.w = float(result["w"][-1])
+    state.model.b = float(result["b"][-1])
+    state.config.current_epoch += epochs
+    state.revision += 1
+
+
+def _populated_store(dataset):
+    x, y, stats = dataset
+    store = SessionStore()
+    first = store.get("first")
+    first.load_dataset(x, y, stats)
+    first.config.lr = 0.02
+    _train(first)
+    # A doua sesiune împarte dataset-ul cu prima
+    second = store.get("second")
+    second.load_dataset(x, y, stats)
+    _train(second, 10)
+    return store
+
+
+def test_round_trip_restores_sessions(dataset, tmp_path):
+    store = _populated_store(dataset)
+    checkpoints = CheckpointStore(str(tmp_path))
+    assert asyncio.run(checkpoints.checkpoint(store)) == 2
+    # Dataset-ul comun este scris o singură dată
+    assert len(os.listdir(checkpoints.datasets_dir)) == 1
+
+    restored = SessionStore()
+    assert CheckpointStore(str(tmp_path)).restore(restored) == 2
+    for session_id, original in store.items():
+        state = restored.peek(session_id)
+        assert state is not None
+        assert state.model.w == original.model.w
+        assert state.model.b == original.model.b
+        assert state.config.lr == original.config.lr
+        assert state.config.current_epoch == original.config.current_epoch
+        np.testing.assert_array_equal(state.data.x, original.data.x)
+        np.testing.assert_array_equal(state.data.y, original.data.y)
+        assert state.data.stats == original.data.stats
+        np.testing.assert_array_equal(state.history.epochs, original.history.epochs)
+        np.testing.assert_array_equal(state.history.loss, original.history.loss)
+        np.testing.assert_array_equal(state.history.w, original.history.w)
+
+
+def test_round_trip_restores_multivariate_session(tmp_path):
+    rng = np.random.default_rng(11)
+    X = rng.normal(size=(150, 3))
+    y = X @ np.array([1.0, 2.0, -1.0]) + 0.5
+    store = SessionStore()
+    state = store.get("mv")
+    state.load_multivariate(X, y, ["a", "b", "c"], MultivariateService.compute_statistics(X, y), feature=2)
+    state.multivariate.weights = np.array([0.5, 1.5, -0.5])
+    state.multivariate.bias = 0.25
+    asyncio.run(CheckpointStore(str(tmp_path)).checkpoint(store))
+
+    restored = SessionStore()
+    CheckpointStore(str(tmp_path)).restore(restored)
+    multivariate = restored.peek("mv").multivariate
+    np.testing.assert_array_equal(multivariate.X, X)
+    np.testing.assert_array_equal(multivariate.weights, [0.5, 1.5, -0.5])
+    assert multivariate.bias == 0.25
+    assert multivariate.feature == 2
+    assert multivariate.feature_names == ["a", "b", "c"]
+
+
+def test_unchanged_sessions_are_not_rewritten(dataset, tmp_path):
+    store = _populated_store(dataset)
+    checkpoints = CheckpointStore(str(tmp_path))
+    asyncio.run(checkpoints.checkpoint(store))
+    assert asyncio.run(checkpoints.checkpoint(store)) == 0
+
+    _train(store.peek("first"), 5)
+    assert asyncio.run(checkpoints.checkpoint(store)) == 1
+
+
+def test_evicted_sessions_are_collected(dataset, tmp_path):
+    store = _populated_store(dataset)
+    checkpoints = CheckpointStore(str(tmp_path))
+    asyncio.run(checkpoints.checkpoint(store))
+
+    store.delete("first")
+    asyncio.run(checkpoints.checkpoint(store))
+    assert sorted(os.listdir(checkpoints.sessions_dir)) == ["second.ckpt"]
+    assert len(os.listdir(checkpoints.datasets_dir)) == 1
+
+    store.delete("second")
+    asyncio.run(checkpoints.checkpoint(store))
+    assert os.listdir(checkpoints.sessions_dir) == []
+    assert os.listdir(checkpoints.datasets_dir) == []
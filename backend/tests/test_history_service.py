@@ -0,0 +1,62 @@
+"""Retenția istoricului și subeșantionarea curbei de loss."""
+import numpy as np
+import pytest
+
+from app.services.history_service import TrainingHistory
+
+
+def _filled(max_entries, policy, epochs):
+    history = TrainingHistory(max_entries=max_entries, policy=policy)
+    loss = np.exp(-np.arange(epochs) / 200.0) + 0.1 * np.sin(np.arange(epochs))
+    history.extend(loss, np.arange(epochs, dtype=np.float64), -np.arange(epochs, dtype=np.float64))
+    return history, loss
+
+
+def test_ring_keeps_latest_epochs():
+    history, loss = _filled(100, "ring", 1000)
+
+    assert len(history) == 100
+    assert history.total_epochs == 1000
+    np.testing.assert_array_equal(history.epochs, np.arange(901, 1001))
+    np.testing.assert_array_equal(history.loss, loss[-100:])
+
+
+def test_decimate_keeps_whole_run_and_last_epoch():
+    history, _ = _filled(100, "decimate", 1000)
+
+    assert len(history) <= 100
+    assert np.all(history.epochs % history.stride == 0)
+    assert history.epochs[0] == history.stride
+    assert history.epochs[-1] > 1000 - history.stride
+    assert history.last["epoch"] == 1000
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax", "stride"])
+def test_downsample_is_bounded_and_keeps_endpoints(method):
+    history, _ = _filled(10_000, "ring", 5000)
+    sample = history.downsample(200, method)
+
+    assert len(sample["epochs"]) <= 200
+    assert sample["epochs"][0] == 1
+    assert sample["epochs"][-1] == 5000
+    assert np.all(np.diff(sample["epochs"]) > 0)
+    # Punctele subeșantionate sunt intrări reale ale istoricului
+    np.testing.assert_array_equal(sample["loss"], history.loss[sample["epochs"] - 1])
+
+
+def test_lttb_keeps_loss_spike():
+    history = TrainingHistory()
+    loss = np.ones(2000)
+    loss[1234] = 50.0
+    history.extend(loss, np.zeros(2000), np.zeros(2000))
+
+    assert 1235 in history.downsample(100, "lttb")["epochs"]
+
+
+def test_export_restore_round_trip():
+    history, _ = _filled(100, "decimate", 777)
+    restored = TrainingHistory.restore(*history.export())
+
+    for key, values in history.snapshot().items():
+        np.testing.assert_array_equal(restored.snapshot()[key], values)
+    assert restored.last == history.last
@@ -0,0 +1,53 @@
+"""Grilele de loss din statistici față de MSE-ul calculat pe puncte."""
+import numpy as np
+import pytest
+
+from app.services.landscape_service import LandscapeService
+from app.services.ml_service import MLService
+
+
+def test_loss_grid_matches_pointwise_mse(dataset):
+    x, y, stats = dataset
+    w_values = np.linspace(-5.0, 8.0, 9)
+    b_values = np.linspace(-20.0, 20.0, 7)
+    grid = LandscapeService.loss_grid(stats, w_values, b_values)
+
+    assert grid.shape == (len(b_values), len(w_values))
+    for i, b in enumerate(b_values):
+        for j, w in enumerate(w_values):
+            expected = MLService.calculate_mse(y, MLService.calculate_predictions(x, w, b))
+            assert grid[i, j] == pytest.approx(expected, rel=1e-9)
+
+
+def test_optimum_matches_least_squares(dataset):
+    x, y, stats = dataset
+    w_opt, b_opt, loss_opt = LandscapeService.optimum(stats)
+    w_fit, b_fit = np.polyfit(x, y, 1)
+
+    assert w_opt == pytest.approx(w_fit, rel=1e-9)
+    assert b_opt == pytest.approx(b_fit, rel=1e-9)
+    assert loss_opt == pytest.approx(np.mean((y - (w_fit * x + b_fit)) ** 2), rel=1e-9)
+
+
+def test_neighbouring_tiles_share_edges(dataset):
+    _, _, stats = dataset
+    base = LandscapeService.base_window(stats, 1.0, 1.0)
+    left = LandscapeService.tile(stats, base, 2, 1, 1, 16)
+    right = LandscapeService.tile(stats, base, 2, 2, 1, 16)
+
+    assert left["w_values"][-1] == pytest.approx(right["w_values"][0])
+    np.testing.assert_allclose(left["loss"][:, -1], right["loss"][:, 0], rtol=1e-12)
+
+
+def test_far_windows_stay_finite(dataset):
+    _, _, stats = dataset
+    grid = LandscapeService.window(stats, (1e200, 2e200, -1e200, 1e200), 4)
+
+    assert np.isfinite(grid["loss"]).all()
+
+
+def test_tile_outside_landscape_is_rejected(dataset):
+    _, _, stats = dataset
+    base = LandscapeService.base_window(stats, 1.0, 1.0)
+    with pytest.raises(ValueError):
+        LandscapeService.tile(stats, base, 1, 5, 0)
@@ -0,0 +1,64 @@
+"""Cadrele WebSocket-ului live: JSON strict și închiderea la evicția sesiunii."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.api.session import session_store
+
+
+def _strict(text):
+    def reject(constant):
+        raise ValueError(f"non-standard JSON constant {constant}")
+    return json.loads(text, parse_constant=reject)
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def test_diverging_frames_are_strict_json(client):
+    client.post("/api/dataset/generate", json={"num_points": 100, "seed": 1}, headers={"X-Session-ID": "live-diverge"})
+    with client.websocket_connect("/api/ws/training?session_id=live-diverge") as ws:
+        _strict(ws.receive_text())
+        ws.send_text(json.dumps({"type": "set_learning_rate", "learning_rate": 5}))
+        _strict(ws.receive_text())
+        ws.send_text(json.dumps({"type": "set_units_per_frame", "units_per_frame": 2000}))
+        _strict(ws.receive_text())
+        ws.send_text(json.dumps({"type": "step"}))
+        frame = _strict(ws.receive_text())
+
+    # Loss-ul divergent (inf/NaN) ajunge ca null, nu ca Infinity/NaN
+    assert frame["type"] == "frame"
+
+
+@pytest.mark.parametrize("message", [
+    '{"type": "set_fps", "fps": NaN}',
+    '{"type": "set_units_per_frame", "units_per_frame": Infinity}',
+])
+def test_non_finite_settings_are_rejected(client, message):
+    client.post("/api/dataset/generate", json={"num_points": 50, "seed": 1}, headers={"X-Session-ID": "live-settings"})
+    with client.websocket_connect("/api/ws/training?session_id=live-settings") as ws:
+        _strict(ws.receive_text())
+        ws.send_text(message)
+        reply = _strict(ws.receive_text())
+
+    assert reply["type"] == "error"
+
+
+def test_evicted_session_closes_socket(client):
+    client.post("/api/dataset/generate", json={"num_points": 50, "seed": 1}, headers={"X-Session-ID": "live-evicted"})
+    with client.websocket_connect("/api/ws/training?session_id=live-evicted") as ws:
+        _strict(ws.receive_text())
+        session_store.delete("live-evicted")
+        ws.send_text(json.dumps({"type": "pause"}))
+        messages = [_strict(ws.receive_text())]
+        while messages[-1]["type"] != "error":
+            messages.append(_strict(ws.receive_text()))
+        closed = ws.receive()
+
+    assert messages[-1]["detail"] == "Session expired"
+    assert closed["type"] == "websocket.close"
+    assert closed["code"] == 1001
@@ -0,0 +1,94 @@
+"""Traiectoriile în formă închisă (run_gradient_descent, run_sweep) față de iterația directă."""
+import numpy as np
+import pytest
+
+from app.services.ml_service import MLService
+from app.services.optimizer_service import OptimizerState
+from tests.conftest import iterate_descent
+
+
+@pytest.mark.parametrize("lr, epochs", [(0.001, 50), (0.01, 300), (0.02, 1000)])
+def test_plain_descent_matches_iteration(dataset, lr, epochs):
+    x, y, stats = dataset
+    result = MLService.run_gradient_descent(stats, 1.0, 1.0, lr, epochs)
+    w, b, loss = iterate_descent(x, y, 1.0, 1.0, lr, epochs)
+
+    assert len(result["loss"]) == epochs
+    np.testing.assert_allclose(result["w"], w, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(result["b"], b, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(result["loss"], loss, rtol=1e-9)
+    assert not result["converged"]
+
+
+def test_plain_descent_spans_several_blocks(dataset, monkeypatch):
+    monkeypatch.setattr("app.services.ml_service.CLOSED_FORM_BLOCK_EPOCHS", 7)
+    x, y, stats = dataset
+    result = MLService.run_gradient_descent(stats, -3.0, 4.0, 0.01, 50)
+    w, b, loss = iterate_descent(x, y, -3.0, 4.0, 0.01, 50)
+
+    np.testing.assert_allclose(result["w"], w, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(result["loss"], loss, rtol=1e-9)
+
+
+def test_plain_descent_stops_at_tolerance(dataset):
+    x, y, stats = dataset
+    result = MLService.run_gradient_descent(stats, 1.0, 1.0, 0.02, 100_000, tolerance=1e-3)
+    w, _, _ = iterate_descent(x, y, 1.0, 1.0, 0.02, 100_000, tolerance=1e-3)
+
+    assert result["converged"]
+    assert len(result["w"]) == len(w)
+    assert result["gradient_magnitude"] < 1e-3
+    assert result["w"][-1] == pytest.approx(w[-1], rel=1e-9)
+
+
+def test_plain_descent_stops_on_divergence(dataset):
+    _, _, stats = dataset
+    result = MLService.run_gradient_descent(stats, 1.0, 1.0, 1.0, 10_000)
+
+    assert not result["converged"]
+    assert len(result["loss"]) < 10_000
+    assert not np.isfinite(result["gradient_magnitude"])
+
+
+def test_sgd_optimizer_counts_steps(dataset):
+    _, _, stats = dataset
+    optimizer = OptimizerState()
+    result = MLService.run_gradient_descent(stats, 1.0, 1.0, 0.01, 25, optimizer=optimizer)
+
+    assert optimizer.step == len(result["loss"]) == 25
+
+
+def test_sweep_matches_individual_runs(dataset):
+    _, _, stats = dataset
+    lr = np.array([0.001, 0.005, 0.01, 0.02])
+    w0 = np.array([1.0, -2.0, 5.0, 0.0])
+    b0 = np.array([1.0, 3.0, -4.0, 0.0])
+    sample_epochs = np.array([0, 1, 10, 100])
+    sweep = MLService.run_sweep(stats, lr, w0, b0, 2000, 1e-2, sample_epochs)
+
+    for k in range(len(lr)):
+        run = MLService.run_gradient_descent(stats, w0[k], b0[k], lr[k], 2000, tolerance=1e-2)
+        assert sweep["epochs_run"][k] == len(run["loss"])
+        assert bool(sweep["converged"][k]) == run["converged"]
+        assert not sweep["diverged"][k]
+        assert sweep["w"][k] == pytest.approx(run["w"][-1], rel=1e-8)
+        assert sweep["b"][k] == pytest.approx(run["b"][-1], rel=1e-8)
+        assert sweep["loss"][k] == pytest.approx(run["loss"][-1], rel=1e-8)
+        for row, epoch in enumerate(sample_epochs):
+            if epoch == 0:
+                expected = MLService.calculate_mse_from_stats(stats, w0[k], b0[k])
+            elif epoch <= len(run["loss"]):
+                expected = run["loss"][epoch - 1]
+            else:
+                assert np.isnan(sweep["loss_curves"][row, k])
+                continue
+            assert sweep["loss_curves"][row, k] == pytest.approx(expected, rel=1e-8)
+
+
+def test_sweep_flags_divergence(dataset):
+    _, _, stats = dataset
+    sweep = MLService.run_sweep(stats, np.array([1.0]), np.array([1.0]), np.array([1.0]), 1000, 1e-6, np.array([0]))
+
+    assert sweep["diverged"][0]
+    assert not sweep["converged"][0]
+    assert sweep["epochs_run"][0] < 1000
@@ -0,0 +1,45 @@
+"""Evicția sesiunilor (TTL, LRU) și touch după evicție."""
+from app.services.session_service import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expired_sessions_are_evicted():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10.0, clock=clock)
+    first = store.get("a")
+    clock.now = 11.0
+    store.get("b")
+
+    assert store.peek("a") is None
+    assert store.get("a") is not first
+
+
+def test_least_recently_used_session_is_evicted():
+    store = SessionStore(max_sessions=2, clock=FakeClock())
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+
+    assert "a" in store and "c" in store
+    assert "b" not in store
+
+
+def test_touch_reports_evicted_or_replaced_sessions():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10.0, clock=clock)
+    state = store.get("a")
+    assert store.touch("a", state)
+
+    clock.now = 20.0
+    assert not store.touch("a", state)
+    replacement = store.get("a")
+    assert not store.touch("a", state)
+    assert store.touch("a", replacement)
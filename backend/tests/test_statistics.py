@@ -0,0 +1,58 @@
+"""Combinarea statisticilor suficiente pe bucăți față de calculul pe tot dataset-ul."""
+import dataclasses
+
+import numpy as np
+import pytest
+
+from app.services.dataset_service import DatasetService
+from app.services.multivariate_service import MultivariateService
+
+
+@pytest.mark.parametrize("split", [1, 100, 399])
+def test_merge_matches_full_statistics(dataset, split):
+    x, y, stats = dataset
+    merged = DatasetService.merge_statistics(
+        DatasetService.compute_statistics(x[:split], y[:split]),
+        DatasetService.compute_statistics(x[split:], y[split:])
+    )
+
+    assert merged.n == stats.n
+    for field in dataclasses.fields(stats):
+        assert getattr(merged, field.name) == pytest.approx(getattr(stats, field.name), rel=1e-10, abs=1e-9)
+
+
+def test_merge_of_many_chunks(dataset):
+    x, y, stats = dataset
+    merged = None
+    for start in range(0, len(x), 37):
+        chunk = DatasetService.compute_statistics(x[start:start + 37], y[start:start + 37])
+        merged = chunk if merged is None else DatasetService.merge_statistics(merged, chunk)
+
+    assert merged.sxy == pytest.approx(stats.sxy, rel=1e-10)
+    assert merged.sum_x2 == pytest.approx(float(np.dot(x, x)), rel=1e-10)
+
+
+def test_multivariate_merge_matches_full_statistics():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(300, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 3.0]) + rng.normal(size=300)
+    full = MultivariateService.compute_statistics(X, y)
+    merged = MultivariateService.merge_statistics(
+        MultivariateService.compute_statistics(X[:120], y[:120]),
+        MultivariateService.compute_statistics(X[120:], y[120:])
+    )
+
+    assert merged.n == full.n
+    for field in dataclasses.fields(full):
+        np.testing.assert_allclose(getattr(merged, field.name), getattr(full, field.name), rtol=1e-10, atol=1e-9)
+
+
+def test_feature_projection_matches_single_feature_statistics():
+    rng = np.random.default_rng(5)
+    X = rng.uniform(0.0, 10.0, size=(200, 3))
+    y = rng.normal(size=200)
+    projected = MultivariateService.compute_statistics(X, y).feature_stats(1)
+    single = DatasetService.compute_statistics(X[:, 1].copy(), y)
+
+    for field in dataclasses.fields(single):
+        assert getattr(projected, field.name) == pytest.approx(getattr(single, field.name), rel=1e-10, abs=1e-9)
@@ -16,6 +16,11 @@ export const ScatterChart = ({
 }) => {
   if (!dataset) return null;
 
+  // The scatter holds a sample: indices[i] is the dataset index of point i,
+  // so per-point values (error categories, cursor) are looked up through it
+  const isCurrentPoint = (i) =>
+    dataset.indices[i] === currentPointData.point_index;
+
   const scatterData = {
     datasets: [
       {
@@ -23,34 +28,32 @@ export const ScatterChart = ({
         data: dataset.x.map((x, i) => ({ x, y: dataset.y[i] })),
         backgroundColor:
           stepData && stepData.error_categories
-            ? stepData.error_categories.map((cat) => getPointColor(cat))
+            ? dataset.indices.map((index) =>
+                getPointColor(stepData.error_categories[index]),
+              )
             : dataset && currentPointData
               ? dataset.x.map((_, i) =>
-                  i === currentPointData.point_index
+                  isCurrentPoint(i)
                     ? "rgba(255, 0, 0, 1)"
                     : "rgba(54, 162, 235, 0.3)",
                 )
               : "rgba(54, 162, 235, 0.6)",
         pointRadius:
           dataset && currentPointData
-            ? dataset.x.map((_, i) =>
-                i === currentPointData.point_index ? 15 : 8,
-              )
+            ? dataset.x.map((_, i) => (isCurrentPoint(i) ? 15 : 8))
             : 8,
         pointHoverRadius: 10,
         borderColor:
           dataset && currentPointData
             ? dataset.x.map((_, i) =>
-                i === currentPointData.point_index
+                isCurrentPoint(i)
                   ? "rgba(255, 0, 0, 1)"
                   : "rgba(54, 162, 235, 1)",
               )
             : "rgba(54, 162, 235, 1)",
         borderWidth:
           dataset && currentPointData
-            ? dataset.x.map((_, i) =>
-                i === currentPointData.point_index ? 3 : 1,
-              )
+            ? dataset.x.map((_, i) => (isCurrentPoint(i) ? 3 : 1))
             : 1,
       },
       ...(previousModel
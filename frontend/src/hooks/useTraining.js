@@ -28,7 +28,12 @@ export const useTraining = () => {
 
     try {
       const data = await datasetAPI.upload(file);
-      setDataset({ x: data.x_values, y: data.y_values });
+      const scatter = await datasetAPI.getScatter();
+      setDataset({
+        x: scatter.x_values,
+        y: scatter.y_values,
+        indices: scatter.indices,
+      });
       setModel({ w: 1.0, b: 1.0 });
       setPreviousModel(null);
       setStepData(null);
@@ -45,8 +50,13 @@ export const useTraining = () => {
 
   const handleGenerateDataset = async (type) => {
     try {
-      const data = await datasetAPI.generate(type);
-      setDataset({ x: data.x_values, y: data.y_values });
+      await datasetAPI.generate(type);
+      const scatter = await datasetAPI.getScatter();
+      setDataset({
+        x: scatter.x_values,
+        y: scatter.y_values,
+        indices: scatter.indices,
+      });
       setModel({ w: 1.0, b: 1.0 });
       setPreviousModel(null);
       setStepData(null);
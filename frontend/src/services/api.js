@@ -2,6 +2,18 @@ import axios from "axios";
 
 const API_URL = "http://localhost:8000";
 
+// Fiecare tab are propria sesiune de training pe server
+const getSessionId = () => {
+  let sessionId = sessionStorage.getItem("session_id");
+  if (!sessionId) {
+    sessionId = crypto.randomUUID();
+    sessionStorage.setItem("session_id", sessionId);
+  }
+  return sessionId;
+};
+
+axios.defaults.headers.common["X-Session-ID"] = getSessionId();
+
 // Dataset API
 export const datasetAPI = {
   upload: async (file) => {
@@ -25,6 +37,14 @@ export const datasetAPI = {
     const response = await axios.get(`${API_URL}/api/dataset/info`);
     return response.data;
   },
+
+  // Puncte pentru scatter: dataset-urile mici vin integral, cele mari ca subeșantion
+  getScatter: async (maxPoints = 5000) => {
+    const response = await axios.get(`${API_URL}/api/dataset/visualization`, {
+      params: { mode: "sample", max_points: maxPoints },
+    });
+    return response.data;
+  },
 };
 
 // Training API